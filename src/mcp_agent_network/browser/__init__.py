@@ -1 +1,14 @@
-"""Browser automation components.""" 
\ No newline at end of file
+"""Browser automation components."""
+
+from mcp_agent_network.browser.driver import BrowserDriver, PlaywrightDriver
+from mcp_agent_network.browser.pool import BrowserContextPool, PooledContext
+from mcp_agent_network.browser.tools import BROWSER_PROVIDER, BrowserTools
+
+__all__ = [
+    "BROWSER_PROVIDER",
+    "BrowserContextPool",
+    "BrowserDriver",
+    "BrowserTools",
+    "PlaywrightDriver",
+    "PooledContext",
+]
@@ -0,0 +1,231 @@
+"""Browser drivers used by the browser context pool."""
+
+import abc
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class BrowserDriver(abc.ABC):
+    """Interface between the context pool and a browser automation backend.
+
+    Drivers own the browser processes; contexts and pages are created and
+    recycled by BrowserContextPool. Drivers must be safe to call from
+    several threads and may be launched again after close().
+    """
+
+    @abc.abstractmethod
+    def launch(self) -> None:
+        """Launch the browser process."""
+
+    @abc.abstractmethod
+    def new_context(self) -> Any:
+        """Create an isolated browser context."""
+
+    @abc.abstractmethod
+    def new_page(self, context: Any) -> Any:
+        """Open a page in a context."""
+
+    @abc.abstractmethod
+    def goto(self, page: Any, url: str) -> Dict[str, Any]:
+        """Navigate a page to a URL.
+
+        Returns:
+            Dictionary with at least "url" and "title" keys
+        """
+
+    @abc.abstractmethod
+    def content(self, page: Any) -> str:
+        """Get the HTML content of a page."""
+
+    @abc.abstractmethod
+    def evaluate(self, page: Any, script: str) -> Any:
+        """Evaluate a JavaScript expression in a page."""
+
+    def context_memory(self, context: Any) -> Optional[int]:
+        """Get the memory used by a context in bytes, or None if unknown."""
+        return None
+
+    @abc.abstractmethod
+    def close_context(self, context: Any) -> None:
+        """Close a browser context and its pages."""
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """Shut down the browser process."""
+
+
+class _Worker:
+    """Browser process driven by its own thread."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.executor = ThreadPoolExecutor(max_workers=1,
+                                           thread_name_prefix=f"playwright-{index}")
+        self.playwright = None
+        self.browser = None
+        self.contexts = 0
+
+    def call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a function on the worker thread and wait for its result."""
+        return self.executor.submit(func, *args).result()
+
+
+class _Bound:
+    """Playwright context or page tagged with the worker that owns it."""
+
+    __slots__ = ("worker", "target")
+
+    def __init__(self, worker: _Worker, target: Any):
+        self.worker = worker
+        self.target = target
+
+
+class PlaywrightDriver(BrowserDriver):
+    """Headless browser driver backed by Playwright.
+
+    Playwright's sync API is bound to the thread that started it, so each
+    browser process gets a dedicated worker thread and every call on a
+    context or page runs on the thread of the browser that owns it. New
+    contexts go to the least loaded worker; browsers beyond the first are
+    launched on demand, up to ``workers`` of them.
+    """
+
+    def __init__(self, browser_type: str = "chromium", headless: bool = True,
+                 workers: int = 1):
+        """Initialize the Playwright driver.
+
+        Args:
+            browser_type: Playwright browser type ("chromium", "firefox" or "webkit")
+            headless: Whether to run the browser without a window
+            workers: Maximum number of browser processes (and driver threads)
+                serving contexts in parallel
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.browser_type = browser_type
+        self.headless = headless
+        self.workers = workers
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+
+    def _launch_worker(self, worker: _Worker) -> None:
+        """Start Playwright and the browser on a worker's thread."""
+        def _launch() -> None:
+            try:
+                from playwright.sync_api import sync_playwright
+            except ImportError as e:
+                raise RuntimeError(
+                    "Playwright is required for browser tools: pip install playwright"
+                ) from e
+            worker.playwright = sync_playwright().start()
+            launcher = getattr(worker.playwright, self.browser_type)
+            worker.browser = launcher.launch(headless=self.headless)
+            logger.info(f"Launched headless {self.browser_type} browser {worker.index}")
+
+        try:
+            worker.call(_launch)
+        except Exception:
+            self._stop_worker(worker)
+            raise
+
+    def _stop_worker(self, worker: _Worker) -> None:
+        """Shut down a worker's browser and thread."""
+        def _close() -> None:
+            if worker.browser is not None:
+                worker.browser.close()
+                worker.browser = None
+            if worker.playwright is not None:
+                worker.playwright.stop()
+                worker.playwright = None
+
+        try:
+            worker.call(_close)
+        finally:
+            worker.executor.shutdown(wait=True)
+
+    def launch(self) -> None:
+        """Launch the first browser process."""
+        with self._lock:
+            if self._workers:
+                return
+            worker = _Worker(len(self._workers))
+            self._launch_worker(worker)
+            self._workers.append(worker)
+
+    def _assign(self) -> _Worker:
+        """Pick the worker for a new context, launching one if all are busy."""
+        with self._lock:
+            worker = min(self._workers, key=lambda w: w.contexts, default=None)
+            if worker is None or (worker.contexts > 0 and len(self._workers) < self.workers):
+                worker = _Worker(len(self._workers))
+                self._launch_worker(worker)
+                self._workers.append(worker)
+            worker.contexts += 1
+            return worker
+
+    def new_context(self) -> Any:
+        """Create an isolated browser context."""
+        worker = self._assign()
+        try:
+            return _Bound(worker, worker.call(lambda: worker.browser.new_context()))
+        except Exception:
+            with self._lock:
+                worker.contexts -= 1
+            raise
+
+    def new_page(self, context: Any) -> Any:
+        """Open a page in a context."""
+        return _Bound(context.worker, context.worker.call(context.target.new_page))
+
+    def goto(self, page: Any, url: str) -> Dict[str, Any]:
+        """Navigate a page to a URL."""
+        def _goto() -> Dict[str, Any]:
+            response = page.target.goto(url)
+            return {
+                "url": page.target.url,
+                "title": page.target.title(),
+                "status": response.status if response is not None else None,
+            }
+
+        return page.worker.call(_goto)
+
+    def content(self, page: Any) -> str:
+        """Get the HTML content of a page."""
+        return page.worker.call(page.target.content)
+
+    def evaluate(self, page: Any, script: str) -> Any:
+        """Evaluate a JavaScript expression in a page."""
+        return page.worker.call(page.target.evaluate, script)
+
+    def context_memory(self, context: Any) -> Optional[int]:
+        """Get the JS heap size of the context's pages (Chromium only)."""
+        def _memory() -> Optional[int]:
+            total = 0
+            for page in context.target.pages:
+                try:
+                    total += page.evaluate("performance.memory.usedJSHeapSize")
+                except Exception:
+                    return None
+            return total
+
+        return context.worker.call(_memory)
+
+    def close_context(self, context: Any) -> None:
+        """Close a browser context and its pages."""
+        try:
+            context.worker.call(context.target.close)
+        finally:
+            with self._lock:
+                context.worker.contexts -= 1
+
+    def close(self) -> None:
+        """Shut down all browser processes; launch() starts fresh ones."""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            self._stop_worker(worker)
@@ -0,0 +1,221 @@
+"""Pool of warm browser contexts shared by browser tools."""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from mcp_agent_network.browser.driver import BrowserDriver
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class PooledContext:
+    """Browser context with a reusable page, checked out from the pool."""
+
+    def __init__(self, context: Any, page: Any):
+        """Initialize the pooled context.
+
+        Args:
+            context: Driver-specific browser context
+            page: Driver-specific page opened in the context
+        """
+        self.context = context
+        self.page = page
+        self.uses = 0
+        self.created_at = time.monotonic()
+
+
+class BrowserContextPool:
+    """Keeps warm browser contexts and hands them out per task.
+
+    The browser is launched once. Contexts are reused across tasks and
+    recycled after a number of uses, when their memory grows past a limit,
+    or when a task using them fails. Concurrency is bounded both globally
+    (number of contexts) and per host.
+    """
+
+    def __init__(self, driver: BrowserDriver, max_contexts: int = 4, max_uses: int = 50,
+                 max_memory_bytes: Optional[int] = None, max_per_host: int = 2,
+                 acquire_timeout: float = 30.0):
+        """Initialize the context pool.
+
+        Args:
+            driver: Browser driver to create contexts with
+            max_contexts: Maximum number of live contexts
+            max_uses: Number of tasks after which a context is recycled
+            max_memory_bytes: Memory usage after which a context is recycled
+            max_per_host: Maximum number of concurrent tasks per host
+            acquire_timeout: Default time to wait for a free context in seconds
+        """
+        self.driver = driver
+        self.max_contexts = max_contexts
+        self.max_uses = max_uses
+        self.max_memory_bytes = max_memory_bytes
+        self.max_per_host = max_per_host
+        self.acquire_timeout = acquire_timeout
+        self.launched = False
+        self.created = 0
+        self.recycled = 0
+        self._idle: Deque[PooledContext] = deque()
+        self._live = 0
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._cond = threading.Condition()
+        self._launch_lock = threading.Lock()
+
+    def start(self, prewarm: int = 0) -> None:
+        """Launch the browser and optionally pre-create idle contexts.
+
+        Args:
+            prewarm: Number of contexts to create ahead of the first task
+        """
+        self._ensure_launched()
+        with self._cond:
+            count = min(prewarm, self.max_contexts - self._live)
+            self._live += count
+        for _ in range(count):
+            pooled = self._create()
+            with self._cond:
+                self._idle.append(pooled)
+                self._cond.notify()
+
+    def _ensure_launched(self) -> None:
+        """Launch the browser on first use."""
+        with self._launch_lock:
+            if not self.launched:
+                self.driver.launch()
+                self.launched = True
+
+    def _create(self) -> PooledContext:
+        """Create a new context with an open page."""
+        context = self.driver.new_context()
+        page = self.driver.new_page(context)
+        with self._cond:
+            self.created += 1
+        return PooledContext(context, page)
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        """Get the concurrency slot semaphore for a host."""
+        with self._cond:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    @contextmanager
+    def session(self, url: str, timeout: Optional[float] = None) -> Iterator[PooledContext]:
+        """Check out a context for a task on the given URL.
+
+        Args:
+            url: URL the task will operate on (used for per-host limits)
+            timeout: Maximum time to wait for a free context in seconds
+
+        Yields:
+            PooledContext to use for the task
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        host = urlsplit(url).hostname or ""
+
+        slot = self._host_slot(host)
+        if not slot.acquire(timeout=timeout):
+            raise TimeoutError(f"Timed out waiting for a browser slot for host {host}")
+        try:
+            pooled = self._acquire(deadline)
+            failed = False
+            try:
+                yield pooled
+            except Exception:
+                failed = True
+                raise
+            finally:
+                self._release(pooled, failed)
+        finally:
+            slot.release()
+
+    def _acquire(self, deadline: float) -> PooledContext:
+        """Take an idle context or create one within the global limit."""
+        self._ensure_launched()
+        with self._cond:
+            while not self._idle and self._live >= self.max_contexts:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("Timed out waiting for a free browser context")
+                self._cond.wait(remaining)
+            if self._idle:
+                return self._idle.popleft()
+            self._live += 1
+
+        try:
+            return self._create()
+        except Exception:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, pooled: PooledContext, failed: bool) -> None:
+        """Return a context to the pool, recycling it if needed."""
+        pooled.uses += 1
+        reason = None
+        if failed:
+            reason = "task failed"
+        elif pooled.uses >= self.max_uses:
+            reason = f"reached {self.max_uses} uses"
+        elif self.max_memory_bytes is not None:
+            memory = self.driver.context_memory(pooled.context)
+            if memory is not None and memory > self.max_memory_bytes:
+                reason = f"memory grew to {memory} bytes"
+
+        if reason is None:
+            with self._cond:
+                self._idle.append(pooled)
+                self._cond.notify()
+            return
+
+        logger.debug(f"Recycling browser context: {reason}")
+        try:
+            self.driver.close_context(pooled.context)
+        except Exception as e:
+            logger.warning(f"Error closing browser context: {e}")
+        with self._cond:
+            self._live -= 1
+            self.recycled += 1
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Close all idle contexts and shut down the browser."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._live -= len(idle)
+        for pooled in idle:
+            try:
+                self.driver.close_context(pooled.context)
+            except Exception as e:
+                logger.warning(f"Error closing browser context: {e}")
+        with self._launch_lock:
+            if self.launched:
+                self.driver.close()
+                self.launched = False
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get pool usage statistics.
+
+        Returns:
+            Dictionary with context counts
+        """
+        with self._cond:
+            return {
+                "launched": self.launched,
+                "live_contexts": self._live,
+                "idle_contexts": len(self._idle),
+                "max_contexts": self.max_contexts,
+                "created": self.created,
+                "recycled": self.recycled,
+            }
@@ -0,0 +1,166 @@
+"""MCP-callable browser tools backed by a pool of warm contexts."""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from mcp_agent_network.browser.driver import BrowserDriver, PlaywrightDriver
+from mcp_agent_network.browser.pool import BrowserContextPool, PooledContext
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_URL_SCHEMA = {"type": "string", "description": "URL of the page to open"}
+
+# Provider name the browser tools are cataloged and indexed under
+BROWSER_PROVIDER = "browser"
+
+
+class BrowserTools:
+    """Browser automation tools exposed with MCP tool descriptors.
+
+    Every tool call checks out a warm context from the pool, navigates its
+    page to the requested URL and returns the context afterwards.
+    """
+
+    TOOLS: List[Dict[str, Any]] = [
+        {
+            "name": "browser_navigate",
+            "description": "Open a URL in a headless browser and return the page title",
+            "inputSchema": {
+                "type": "object",
+                "properties": {"url": _URL_SCHEMA},
+                "required": ["url"],
+            },
+        },
+        {
+            "name": "browser_get_content",
+            "description": "Open a URL in a headless browser and return the page HTML",
+            "inputSchema": {
+                "type": "object",
+                "properties": {"url": _URL_SCHEMA},
+                "required": ["url"],
+            },
+        },
+        {
+            "name": "browser_evaluate",
+            "description": "Open a URL in a headless browser and evaluate a JavaScript expression",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "url": _URL_SCHEMA,
+                    "script": {"type": "string", "description": "JavaScript expression"},
+                },
+                "required": ["url", "script"],
+            },
+        },
+    ]
+
+    def __init__(self, pool: BrowserContextPool):
+        """Initialize the browser tools.
+
+        Args:
+            pool: Context pool to run tool calls in
+        """
+        self.pool = pool
+        self._handlers: Dict[str, Callable[[PooledContext, Dict[str, Any]], Dict[str, Any]]] = {
+            "browser_navigate": self._navigate,
+            "browser_get_content": self._get_content,
+            "browser_evaluate": self._evaluate,
+        }
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "BrowserTools":
+        """Create browser tools from a configuration dictionary.
+
+        Args:
+            config: Dictionary with optional "driver" (a BrowserDriver instance
+                or a Playwright browser type name), "workers" (browser
+                processes, defaults to "max_contexts"), "max_contexts",
+                "max_uses", "max_memory_mb", "max_per_host", "acquire_timeout"
+                and "prewarm" keys
+
+        Returns:
+            Configured BrowserTools instance
+        """
+        max_contexts = config.get("max_contexts", 4)
+        driver = config.get("driver", "chromium")
+        if not isinstance(driver, BrowserDriver):
+            driver = PlaywrightDriver(browser_type=driver,
+                                      workers=config.get("workers", max_contexts))
+        max_memory_mb = config.get("max_memory_mb")
+        pool = BrowserContextPool(
+            driver,
+            max_contexts=max_contexts,
+            max_uses=config.get("max_uses", 50),
+            max_memory_bytes=max_memory_mb * 1024 * 1024 if max_memory_mb else None,
+            max_per_host=config.get("max_per_host", 2),
+            acquire_timeout=config.get("acquire_timeout", 30.0),
+        )
+        if config.get("prewarm"):
+            pool.start(prewarm=config["prewarm"])
+        return cls(pool)
+
+    def list_tools(self) -> List[Dict[str, Any]]:
+        """List the available browser tools.
+
+        Returns:
+            List of MCP tool descriptors
+        """
+        return list(self.TOOLS)
+
+    def call_tool(self, name: str, arguments: Dict[str, Any],
+                  timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Call a browser tool.
+
+        Args:
+            name: Name of the tool
+            arguments: Tool arguments
+            timeout: Maximum time to wait for a free browser context in seconds
+
+        Returns:
+            Dictionary with "status" and either "result" or "error"
+        """
+        handler = self._handlers.get(name)
+        if handler is None:
+            return {"status": "failed", "error": f"Unknown browser tool: {name}"}
+        tool = next(tool for tool in self.TOOLS if tool["name"] == name)
+        for argument in tool["inputSchema"]["required"]:
+            if not arguments.get(argument):
+                return {"status": "failed", "error": f"Missing required argument: {argument}"}
+        url = arguments["url"]
+
+        try:
+            with self.pool.session(url, timeout) as pooled:
+                result = handler(pooled, arguments)
+        except Exception as e:
+            logger.error(f"Browser tool {name} failed for {url}: {e}")
+            return {"status": "failed", "error": str(e)}
+        return {"status": "success", "result": result}
+
+    def _navigate(self, pooled: PooledContext, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Navigate to a URL."""
+        return self.pool.driver.goto(pooled.page, arguments["url"])
+
+    def _get_content(self, pooled: PooledContext, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Navigate to a URL and return its HTML."""
+        result = self.pool.driver.goto(pooled.page, arguments["url"])
+        result["content"] = self.pool.driver.content(pooled.page)
+        return result
+
+    def _evaluate(self, pooled: PooledContext, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Navigate to a URL and evaluate a script."""
+        result = self.pool.driver.goto(pooled.page, arguments["url"])
+        result["value"] = self.pool.driver.evaluate(pooled.page, arguments["script"])
+        return result
+
+    def close(self) -> None:
+        """Shut down the browser and its contexts."""
+        self.pool.close()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get browser pool status.
+
+        Returns:
+            Dictionary with pool statistics
+        """
+        return self.pool.get_status()
@@ -17,6 +17,12 @@ def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
         Parsed arguments
     """
     parser = argparse.ArgumentParser(description="MCP Agent Network CLI")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the command and write timings and a flamegraph")
+    parser.add_argument("--profile-output", default="profile", metavar="DIR",
+                        help="Directory the profile is written to (default: profile)")
+    parser.add_argument("--profile-interval", type=float, default=0.005,
+                        help="Seconds between stack samples when profiling")
     
     # Create subparsers for different commands
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
@@ -30,7 +36,9 @@ def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
     subparsers.add_parser("status", help="Show MCP server connection status")
     
     # Disconnect command
-    subparsers.add_parser("disconnect", help="Disconnect from MCP servers")
+    disconnect_parser = subparsers.add_parser("disconnect", help="Disconnect from MCP servers")
+    disconnect_parser.add_argument("--drain-timeout", type=float, default=None,
+                                   help="Seconds to let in-flight messages finish before closing")
     
     # Chat command
     chat_parser = subparsers.add_parser("chat", help="Chat with an agent")
@@ -57,9 +65,32 @@ def main(args: Optional[List[str]] = None) -> int:
     parsed_args = parse_args(args)
     
     # Initialize agent network
-    network = AgentNetwork()
+    config = {}
+    if parsed_args.profile:
+        config["profile"] = {
+            "output_dir": parsed_args.profile_output,
+            "sampling_interval": parsed_args.profile_interval,
+        }
+    network = AgentNetwork(config)
+    
+    try:
+        return run_command(network, parsed_args)
+    finally:
+        if parsed_args.profile:
+            paths = network.write_profile()
+            print(f"Profile written to {paths['report']} (flamegraph input: {paths['flamegraph']})")
+
+
+def run_command(network: AgentNetwork, parsed_args: argparse.Namespace) -> int:
+    """Execute the requested command.
     
-    # Execute requested command
+    Args:
+        network: Agent network to operate on
+        parsed_args: Parsed command line arguments
+        
+    Returns:
+        Exit code
+    """
     if parsed_args.command == "connect":
         server_names = parsed_args.servers or ["glama", "smithery"]
         show_progress = not parsed_args.no_progress
@@ -92,7 +123,7 @@ def main(args: Optional[List[str]] = None) -> int:
     
     elif parsed_args.command == "disconnect":
         print("Disconnecting from MCP servers...")
-        success = network.disconnect_from_servers()
+        success = network.disconnect_from_servers(drain_timeout=parsed_args.drain_timeout)
         
         if success:
             print("✅ Successfully disconnected from all MCP servers")
@@ -1,14 +1,38 @@
 """Main AgentNetwork class for managing the agent network."""
 
+import functools
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 
+from mcp_agent_network.browser.tools import BROWSER_PROVIDER, BrowserTools
+from mcp_agent_network.core.conversation import ConversationStore
+from mcp_agent_network.core.result_store import SharedResultStore
 from mcp_agent_network.mcp.connection_manager import MCPConnectionManager
+from mcp_agent_network.mcp.events import SERVER_CONNECTED, SERVER_DISCONNECTED, TASK_COMPLETED
+from mcp_agent_network.mcp.profiling import Profiler
+from mcp_agent_network.mcp.snapshot import SnapshotWriter, load_snapshot
+from mcp_agent_network.mcp.tool_catalog import ToolCatalog
+from mcp_agent_network.mcp.tool_index import ToolIndex
+from mcp_agent_network.mcp.warmup import WarmUp
+from mcp_agent_network.orchestration.workflow import Workflow, WorkflowEngine
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+def _profiled(operation: str) -> Callable:
+    """Time a method as an operation when profiling is enabled."""
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self: "AgentNetwork", *args: Any, **kwargs: Any) -> Any:
+            if self.profiler is None:
+                return method(self, *args, **kwargs)
+            with self.profiler.phase(operation):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 class AgentNetwork:
     """Main agent network orchestration class.
     
@@ -24,21 +48,151 @@ class AgentNetwork:
             config: Optional configuration dictionary
         """
         self.config = config or {}
-        self.mcp_connection_manager = MCPConnectionManager()
-        self.orchestrator = None
+        tool_search = self.config.get("tool_search", {})
+        self.mcp_connection_manager = MCPConnectionManager(
+            catalog=ToolCatalog(self.config.get("tool_catalog_dir")),
+            tool_index=ToolIndex(embedder=tool_search.get("embedder")),
+        )
+        self.events = self.mcp_connection_manager.events
+        self.tool_routing_limit = tool_search.get("limit", 3)
+        # Seconds until requests of each priority are dropped unsent
+        self.request_timeouts: Dict[str, Optional[float]] = self.config.get("request_timeouts", {})
+        self.orchestrator = WorkflowEngine(self, self.config.get("max_workflow_workers", 8))
         self.browser_tools = None
+        self.conversations = ConversationStore.from_config(self.config.get("conversations", {}))
+        # A server's session ends when it disconnects or reconnects; chats
+        # apply these before sending deltas (at most two events per server)
+        self._session_events = self.events.subscribe(
+            [SERVER_CONNECTED, SERVER_DISCONNECTED], max_queue=100_000, overflow="coalesce"
+        )
+        self.profiler: Optional[Profiler] = None
+        self.warmup: Optional[WarmUp] = None
+        self.snapshot_writer: Optional[SnapshotWriter] = None
+        self.restored_snapshot: Optional[Dict[str, Any]] = None
+        self.result_store: Optional[SharedResultStore] = None
         
         # Apply configuration settings
         self._apply_config()
         
     def _apply_config(self) -> None:
         """Apply configuration settings."""
+        # Configure the network-wide rate limit before adding servers
+        if "rate_limit" in self.config:
+            self.mcp_connection_manager.set_global_rate_limit(self.config["rate_limit"])
+        if "concurrency" in self.config:
+            self.mcp_connection_manager.set_concurrency_config(self.config["concurrency"])
+        
         # Configure MCP servers from config
         if "mcp_servers" in self.config:
             for server_name, server_config in self.config["mcp_servers"].items():
-                api_key = server_config.get("api_key")
-                self.mcp_connection_manager.add_server(server_name, api_key)
+                self.mcp_connection_manager._add_configured_server(server_name,
+                                                                   server_config or {})
+        
+        # Profile operations (phase timings and optional stack sampling)
+        if self.config.get("profile"):
+            self.profiler = Profiler.from_config(self.config["profile"])
+            self.mcp_connection_manager.set_profiler(self.profiler)
+            self.profiler.start()
+        
+        # Record traffic for later replay
+        if "record_traffic" in self.config:
+            self.mcp_connection_manager.start_recording(self.config["record_traffic"])
+        
+        # Resume learned state from the last run, then keep it current
+        if self.config.get("snapshot"):
+            self.snapshot_writer = SnapshotWriter.from_config(
+                self.mcp_connection_manager, self.config["snapshot"]
+            )
+            # Servers removed from the configuration stay removed
+            configured = self.config.get("mcp_servers")
+            self.restored_snapshot = load_snapshot(
+                self.mcp_connection_manager, self.snapshot_writer.path,
+                servers=list(configured) if configured is not None else None,
+            )
+            self.snapshot_writer.start()
+        
+        # Pre-connect configured servers in the background, hot ones first
+        warm_up = self.config.get("warm_up")
+        if isinstance(warm_up, dict):
+            warm_up = warm_up.get("enabled", True)
+        if warm_up and self.config.get("mcp_servers"):
+            servers = self.config["mcp_servers"]
+            self.warmup = WarmUp(
+                self.mcp_connection_manager,
+                servers,
+                hot=[name for name, server_config in servers.items()
+                     if (server_config or {}).get("hot")],
+            )
+            self.warmup.start()
+        
+        # Shared memory for handing large results to other worker processes
+        if "result_store" in self.config:
+            self.result_store = SharedResultStore.from_config(self.config["result_store"] or {})
+        
+        # Configure pooled browser tools
+        if "browser" in self.config:
+            self.browser_tools = BrowserTools.from_config(self.config["browser"])
+            self.mcp_connection_manager.register_local_tools(
+                BROWSER_PROVIDER, self.browser_tools.list_tools()
+            )
+        
+    def reload_config(self, config: Dict[str, Any], show_progress: bool = False) -> Dict[str, Any]:
+        """Apply a new configuration without disturbing healthy connections.
         
+        Only servers that were added, removed, changed credentials or lost
+        their connection are touched.
+        
+        Args:
+            config: New configuration dictionary
+            show_progress: Whether to show connection progress
+        
+        Returns:
+            Summary of the reconciliation (see MCPConnectionManager.reconcile)
+        """
+        self.config = config
+        self.mcp_connection_manager.set_global_rate_limit(config.get("rate_limit"))
+        self.mcp_connection_manager.set_concurrency_config(config.get("concurrency"))
+        return self.mcp_connection_manager.reconcile(
+            config.get("mcp_servers", {}), show_progress=show_progress
+        )
+        
+    def request_options(self, priority: str) -> Dict[str, Any]:
+        """Get the dispatch lane and timeout for requests of a priority.
+        
+        Args:
+            priority: "interactive", "normal" or "bulk"
+            
+        Returns:
+            Dictionary with "priority" and "timeout" keyword arguments for
+            the connection manager's send methods
+        """
+        return {"priority": priority, "timeout": self.request_timeouts.get(priority)}
+        
+    def is_ready(self) -> bool:
+        """Check whether the startup warm-up has finished.
+        
+        Returns:
+            bool: True if warm-up is complete or was not configured
+        """
+        return self.warmup is None or self.warmup.is_ready()
+        
+    def wait_until_ready(self, timeout: Optional[float] = None, hot_only: bool = False) -> bool:
+        """Wait for the startup warm-up to finish.
+        
+        Args:
+            timeout: Maximum time to wait in seconds, or None to wait forever
+            hot_only: Only wait for the servers marked hot
+            
+        Returns:
+            bool: True if the servers are warm
+        """
+        if self.warmup is None:
+            return True
+        if hot_only:
+            return self.warmup.wait_hot(timeout)
+        return self.warmup.wait(timeout)
+        
+    @_profiled("connect_to_servers")
     def connect_to_servers(self, server_names: List[str], show_progress: bool = True) -> bool:
         """Connect to MCP servers.
         
@@ -65,15 +219,49 @@ class AgentNetwork:
         
         return all_successful
         
-    def disconnect_from_servers(self) -> bool:
+    def disconnect_from_servers(self, drain_timeout: Optional[float] = None) -> bool:
         """Disconnect from all connected MCP servers.
         
+        Args:
+            drain_timeout: Maximum time in seconds to let in-flight messages
+                finish before closing the sessions, or None to close immediately
+            
         Returns:
             bool: True if all disconnections successful, False otherwise
         """
-        results = self.mcp_connection_manager.disconnect_from_all()
+        results = self.mcp_connection_manager.disconnect_from_all(drain_timeout)
         return all(results.values())
         
+    def shutdown(self, drain_timeout: Optional[float] = None) -> bool:
+        """Stop the warm-up, snapshot the network state, close the traffic
+        trace, release the result store, shut down the browser, disconnect
+        from all servers and stop the sampling profiler (its report can
+        still be written afterwards).
+        
+        Args:
+            drain_timeout: Maximum time in seconds to let in-flight messages
+                finish before closing the sessions, or None to close immediately
+            
+        Returns:
+            bool: True if all disconnections successful, False otherwise
+        """
+        # Otherwise its remaining waves would reconnect the fleet
+        if self.warmup is not None:
+            self.warmup.stop()
+        if self.snapshot_writer is not None:
+            self.snapshot_writer.stop()
+        self.mcp_connection_manager.stop_recording()
+        if self.result_store is not None:
+            self.result_store.close()
+            self.result_store = None
+        if self.browser_tools is not None:
+            self.browser_tools.close()
+        success = self.disconnect_from_servers(drain_timeout)
+        self._session_events.close()
+        if self.profiler is not None:
+            self.profiler.stop()
+        return success
+        
     def get_server_status(self) -> Dict[str, Dict[str, Any]]:
         """Get status of all MCP server connections.
         
@@ -82,6 +270,7 @@ class AgentNetwork:
         """
         return self.mcp_connection_manager.update_all_statuses()
         
+    @_profiled("execute_task")
     def execute_task(self, task_description: str) -> Any:
         """Execute a task using the agent network.
         
@@ -106,19 +295,53 @@ class AgentNetwork:
             "timestamp": None,  # Will be filled by send_message
         }
         
-        # Broadcast to all connected servers
-        responses = self.mcp_connection_manager.broadcast_message(task_message)
+        # Route to the servers offering the most relevant tools, if any
+        candidates = self.mcp_connection_manager.find_tools(
+            task_description, limit=self.tool_routing_limit
+        )
+        if candidates:
+            candidate_tools: Dict[str, List[str]] = {}
+            for match in candidates:
+                candidate_tools.setdefault(match["server"], []).append(match["tool"])
+            logger.info(f"Routing task to {len(candidate_tools)} candidate servers")
+            responses = {
+                server_name: self.mcp_connection_manager.send_message(
+                    server_name, {**task_message, "candidate_tools": tools},
+                    **self.request_options("bulk")
+                )
+                for server_name, tools in candidate_tools.items()
+            }
+        else:
+            # Broadcast to all connected servers
+            responses = self.mcp_connection_manager.broadcast_message(
+                task_message, **self.request_options("bulk")
+            )
         
         # Process responses
         # In a real implementation, we would coordinate responses and return results
         logger.info(f"Received responses from {len(responses)} servers")
         
-        return {
+        result = {
             "task": task_description,
             "servers_responded": list(responses.keys()),
             "status": "submitted",
         }
+        self.events.publish(TASK_COMPLETED, "execute_task", **result)
+        return result
+        
+    def _reset_ended_sessions(self) -> None:
+        """Reset conversation sessions of servers that connected or disconnected."""
+        subscription = self._session_events
+        dropped = subscription.dropped
+        events = subscription.drain()
+        if subscription.dropped != dropped:
+            # Some servers were lost from the queue; start all sessions over
+            self.conversations.reset_session(None)
+            return
+        for server_name in {event.source for event in events}:
+            self.conversations.reset_session(server_name)
         
+    @_profiled("chat_with_agent")
     def chat_with_agent(self, agent_id: str, message: str) -> str:
         """Chat with a specific agent.
         
@@ -137,19 +360,121 @@ class AgentNetwork:
         
         logger.info(f"Sending message to agent {agent_id}: {message}")
         
-        # Create chat message
-        chat_message = {
-            "type": "chat",
-            "agent_id": agent_id,
-            "content": message,
-            "timestamp": None,  # Will be filled by send_message
-        }
+        # Forget what servers whose session ended hold before sending deltas
+        self._reset_ended_sessions()
         
-        # Broadcast to all connected servers
-        responses = self.mcp_connection_manager.broadcast_message(chat_message)
+        # Record the turn; the store keeps a bounded window per agent
+        entry = self.conversations.append(agent_id, "user", message)
+        
+        responses = {}
+        for server_name in connected_servers:
+            client = self.mcp_connection_manager.get_client(server_name)
+            if client is None:
+                continue
+            
+            # Servers that keep session state only need the unseen messages
+            session_key = server_name
+            supports_sessions = "session_state" in client.connection_info.get("features", [])
+            delta = (
+                self.conversations.get_delta(agent_id, session_key)
+                if supports_sessions else None
+            )
+            
+            # Create chat message
+            chat_message = {
+                "type": "chat",
+                "agent_id": agent_id,
+                "content": message,
+                "timestamp": None,  # Will be filled by send_message
+            }
+            # The current turn travels in "content", not in the history
+            if delta is not None:
+                chat_message["history_delta"] = [
+                    item for item in delta if item["seq"] < entry["seq"]
+                ]
+            else:
+                context = self.conversations.get_context(agent_id)
+                chat_message["history"] = [
+                    item for item in context["messages"] if item["seq"] < entry["seq"]
+                ]
+                chat_message["summary"] = context["summary"]
+            
+            response = self.mcp_connection_manager.send_message(
+                server_name, chat_message, **self.request_options("interactive")
+            )
+            responses[server_name] = response
+            if response.get("status") != "delivered":
+                continue
+            if response.get("content"):
+                reply = self.conversations.append(agent_id, "assistant", response["content"])
+                sent_through = reply["seq"]
+            else:
+                sent_through = entry["seq"]
+            if supports_sessions:
+                self.conversations.mark_sent(agent_id, session_key, sent_through)
         
         # Process responses
         # In a real implementation, we would find the response from the right server
         logger.info(f"Received responses from {len(responses)} servers")
         
-        return f"Message sent to agent {agent_id} via {len(responses)} servers" 
\ No newline at end of file
+        return f"Message sent to agent {agent_id} via {len(responses)} servers"
+        
+    @_profiled("run_workflow")
+    def run_workflow(self, workflow: Workflow) -> Dict[str, Any]:
+        """Run a multi-step workflow DAG.
+        
+        Independent steps run concurrently and results of unchanged steps
+        are reused from earlier runs.
+        
+        Args:
+            workflow: Workflow to run
+            
+        Returns:
+            Dictionary with workflow status and per-step results
+        """
+        result = self.orchestrator.run(workflow)
+        self.events.publish(TASK_COMPLETED, "run_workflow", workflow=workflow.name,
+                            status=result["status"], errors=result["errors"])
+        return result
+        
+    def write_profile(self, output_dir: Optional[str] = None) -> Dict[str, str]:
+        """Stop stack sampling and write the profile.
+        
+        Writes the per-operation and per-server phase timings as JSON and
+        the sampled stacks in collapsed-stack (flamegraph) format.
+        
+        Args:
+            output_dir: Target directory, defaults to the configured one
+            
+        Returns:
+            Dictionary with the written file paths, empty if profiling is off
+        """
+        if self.profiler is None:
+            return {}
+        self.profiler.stop()
+        return self.profiler.write_report(output_dir)
+        
+    def list_browser_tools(self) -> List[Dict[str, Any]]:
+        """List the browser tools available to agents.
+        
+        Returns:
+            List of MCP tool descriptors, empty if browser tools are not configured
+        """
+        if self.browser_tools is None:
+            return []
+        return self.browser_tools.list_tools()
+        
+    def call_browser_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call a browser tool using a pooled browser context.
+        
+        Args:
+            name: Name of the browser tool (e.g., "browser_navigate")
+            arguments: Tool arguments
+            
+        Returns:
+            Dictionary with "status" and either "result" or "error"
+        """
+        if self.browser_tools is None:
+            logger.error(f"Cannot call browser tool {name}: browser tools not configured")
+            return {"status": "failed", "error": "Browser tools not configured"}
+        return self.browser_tools.call_tool(name, arguments)
@@ -0,0 +1,366 @@
+"""Bounded per-agent conversation history for chat sessions."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Logs are rewritten to the summary and window once they hold this many
+# entries and at least twice the window
+LOG_COMPACT_MIN_ENTRIES = 64
+
+# Summarizes evicted messages: (previous_summary, evicted_messages) -> new summary
+Compactor = Callable[[Optional[str], List[Dict[str, Any]]], Optional[str]]
+
+
+def estimate_tokens(content: str) -> int:
+    """Roughly estimate the number of tokens in a message.
+
+    Args:
+        content: Message content
+
+    Returns:
+        Estimated token count (about four characters per token)
+    """
+    return len(content) // 4 + 1
+
+
+class JsonlConversationLog:
+    """Append-only on-disk log with one JSON Lines file per agent."""
+
+    def __init__(self, directory: str):
+        """Initialize the log.
+
+        Args:
+            directory: Directory holding the conversation files
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, agent_id: str) -> str:
+        """Get a filesystem-safe path for an agent's log."""
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", agent_id)[:64]
+        digest = hashlib.sha1(agent_id.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.directory, f"{safe}-{digest}.jsonl")
+
+    def append(self, agent_id: str, entry: Dict[str, Any]) -> None:
+        """Append an entry to an agent's log.
+
+        Args:
+            agent_id: ID of the agent
+            entry: JSON-serializable entry
+        """
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            with open(self._path(agent_id), "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def rewrite(self, agent_id: str, entries: List[Dict[str, Any]]) -> None:
+        """Replace an agent's log with the given entries.
+
+        The new file is written next to the old one and renamed over it, so
+        a crash leaves either the old or the new log.
+
+        Args:
+            agent_id: ID of the agent
+            entries: JSON-serializable entries
+        """
+        path = self._path(agent_id)
+        lines = "".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries)
+        with self._lock:
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(lines)
+            os.replace(path + ".tmp", path)
+
+    def load(self, agent_id: str, max_messages: int) -> Tuple[List[Dict[str, Any]], Optional[str], int, int]:
+        """Load the tail of an agent's log.
+
+        Only the last ``max_messages`` messages are kept in memory while
+        scanning the file.
+
+        Args:
+            agent_id: ID of the agent
+            max_messages: Maximum number of messages to return
+
+        Returns:
+            Tuple of (messages, latest summary, next sequence number,
+            number of entries in the log)
+        """
+        path = self._path(agent_id)
+        messages: Deque[Dict[str, Any]] = deque(maxlen=max_messages)
+        summary = None
+        next_seq = 0
+        entries = 0
+        if not os.path.exists(path):
+            return [], None, 0, 0
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entries += 1
+                entry = json.loads(line)
+                if entry.get("kind") == "summary":
+                    summary = entry["summary"]
+                    # Messages covered by the summary are no longer part of the window
+                    while messages and messages[0]["seq"] <= entry["through_seq"]:
+                        messages.popleft()
+                else:
+                    messages.append(entry)
+                    next_seq = entry["seq"] + 1
+        return list(messages), summary, next_seq, entries
+
+
+class Conversation:
+    """In-memory window of a single agent's conversation."""
+
+    def __init__(self, agent_id: str):
+        """Initialize the conversation.
+
+        Args:
+            agent_id: ID of the agent
+        """
+        self.agent_id = agent_id
+        self.messages: Deque[Dict[str, Any]] = deque()
+        self.summary: Optional[str] = None
+        self.next_seq = 0
+        self.tokens = 0
+        # Entries in the on-disk log since it was last rewritten
+        self.log_entries = 0
+        # Highest sequence number each server session already holds
+        self.server_offsets: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+
+class ConversationStore:
+    """Per-agent conversation store with bounded memory.
+
+    Messages are appended to a log (optionally persisted on disk) and kept
+    in a window bounded by message count and estimated tokens. Messages
+    evicted from the window are passed to an optional compaction hook that
+    folds them into a running summary, and the on-disk log is periodically
+    rewritten to that summary and window. At most ``max_conversations``
+    windows are kept in memory; the least recently used ones are dropped
+    and restored from the log when needed (without a log, they start over).
+    """
+
+    def __init__(self, max_messages: int = 50, max_tokens: int = 4000,
+                 compactor: Optional[Compactor] = None,
+                 log: Optional[JsonlConversationLog] = None,
+                 token_counter: Callable[[str], int] = estimate_tokens,
+                 max_conversations: int = 1024):
+        """Initialize the conversation store.
+
+        Args:
+            max_messages: Maximum number of messages kept in a window
+            max_tokens: Maximum number of estimated tokens kept in a window
+            compactor: Optional hook summarizing evicted messages
+            log: Optional append-only log for persistence
+            token_counter: Function estimating the tokens in a message
+            max_conversations: Maximum number of conversations kept in memory
+        """
+        if max_conversations < 1:
+            raise ValueError("max_conversations must be at least 1")
+        self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.compactor = compactor
+        self.log = log
+        self.token_counter = token_counter
+        self.max_conversations = max_conversations
+        self._conversations: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ConversationStore":
+        """Create a conversation store from a configuration dictionary.
+
+        Args:
+            config: Dictionary with optional "max_messages", "max_tokens",
+                "max_conversations", "compactor" and "persist_dir" keys
+
+        Returns:
+            Configured ConversationStore instance
+        """
+        persist_dir = config.get("persist_dir")
+        return cls(
+            max_messages=config.get("max_messages", 50),
+            max_tokens=config.get("max_tokens", 4000),
+            compactor=config.get("compactor"),
+            log=JsonlConversationLog(persist_dir) if persist_dir else None,
+            max_conversations=config.get("max_conversations", 1024),
+        )
+
+    def _get(self, agent_id: str) -> Conversation:
+        """Get or restore the conversation for an agent."""
+        with self._lock:
+            conversation = self._conversations.get(agent_id)
+            if conversation is not None:
+                self._conversations.move_to_end(agent_id)
+                return conversation
+            conversation = Conversation(agent_id)
+            if self.log is not None:
+                messages, summary, next_seq, entries = self.log.load(agent_id, self.max_messages)
+                conversation.messages.extend(messages)
+                conversation.summary = summary
+                conversation.next_seq = next_seq
+                conversation.tokens = sum(message["tokens"] for message in messages)
+                conversation.log_entries = entries
+            self._conversations[agent_id] = conversation
+            while len(self._conversations) > self.max_conversations:
+                evicted, _ = self._conversations.popitem(last=False)
+                logger.debug(f"Dropped conversation of agent {evicted} from memory")
+            return conversation
+
+    def append(self, agent_id: str, role: str, content: str) -> Dict[str, Any]:
+        """Append a message to an agent's conversation.
+
+        Args:
+            agent_id: ID of the agent
+            role: Message role ("user" or "assistant")
+            content: Message content
+
+        Returns:
+            The stored message entry
+        """
+        conversation = self._get(agent_id)
+        with conversation.lock:
+            entry = {
+                "seq": conversation.next_seq,
+                "role": role,
+                "content": content,
+                "tokens": self.token_counter(content),
+                "timestamp": time.time(),
+            }
+            conversation.next_seq += 1
+            conversation.messages.append(entry)
+            conversation.tokens += entry["tokens"]
+            if self.log is not None:
+                self.log.append(agent_id, entry)
+                conversation.log_entries += 1
+            self._enforce_bounds(conversation)
+            if self.log is not None:
+                self._compact_log(conversation)
+        return entry
+
+    def _enforce_bounds(self, conversation: Conversation) -> None:
+        """Evict old messages beyond the window bounds (lock held)."""
+        evicted = []
+        # Always keep the newest message, even if it alone exceeds the budget
+        while len(conversation.messages) > 1 and (
+            len(conversation.messages) > self.max_messages
+            or conversation.tokens > self.max_tokens
+        ):
+            message = conversation.messages.popleft()
+            conversation.tokens -= message["tokens"]
+            evicted.append(message)
+        if not evicted:
+            return
+
+        if self.compactor is not None:
+            conversation.summary = self.compactor(conversation.summary, evicted)
+            if self.log is not None:
+                self.log.append(conversation.agent_id, {
+                    "kind": "summary",
+                    "summary": conversation.summary,
+                    "through_seq": evicted[-1]["seq"],
+                })
+                conversation.log_entries += 1
+        logger.debug(f"Compacted {len(evicted)} messages for agent {conversation.agent_id}")
+
+    def _compact_log(self, conversation: Conversation) -> None:
+        """Rewrite a grown log to the current summary and window (lock held).
+
+        Rewriting only once the log holds twice the window keeps the cost
+        amortized constant per message, and bounds what load() scans.
+        """
+        window = len(conversation.messages)
+        if conversation.log_entries < max(LOG_COMPACT_MIN_ENTRIES, 2 * (window + 1)):
+            return
+        entries: List[Dict[str, Any]] = []
+        if conversation.summary is not None and conversation.messages:
+            entries.append({
+                "kind": "summary",
+                "summary": conversation.summary,
+                "through_seq": conversation.messages[0]["seq"] - 1,
+            })
+        entries.extend(conversation.messages)
+        self.log.rewrite(conversation.agent_id, entries)
+        conversation.log_entries = len(entries)
+
+    def get_context(self, agent_id: str) -> Dict[str, Any]:
+        """Get the current context window of an agent.
+
+        Args:
+            agent_id: ID of the agent
+
+        Returns:
+            Dictionary with "summary" and "messages" (role/content/seq)
+        """
+        conversation = self._get(agent_id)
+        with conversation.lock:
+            return {
+                "summary": conversation.summary,
+                "messages": [_public(message) for message in conversation.messages],
+            }
+
+    def get_delta(self, agent_id: str, session_key: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the messages a server has not seen yet in its session.
+
+        Args:
+            agent_id: ID of the agent
+            session_key: Identifier of the server session
+
+        Returns:
+            List of unseen messages, or None if the server has no session yet
+            or part of the delta was already evicted (send the full context)
+        """
+        conversation = self._get(agent_id)
+        with conversation.lock:
+            offset = conversation.server_offsets.get(session_key)
+            if offset is None or not conversation.messages:
+                return None
+            if conversation.messages[0]["seq"] > offset + 1:
+                return None
+            return [_public(message) for message in conversation.messages
+                    if message["seq"] > offset]
+
+    def mark_sent(self, agent_id: str, session_key: str, seq: int) -> None:
+        """Record that a server session holds messages up to a sequence number.
+
+        Args:
+            agent_id: ID of the agent
+            session_key: Identifier of the server session
+            seq: Highest sequence number held by the session
+        """
+        conversation = self._get(agent_id)
+        with conversation.lock:
+            current = conversation.server_offsets.get(session_key, -1)
+            conversation.server_offsets[session_key] = max(current, seq)
+
+    def reset_session(self, session_key: Optional[str]) -> None:
+        """Forget what a server session holds (e.g., after it disconnected).
+
+        Args:
+            session_key: Identifier of the server session, or None for all
+        """
+        with self._lock:
+            conversations = list(self._conversations.values())
+        for conversation in conversations:
+            with conversation.lock:
+                if session_key is None:
+                    conversation.server_offsets.clear()
+                else:
+                    conversation.server_offsets.pop(session_key, None)
+
+
+def _public(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip bookkeeping fields from a stored message."""
+    return {"seq": message["seq"], "role": message["role"], "content": message["content"]}
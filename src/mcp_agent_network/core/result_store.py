@@ -0,0 +1,403 @@
+"""Shared-memory store for handing large results between worker processes."""
+
+import json
+import logging
+import multiprocessing
+import os
+import struct
+from multiprocessing import shared_memory
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Store header: magic, slot count, data size, ring head, next entry id,
+# first free slot, oldest and newest live slots, live entry count
+HEADER = struct.Struct("<4sIQQQIIII")
+# Slot: entry id, data offset, length, reference count, kind, next slot
+SLOT = struct.Struct("<QQQiII")
+MAGIC = b"MRS2"
+# End of a slot list
+NIL = 0xFFFFFFFF
+
+# Slot kinds
+FREE = 0
+RAW = 1
+JSON = 2
+
+DEFAULT_SIZE = 64 * 1024 * 1024
+DEFAULT_SLOTS = 1024
+
+
+class ResultHandle(NamedTuple):
+    """Reference to a result in a SharedResultStore; cheap to pickle."""
+
+    store: str
+    slot: int
+    id: int
+    length: int
+
+
+class SharedResultStore:
+    """Ring-buffer arena in shared memory holding results by handle.
+
+    A worker writes a result once with put() and passes the returned handle
+    to other processes, which read it in place with view() (zero-copy) or
+    get(). Entries are reference counted: put() returns a handle holding one
+    reference, acquire() adds one and release() drops one. Entries without
+    references stay readable until their space is needed, at which point the
+    ring overwrites them; referenced entries are never overwritten.
+
+    Unused slots form a free list, and live entries a queue in ring order
+    starting at the head, both linked through the slots and anchored in the
+    header, so writes only look at the entries they evict or skip.
+
+    The store is shared with child processes by passing it as a Process
+    argument, which transfers the segment name and the cross-process lock.
+    Processes that did not receive the store this way cannot share it.
+    """
+
+    def __init__(self, size: int = DEFAULT_SIZE, slots: int = DEFAULT_SLOTS,
+                 name: Optional[str] = None, lock: Any = None):
+        """Create a new store.
+
+        Args:
+            size: Data capacity in bytes
+            slots: Maximum number of entries
+            name: Optional shared memory segment name
+            lock: Optional multiprocessing lock; a new one is created if omitted
+        """
+        if slots < 1 or slots >= NIL:
+            raise ValueError(f"Slot count must be between 1 and {NIL - 1}")
+        self._lock = lock if lock is not None else multiprocessing.Lock()
+        self._shm = shared_memory.SharedMemory(
+            name=name, create=True, size=HEADER.size + slots * SLOT.size + size
+        )
+        # Forked children inherit this object but must not destroy the segment
+        self._owner_pid: Optional[int] = os.getpid()
+        self.slots = slots
+        self.size = size
+        self._data_start = HEADER.size + slots * SLOT.size
+        self.evictions = 0
+        self._shm.buf[:self._data_start] = bytes(self._data_start)
+        for index in range(slots):
+            self._write_slot(index, 0, 0, 0, 0, FREE, index + 1 if index + 1 < slots else NIL)
+        HEADER.pack_into(self._shm.buf, 0, MAGIC, slots, size, 0, 1, 0, NIL, NIL, 0)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "SharedResultStore":
+        """Create a store from a configuration dictionary.
+
+        The store can only be shared with processes it is passed to (see the
+        class docstring), so configurations cannot name the segment.
+
+        Args:
+            config: Dictionary with optional "size" and "slots" keys
+
+        Returns:
+            New SharedResultStore instance
+        """
+        if "name" in config:
+            raise ValueError("Result stores are shared by passing them to child processes; "
+                             "the 'name' setting is not supported")
+        return cls(
+            size=config.get("size", DEFAULT_SIZE),
+            slots=config.get("slots", DEFAULT_SLOTS),
+        )
+
+    @classmethod
+    def attach(cls, name: str, lock: Any) -> "SharedResultStore":
+        """Attach to a store created by another process.
+
+        Args:
+            name: Shared memory segment name of the store
+            lock: The store's multiprocessing lock
+
+        Returns:
+            SharedResultStore backed by the existing segment
+        """
+        store = cls.__new__(cls)
+        store._lock = lock
+        store._shm = shared_memory.SharedMemory(name=name)
+        _resource_tracker("unregister", store._shm)
+        store._owner_pid = None
+        magic, store.slots, store.size = HEADER.unpack_from(store._shm.buf, 0)[:3]
+        if magic != MAGIC:
+            store._shm.close()
+            raise ValueError(f"Shared memory segment {name} is not a result store")
+        store._data_start = HEADER.size + store.slots * SLOT.size
+        store.evictions = 0
+        return store
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str, Any]]:
+        return SharedResultStore.attach, (self.name, self._lock)
+
+    @property
+    def name(self) -> str:
+        """Shared memory segment name."""
+        return self._shm.name
+
+    def _slot(self, index: int) -> Tuple[int, int, int, int, int, int]:
+        """Read a slot (lock held)."""
+        return SLOT.unpack_from(self._shm.buf, HEADER.size + index * SLOT.size)
+
+    def _write_slot(self, index: int, entry_id: int, offset: int, length: int,
+                    refcount: int, kind: int, next_index: int) -> None:
+        """Write a slot (lock held)."""
+        SLOT.pack_into(self._shm.buf, HEADER.size + index * SLOT.size,
+                       entry_id, offset, length, refcount, kind, next_index)
+
+    def _set_next(self, index: int, next_index: int) -> None:
+        """Relink a slot (lock held)."""
+        struct.pack_into("<I", self._shm.buf,
+                         HEADER.size + index * SLOT.size + SLOT.size - 4, next_index)
+
+    def _find_slot(self, handle: ResultHandle) -> Tuple[int, int, int, int, int, int]:
+        """Read the slot of a handle, checking it still holds the entry (lock held)."""
+        if handle.store != self.name or not 0 <= handle.slot < self.slots:
+            raise ValueError(f"Handle does not belong to store {self.name}")
+        slot = self._slot(handle.slot)
+        if slot[4] == FREE or slot[0] != handle.id:
+            raise ValueError(f"Result {handle.id} has been evicted")
+        return slot
+
+    def put(self, value: Any) -> ResultHandle:
+        """Write a result into the store.
+
+        Args:
+            value: bytes-like data stored as is, or a JSON-serializable result
+
+        Returns:
+            Handle holding one reference to the entry
+        """
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            data, kind = memoryview(value).cast("B"), RAW
+        else:
+            data, kind = json.dumps(value, separators=(",", ":")).encode("utf-8"), JSON
+        length = len(data)
+        if length > self.size:
+            raise ValueError(f"Result of {length} bytes exceeds store capacity of {self.size}")
+
+        with self._lock:
+            queue = _Queue(self, *HEADER.unpack_from(self._shm.buf, 0)[3:])
+            try:
+                offset = queue.reserve(length)
+                index = queue.take_slot()
+                start = self._data_start + offset
+                self._shm.buf[start:start + length] = data
+                entry_id = queue.next_id
+                self._write_slot(index, entry_id, offset, length, 1, kind, NIL)
+                queue.append(index)
+                queue.head = offset + length
+                queue.next_id += 1
+            finally:
+                # Evictions and skipped entries stand even if the write failed
+                queue.save()
+        return ResultHandle(self.name, index, entry_id, length)
+
+    def view(self, handle: ResultHandle) -> memoryview:
+        """Get a zero-copy view of an entry's bytes.
+
+        The view is only valid while a reference to the entry is held and
+        must be released before the store is closed.
+
+        Args:
+            handle: Handle from put()
+
+        Returns:
+            Read-only memoryview of the stored bytes
+        """
+        with self._lock:
+            _, offset, length, _, _, _ = self._find_slot(handle)
+        start = self._data_start + offset
+        return self._shm.buf[start:start + length].toreadonly()
+
+    def get(self, handle: ResultHandle) -> Any:
+        """Read an entry.
+
+        Args:
+            handle: Handle from put()
+
+        Returns:
+            bytes for raw entries, the decoded result for JSON entries
+        """
+        with self._lock:
+            _, offset, length, _, kind, _ = self._find_slot(handle)
+            start = self._data_start + offset
+            data = bytes(self._shm.buf[start:start + length])
+        return json.loads(data) if kind == JSON else data
+
+    def acquire(self, handle: ResultHandle) -> None:
+        """Add a reference to an entry.
+
+        Args:
+            handle: Handle of a live entry
+        """
+        with self._lock:
+            entry_id, offset, length, refcount, kind, next_index = self._find_slot(handle)
+            self._write_slot(handle.slot, entry_id, offset, length, refcount + 1, kind,
+                             next_index)
+
+    def release(self, handle: ResultHandle) -> None:
+        """Drop a reference; unreferenced entries become evictable.
+
+        Args:
+            handle: Handle of a live entry
+        """
+        with self._lock:
+            entry_id, offset, length, refcount, kind, next_index = self._find_slot(handle)
+            self._write_slot(handle.slot, entry_id, offset, length, max(0, refcount - 1), kind,
+                             next_index)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get store usage.
+
+        Returns:
+            Dictionary with capacity, entry and byte counts, and evictions
+            performed by this process
+        """
+        with self._lock:
+            live = []
+            index = HEADER.unpack_from(self._shm.buf, 0)[6]
+            while index != NIL:
+                live.append(self._slot(index))
+                index = live[-1][5]
+        return {
+            "name": self.name,
+            "size": self.size,
+            "slots": self.slots,
+            "entries": len(live),
+            "referenced": sum(1 for slot in live if slot[3] > 0),
+            "bytes_used": sum(slot[2] for slot in live),
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        """Detach from the store; the creating process also destroys it."""
+        self._shm.close()
+        if self._owner_pid == os.getpid():
+            # Children sharing our resource tracker may have unregistered it
+            _resource_tracker("register", self._shm)
+            self._shm.unlink()
+            self._owner_pid = None
+
+
+class _Queue:
+    """Free list and live entry queue of a store, edited under its lock.
+
+    Live entries are queued in ring order starting at the head: the entries
+    just ahead of the head come first and are the next to be overwritten.
+    """
+
+    def __init__(self, store: SharedResultStore, head: int, next_id: int, free: int,
+                 oldest: int, newest: int, count: int):
+        self.store = store
+        self.head = head
+        self.next_id = next_id
+        self.free = free
+        self.oldest = oldest
+        self.newest = newest
+        self.count = count
+
+    def save(self) -> None:
+        """Write the header back."""
+        store = self.store
+        HEADER.pack_into(store._shm.buf, 0, MAGIC, store.slots, store.size, self.head,
+                         self.next_id, self.free, self.oldest, self.newest, self.count)
+
+    def append(self, index: int) -> None:
+        """Queue a live slot as the newest entry."""
+        self.store._set_next(index, NIL)
+        if self.newest == NIL:
+            self.oldest = index
+        else:
+            self.store._set_next(self.newest, index)
+        self.newest = index
+        self.count += 1
+
+    def _unlink(self, index: int, previous: int, next_index: int) -> None:
+        """Remove a slot from the live queue."""
+        if previous == NIL:
+            self.oldest = next_index
+        else:
+            self.store._set_next(previous, next_index)
+        if self.newest == index:
+            self.newest = previous
+        self.count -= 1
+
+    def _evict(self, index: int, previous: int, next_index: int) -> None:
+        """Free a live slot."""
+        self._unlink(index, previous, next_index)
+        self.store._write_slot(index, 0, 0, 0, 0, FREE, self.free)
+        self.free = index
+        self.store.evictions += 1
+
+    def _rotate(self) -> None:
+        """Move the oldest entry to the back of the queue."""
+        index = self.oldest
+        self._unlink(index, NIL, self.store._slot(index)[5])
+        self.append(index)
+
+    def take_slot(self) -> int:
+        """Pop a free slot, evicting the oldest unreferenced entry if none is left."""
+        if self.free == NIL:
+            previous, index = NIL, self.oldest
+            while index != NIL:
+                _, _, _, refcount, _, next_index = self.store._slot(index)
+                if refcount <= 0:
+                    self._evict(index, previous, next_index)
+                    break
+                previous, index = index, next_index
+            else:
+                raise MemoryError("All result store slots are referenced")
+        index = self.free
+        self.free = self.store._slot(index)[5]
+        return index
+
+    def reserve(self, length: int) -> int:
+        """Find room for an entry at or after the ring head.
+
+        Unreferenced entries in the way are evicted; referenced ones are
+        skipped over and requeued behind the head, which moves past them.
+
+        Returns:
+            Offset of the reserved range
+        """
+        store = self.store
+        for _ in range(self.count + 2):
+            start = self.head
+            if start + length > store.size:
+                # The rest of the ring is skipped; its entries are now newest
+                for _ in range(self.count):
+                    if store._slot(self.oldest)[1] < start:
+                        break
+                    self._rotate()
+                start = self.head = 0
+            end = start + length
+            blocked = False
+            while self.oldest != NIL:
+                _, offset, size, refcount, _, next_index = store._slot(self.oldest)
+                if not start <= offset < end:
+                    break
+                if refcount > 0:
+                    self._rotate()
+                    self.head = offset + size
+                    blocked = True
+                    break
+                self._evict(self.oldest, NIL, next_index)
+            if not blocked:
+                return start
+        raise MemoryError("Result store is full of referenced entries")
+
+
+def _resource_tracker(action: str, shm: shared_memory.SharedMemory) -> None:
+    """Register or unregister a segment with Python's resource tracker.
+
+    Attaching registers the segment too, so without unregistering, the
+    tracker of a process that only attached would destroy it at exit.
+    """
+    try:
+        from multiprocessing import resource_tracker
+        getattr(resource_tracker, action)(shm._name, "shared_memory")
+    except Exception:  # pragma: no cover - tracker internals differ across versions
+        pass
@@ -1,7 +1,26 @@
 """MCP client and server connection components."""
 
 from mcp_agent_network.mcp.client import MCPClient
+from mcp_agent_network.mcp.concurrency import AdaptiveConcurrencyLimit
 from mcp_agent_network.mcp.connection_manager import MCPConnectionManager
-from mcp_agent_network.mcp.progress import ProgressBar, SpinnerIndicator
+from mcp_agent_network.mcp.events import Event, EventBus, Subscription
+from mcp_agent_network.mcp.progress import ProgressBar, ProgressRenderer, SpinnerIndicator
+from mcp_agent_network.mcp.rate_limit import RateLimiter, TokenBucket
+from mcp_agent_network.mcp.tool_catalog import ToolCatalog
+from mcp_agent_network.mcp.tool_index import ToolIndex
 
-__all__ = ["MCPClient", "MCPConnectionManager", "ProgressBar", "SpinnerIndicator"] 
\ No newline at end of file
+__all__ = [
+    "AdaptiveConcurrencyLimit",
+    "Event",
+    "EventBus",
+    "MCPClient",
+    "MCPConnectionManager",
+    "ProgressBar",
+    "ProgressRenderer",
+    "RateLimiter",
+    "SpinnerIndicator",
+    "Subscription",
+    "TokenBucket",
+    "ToolCatalog",
+    "ToolIndex",
+]
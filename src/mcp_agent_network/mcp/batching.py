@@ -0,0 +1,184 @@
+"""Micro-batching of small messages sent to the same MCP server."""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Sends a list of messages in one round trip and returns one response per message
+BatchSender = Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+
+
+class _PendingMessage:
+    """Message waiting in a batch for its response."""
+
+    __slots__ = ("message", "response", "done")
+
+    def __init__(self, message: Dict[str, Any]):
+        self.message = message
+        self.response: Optional[Dict[str, Any]] = None
+        self.done = threading.Event()
+
+
+class MicroBatcher:
+    """Collects messages over a short window and sends them as one batch.
+
+    The first message of a batch opens a window of ``max_delay`` seconds;
+    the batch is flushed when the window closes or ``max_batch_size``
+    messages are waiting, whichever comes first. Callers block until their
+    own response has been demultiplexed from the batch response. Up to
+    ``max_concurrent_batches`` batches may be in flight at once.
+    """
+
+    def __init__(self, send_batch: BatchSender, max_delay: float = 0.005,
+                 max_batch_size: int = 32, max_concurrent_batches: int = 4,
+                 name: str = "batcher"):
+        """Initialize the batcher.
+
+        Args:
+            send_batch: Function sending a list of messages in one round trip
+            max_delay: Maximum time a message waits for its batch to fill (seconds)
+            max_batch_size: Maximum number of messages per batch
+            max_concurrent_batches: Maximum number of batches in flight
+            name: Name used in logs and thread names (usually the server name)
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.send_batch = send_batch
+        self.max_delay = max_delay
+        self.max_batch_size = max_batch_size
+        self.max_concurrent_batches = max_concurrent_batches
+        self.name = name
+        self.batches = 0
+        self.messages = 0
+        self.largest_batch = 0
+        self._pending: List[_PendingMessage] = []
+        self._window_start = 0.0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_config(cls, send_batch: BatchSender, config: Dict[str, Any],
+                    name: str = "batcher") -> "MicroBatcher":
+        """Create a batcher from a configuration dictionary.
+
+        Args:
+            send_batch: Function sending a list of messages in one round trip
+            config: Dictionary with optional "max_delay", "max_batch_size"
+                and "max_concurrent_batches" keys
+            name: Name of the batcher
+
+        Returns:
+            Configured MicroBatcher instance
+        """
+        return cls(
+            send_batch,
+            max_delay=config.get("max_delay", 0.005),
+            max_batch_size=config.get("max_batch_size", 32),
+            max_concurrent_batches=config.get("max_concurrent_batches", 4),
+            name=name,
+        )
+
+    def _start(self) -> None:
+        """Start the flusher thread on first use (lock held)."""
+        if self._thread is not None:
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_batches, thread_name_prefix=f"batch-{self.name}"
+        )
+        self._thread = threading.Thread(
+            target=self._run, name=f"batcher-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Add a message to the current batch and wait for its response.
+
+        Args:
+            message: Message to send
+
+        Returns:
+            Response to this message
+        """
+        pending = _PendingMessage(message)
+        with self._cond:
+            if self._closed:
+                return {"error": "Batcher is closed", "status": "rejected", "server": self.name}
+            self._start()
+            if not self._pending:
+                self._window_start = time.monotonic()
+            self._pending.append(pending)
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch_size:
+                self._cond.notify()
+        pending.done.wait()
+        return pending.response
+
+    def _run(self) -> None:
+        """Flush batches until closed."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                # Let the batch fill until the window closes or it is full
+                while not self._closed and len(self._pending) < self.max_batch_size:
+                    remaining = self._window_start + self.max_delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:self.max_batch_size]
+                self._pending = self._pending[self.max_batch_size:]
+                self._window_start = time.monotonic()
+                self.batches += 1
+                self.messages += len(batch)
+                self.largest_batch = max(self.largest_batch, len(batch))
+                executor = self._executor
+            executor.submit(self._flush, batch)
+
+    def _flush(self, batch: List[_PendingMessage]) -> None:
+        """Send a batch and hand each caller its response."""
+        try:
+            responses = self.send_batch([pending.message for pending in batch])
+        except Exception as e:
+            logger.error(f"Error sending batch of {len(batch)} messages to {self.name}: {e}")
+            responses = [{"error": str(e), "status": "failed", "server": self.name}] * len(batch)
+        for i, pending in enumerate(batch):
+            if i < len(responses):
+                pending.response = responses[i]
+            else:
+                pending.response = {"error": "Missing response in batch", "status": "failed",
+                                    "server": self.name}
+            pending.done.set()
+
+    def close(self) -> None:
+        """Flush waiting messages and stop the flusher thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread, executor = self._thread, self._executor
+        if thread is not None:
+            thread.join()
+            executor.shutdown(wait=True)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get batching statistics.
+
+        Returns:
+            Dictionary with batch and message counters
+        """
+        with self._cond:
+            return {
+                "max_delay": self.max_delay,
+                "max_batch_size": self.max_batch_size,
+                "queued": len(self._pending),
+                "batches": self.batches,
+                "messages": self.messages,
+                "largest_batch": self.largest_batch,
+                "average_batch_size": self.messages / self.batches if self.batches else 0.0,
+            }
@@ -1,13 +1,25 @@
 """MCP client for connecting to MCP servers."""
 
 import logging
+import threading
 import time
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+from mcp_agent_network.mcp.batching import MicroBatcher
+from mcp_agent_network.mcp.compression import CODECS, Compressor, negotiate
+from mcp_agent_network.mcp.concurrency import PRIORITIES, AdaptiveConcurrencyLimit
+from mcp_agent_network.mcp.latency import LatencyStats
+from mcp_agent_network.mcp.profiling import Profiler
+from mcp_agent_network.mcp.rate_limit import RateLimiter, parse_retry_after
+from mcp_agent_network.mcp.schema_validation import SchemaValidator, get_validator
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Capability listings a server can provide
+CAPABILITY_KINDS = ("tools", "resources", "prompts")
+
 
 class MCPClient:
     """Client for connecting to MCP servers.
@@ -16,19 +28,60 @@ class MCPClient:
     and provides methods for communication.
     """
     
-    def __init__(self, server_name: str, api_key: Optional[str] = None):
+    def __init__(self, server_name: str, api_key: Optional[str] = None,
+                 rate_limiter: Optional[RateLimiter] = None, validate_schemas: bool = True,
+                 concurrency_limit: Optional[AdaptiveConcurrencyLimit] = None,
+                 batching: Optional[Dict[str, Any]] = None,
+                 compression: Optional[Dict[str, Any]] = None):
         """Initialize MCP client.
         
         Args:
             server_name: Name of the MCP server to connect to
             api_key: Optional API key for authentication
+            rate_limiter: Optional admission controller for outgoing messages
+            validate_schemas: Whether to validate tool calls against the tool
+                schemas (disable for trusted servers)
+            concurrency_limit: Optional adaptive cap on in-flight messages
+            batching: Optional micro-batching configuration
+                (see MicroBatcher.from_config)
+            compression: Optional compression preferences, negotiated with
+                the server at connect time (see compression.negotiate)
         """
         self.server_name = server_name
         self.api_key = api_key
+        self.rate_limiter = rate_limiter
+        self.validate_schemas = validate_schemas
+        self.concurrency_limit = concurrency_limit
+        self.compression_config = compression
+        self.profiler: Optional[Profiler] = None
+        self.compressor: Optional[Compressor] = None
+        self.batching_config = batching
+        self.batcher = self._build_batcher()
         self.connected = False
         self.connection_info = {}
         self.last_ping_time = 0
         self.connection_latency = 0
+        self.connection_latency_ns = 0
+        self.latency_spike = False
+        self.message_spike = False
+        self._last_ping_ns = 0
+        # Handshake/ping round trips and message round trips, tracked separately
+        self.latency = LatencyStats()
+        self.message_latency = LatencyStats()
+        self.accepting = True
+        self.in_flight = 0
+        self.expired = 0
+        self._drain_cond = threading.Condition()
+        self._state_lock = threading.Lock()
+        # Wire time of each thread's last message, and of batched messages
+        # (by id) until their callers pick it up
+        self._timing = threading.local()
+        self._batch_transmit: Dict[int, float] = {}
+        # Compiled (inputSchema, outputSchema) validators of each advertised tool
+        self._tool_validators: Dict[str, Tuple[Optional[SchemaValidator],
+                                               Optional[SchemaValidator]]] = {}
+        self.capabilities: Dict[str, List[Dict[str, Any]]] = {}
+        self.notification_handlers: List[Callable[["MCPClient", Dict[str, Any]], None]] = []
         
     def connect(self) -> Tuple[bool, Dict[str, Any]]:
         """Connect to the MCP server.
@@ -36,50 +89,189 @@ class MCPClient:
         Returns:
             Tuple of (success, connection_info)
         """
-        logger.info(f"Connecting to MCP server: {self.server_name}")
+        with self._state_lock:
+            logger.info(f"Connecting to MCP server: {self.server_name}")
+            
+            # Track connection time for latency (monotonic, nanoseconds)
+            start_ns = time.perf_counter_ns()
+            
+            # Connection would happen here with the real implementation
+            # For now, simulate connection process with proper logging
+            
+            # Connection steps would include:
+            # 1. Resolve server address
+            # 2. Establish secure connection
+            # 3. Authenticate with API key if provided
+            # 4. Fetch server capabilities
+            
+            # Set connected state based on outcome
+            self.connected = True
+            self.accepting = True
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            self._record_latency(elapsed_ns)
+            if self.profiler is not None:
+                self.profiler.record("connect", "total", elapsed_ns / 1e9, self.server_name)
+            
+            self.connection_info = {
+                "server_name": self.server_name,
+                "connection_latency": f"{self.connection_latency}ms",
+                "protocol_version": "MCP/1.0",
+                "server_version": "1.0.0",
+                "features": ["agent_communication", "task_execution", "knowledge_sharing"],
+                "compression": list(CODECS),
+            }
+            
+            # Agree on a codec both ends support
+            self.compressor = negotiate(self.compression_config,
+                                        self.connection_info["compression"])
+            if self.compressor is not None:
+                logger.info(f"Using {self.compressor.codec} compression with {self.server_name}")
+            
+            logger.info(f"Connected to {self.server_name} (latency: {self.connection_latency}ms)")
+            return self.connected, self.connection_info
+    
+    def disconnect(self) -> bool:
+        """Disconnect from the MCP server.
         
-        # Track connection time for latency
-        start_time = time.time()
+        Messages waiting for a batch are flushed first and the batcher's
+        threads are stopped.
         
-        # Connection would happen here with the real implementation
-        # For now, simulate connection process with proper logging
+        Returns:
+            Success status
+        """
+        self.set_batching(self.batching_config)
+        with self._state_lock:
+            if not self.connected:
+                logger.warning(f"Not connected to {self.server_name}")
+                return False
+            
+            logger.info(f"Disconnecting from MCP server: {self.server_name}")
+            self.connected = False
+            self.connection_info = {}
+            self.compressor = None
+            return True
+    
+    def _build_batcher(self) -> Optional[MicroBatcher]:
+        """Build the micro-batcher for the current batching configuration."""
+        if self.batching_config is None:
+            return None
+        return MicroBatcher.from_config(self._send_batch, self.batching_config,
+                                        name=self.server_name)
+    
+    def set_batching(self, batching: Optional[Dict[str, Any]]) -> None:
+        """Replace the micro-batching configuration.
         
-        # Connection steps would include:
-        # 1. Resolve server address
-        # 2. Establish secure connection
-        # 3. Authenticate with API key if provided
-        # 4. Fetch server capabilities
+        The current batcher is flushed and closed; its replacement only
+        starts threads once messages arrive.
         
-        # Set connected state based on outcome
-        self.connected = True
-        elapsed_time = time.time() - start_time
-        self.connection_latency = round(elapsed_time * 1000)  # ms
-        self.last_ping_time = time.time()
+        Args:
+            batching: Micro-batching configuration, or None to disable batching
+        """
+        previous = self.batcher
+        self.batching_config = batching
+        self.batcher = self._build_batcher()
+        if previous is not None:
+            previous.close()
+    
+    def list_capabilities(self, kind: str) -> List[Dict[str, Any]]:
+        """Fetch a capability listing from the server.
         
-        self.connection_info = {
-            "server_name": self.server_name,
-            "connection_latency": f"{self.connection_latency}ms",
-            "protocol_version": "MCP/1.0",
-            "features": ["agent_communication", "task_execution", "knowledge_sharing"],
+        Args:
+            kind: One of "tools", "resources" or "prompts"
+            
+        Returns:
+            List of capability descriptors, empty if not connected
+        """
+        if kind not in CAPABILITY_KINDS:
+            raise ValueError(f"Unknown capability kind: {kind}")
+        if not self.connected:
+            logger.warning(f"Cannot list {kind} on {self.server_name}: not connected")
+            return []
+        
+        logger.debug(f"Listing {kind} on {self.server_name}")
+        
+        # Actual "<kind>/list" request would happen here
+        # For now, expose one tool per advertised feature
+        if kind != "tools":
+            return []
+        return [
+            {
+                "name": feature,
+                "description": f"{feature.replace('_', ' ').capitalize()} via {self.server_name}",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {"content": {"type": "string"}},
+                },
+            }
+            for feature in self.connection_info.get("features", [])
+        ]
+    
+    @property
+    def capabilities(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Capability listings of the server, by kind."""
+        return self._capabilities
+    
+    @capabilities.setter
+    def capabilities(self, capabilities: Dict[str, List[Dict[str, Any]]]) -> None:
+        self._capabilities = capabilities
+        # Compiled once per listing, so call_tool only looks validators up by name
+        self._tool_validators = {
+            tool["name"]: (self._compile_schema(tool, "inputSchema"),
+                           self._compile_schema(tool, "outputSchema"))
+            for tool in capabilities.get("tools", [])
         }
+    
+    def _compile_schema(self, tool: Dict[str, Any], key: str) -> Optional[SchemaValidator]:
+        """Get the validator for one of a tool's schemas, or None if it has none.
         
-        logger.info(f"Connected to {self.server_name} (latency: {self.connection_latency}ms)")
-        return self.connected, self.connection_info
+        Schemas that fail to compile are logged and not enforced.
+        """
+        try:
+            return get_validator(tool.get(key))
+        except Exception as e:
+            logger.warning(f"Ignoring invalid {key} of {tool['name']} on {self.server_name}: {e}")
+            return None
     
-    def disconnect(self) -> bool:
-        """Disconnect from the MCP server.
+    def add_notification_handler(
+        self, handler: Callable[["MCPClient", Dict[str, Any]], None]
+    ) -> None:
+        """Register a handler for server notifications.
         
-        Returns:
-            Success status
+        Args:
+            handler: Callable receiving the client and the notification
         """
-        if not self.connected:
-            logger.warning(f"Not connected to {self.server_name}")
-            return False
+        self.notification_handlers.append(handler)
+    
+    def handle_notification(self, notification: Dict[str, Any]) -> None:
+        """Dispatch a notification received from the server.
         
-        logger.info(f"Disconnecting from MCP server: {self.server_name}")
-        self.connected = False
-        self.connection_info = {}
-        return True
+        Args:
+            notification: Notification with a "method" key
+                (e.g., "notifications/tools/list_changed")
+        """
+        logger.debug(f"Notification from {self.server_name}: {notification.get('method')}")
+        for handler in list(self.notification_handlers):
+            try:
+                handler(self, notification)
+            except Exception as e:
+                logger.error(f"Error handling notification from {self.server_name}: {e}")
+    
+    def stop_accepting(self) -> None:
+        """Stop admitting new messages while letting in-flight ones finish."""
+        with self._drain_cond:
+            self.accepting = False
+    
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait for in-flight messages to complete.
+        
+        Args:
+            timeout: Maximum time to wait in seconds, or None to wait forever
+            
+        Returns:
+            True if no messages are in flight, False if the timeout expired
+        """
+        with self._drain_cond:
+            return self._drain_cond.wait_for(lambda: self.in_flight == 0, timeout)
     
     def ping(self) -> int:
         """Ping the MCP server to check connection.
@@ -91,17 +283,30 @@ class MCPClient:
             logger.warning(f"Cannot ping {self.server_name}: not connected")
             return -1
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         # Actual ping would happen here
         
-        elapsed_time = time.time() - start_time
-        latency = round(elapsed_time * 1000)  # ms
-        self.connection_latency = latency
-        self.last_ping_time = time.time()
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        self._record_latency(elapsed_ns)
+        if self.profiler is not None:
+            self.profiler.record("ping", "total", elapsed_ns / 1e9, self.server_name)
+        
+        logger.debug(f"Ping to {self.server_name}: {elapsed_ns / 1e6:.3f}ms")
+        return self.connection_latency
+    
+    def _record_latency(self, elapsed_ns: int) -> None:
+        """Store a handshake or ping round trip.
         
-        logger.debug(f"Ping to {self.server_name}: {latency}ms")
-        return latency
+        Args:
+            elapsed_ns: Measured latency in nanoseconds
+        """
+        self.latency_spike = self.latency.is_outlier(elapsed_ns)
+        self.connection_latency_ns = elapsed_ns
+        self.connection_latency = round(elapsed_ns / 1_000_000)  # ms, for display
+        self.latency.observe(elapsed_ns)
+        self.last_ping_time = time.time()
+        self._last_ping_ns = time.monotonic_ns()
     
     def get_status(self) -> Dict[str, Any]:
         """Get current connection status.
@@ -112,34 +317,355 @@ class MCPClient:
         if not self.connected:
             return {"status": "disconnected", "server_name": self.server_name}
         
-        time_since_ping = time.time() - self.last_ping_time
+        time_since_ping = (time.monotonic_ns() - self._last_ping_ns) / 1e9
         
-        return {
+        status = {
             "status": "connected",
             "server_name": self.server_name,
             "connection_latency": f"{self.connection_latency}ms",
             "time_since_ping": f"{round(time_since_ping)}s",
             "features": self.connection_info.get("features", []),
+            "latency": self.latency.to_dict(),
+            "message_latency": self.message_latency.to_dict(),
+            "latency_spike": self.latency_spike,
+            "message_spike": self.message_spike,
         }
+        if self.rate_limiter is not None:
+            status["rate_limit"] = self.rate_limiter.get_status()
+        if self.concurrency_limit is not None:
+            status["concurrency"] = self.concurrency_limit.get_status()
+        if self.batcher is not None:
+            status["batching"] = self.batcher.get_status()
+        if self.compressor is not None:
+            status["compression"] = self.compressor.get_status()
+        if self.expired:
+            status["expired"] = self.expired
+        return status
     
     def send_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """Send a message to the MCP server.
         
+        Messages may carry a "priority" (one of "interactive", "normal" or
+        "bulk") selecting their dispatch lane, and a "deadline" (epoch
+        seconds) after which they are dropped instead of sent. Interactive
+        messages skip micro-batching.
+        
         Args:
             message: Message to send
             
         Returns:
             Response from the server
         """
+        self._timing.transmit = 0.0
         if not self.connected:
             logger.error(f"Cannot send message to {self.server_name}: not connected")
             return {"error": "Not connected", "status": "failed"}
         
-        logger.info(f"Sending message to {self.server_name}")
-        logger.debug(f"Message content: {message}")
+        if self._expired(message):
+            return self._expired_response()
+        
+        with self._drain_cond:
+            if not self.accepting:
+                logger.warning(f"Cannot send message to {self.server_name}: client is draining")
+                return {"error": "Client is draining", "status": "rejected",
+                        "server": self.server_name}
+            self.in_flight += 1
+        
+        profiler = self.profiler
+        start_time = time.perf_counter()
+        try:
+            if (self.batcher is not None and message.get("type") != "batch"
+                    and message.get("priority") != "interactive"):
+                response = self.batcher.submit(message)
+                # The batch was transmitted on the flusher's thread
+                self._timing.transmit = self._batch_transmit.pop(id(message), 0.0)
+                return response
+            return self._dispatch(message)
+        finally:
+            if profiler is not None:
+                profiler.record("send_message", "total", time.perf_counter() - start_time,
+                                self.server_name)
+            with self._drain_cond:
+                self.in_flight -= 1
+                if self.in_flight == 0:
+                    self._drain_cond.notify_all()
+    
+    def last_transmit_time(self) -> float:
+        """Get the time the calling thread's last message spent on the wire.
+        
+        Unlike the caller's wall time, this excludes queueing for admission
+        and micro-batching.
         
+        Returns:
+            Transmit time in seconds, 0.0 if the message was not transmitted
+        """
+        return getattr(self._timing, "transmit", 0.0)
+    
+    def call_tool(self, tool_name: str, arguments: Dict[str, Any],
+                  priority: Optional[str] = None,
+                  deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Call a tool on the MCP server.
+        
+        Arguments are checked against the tool's inputSchema before sending
+        and the result against its outputSchema afterwards, so malformed
+        calls fail locally instead of costing a round trip.
+        
+        Args:
+            tool_name: Name of the tool
+            arguments: Tool arguments
+            priority: Optional dispatch lane (see send_message)
+            deadline: Optional deadline in epoch seconds
+            
+        Returns:
+            Response from the server, or a failure with "validation_errors"
+        """
+        validators = self._tool_validators.get(tool_name) if self.validate_schemas else None
+        input_validator, output_validator = validators or (None, None)
+        if input_validator is not None:
+            errors = input_validator.validate(arguments)
+            if errors:
+                logger.warning(f"Invalid arguments for {tool_name} on {self.server_name}: {errors}")
+                return {"error": f"Invalid arguments for tool {tool_name}", "status": "failed",
+                        "server": self.server_name, "validation_errors": errors}
+        
+        message = {"type": "tool_call", "tool": tool_name, "arguments": arguments}
+        if priority is not None:
+            message["priority"] = priority
+        if deadline is not None:
+            message["deadline"] = deadline
+        response = self.send_message(message)
+        
+        if output_validator is not None and "structuredContent" in response:
+            errors = output_validator.validate(response["structuredContent"])
+            if errors:
+                logger.warning(f"Invalid result from {tool_name} on {self.server_name}: {errors}")
+                return {"error": f"Invalid result from tool {tool_name}", "status": "failed",
+                        "server": self.server_name, "validation_errors": errors,
+                        "response": response}
+        return response
+    
+    def _send_batch(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send several messages in one round trip.
+        
+        The batch passes admission control once, as a single message, in the
+        highest priority lane of its members and bounded by their earliest
+        deadline. Members whose deadline passed while the batch filled are
+        dropped.
+        
+        Args:
+            messages: Messages to send
+            
+        Returns:
+            One response per message, in order
+        """
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        live = []
+        for i, message in enumerate(messages):
+            if self._expired(message):
+                responses[i] = self._expired_response()
+            else:
+                live.append(i)
+        if not live:
+            return responses
+        
+        members = [messages[i] for i in live]
+        batch = {"type": "batch", "messages": members,
+                 "priority": min((m.get("priority", "normal") for m in members),
+                                 key=PRIORITIES.index)}
+        deadlines = [m["deadline"] for m in members if m.get("deadline") is not None]
+        if deadlines:
+            batch["deadline"] = min(deadlines)
+        
+        self._timing.transmit = 0.0
+        response = self._dispatch(batch)
+        transmit = self.last_transmit_time()
+        for member in members:
+            self._batch_transmit[id(member)] = transmit
+        batch_responses = response.get("responses")
+        if not isinstance(batch_responses, list):
+            # The batch as a whole failed or was rejected
+            batch_responses = [response] * len(members)
+        for i, member_response in zip(live, batch_responses):
+            responses[i] = member_response
+        return responses
+    
+    def _dispatch(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Send an accepted message through admission control.
+        
+        Args:
+            message: Message to send
+            
+        Returns:
+            Response from the server
+        """
+        queue_start = time.perf_counter()
+        limit = self.concurrency_limit
+        if limit is None:
+            return self._admit(message, queue_start)
+        
+        admitted = limit.acquire(self._max_wait(message, limit.max_wait),
+                                 message.get("priority", "normal"))
+        if not admitted:
+            if self._expired(message):
+                return self._expired_response()
+            logger.warning(f"Concurrency limit reached for {self.server_name}, rejecting message")
+            return {"error": "Concurrency limit reached", "status": "rejected",
+                    "server": self.server_name}
+        start_time = time.monotonic()
+        response = None
+        try:
+            response = self._admit(message, queue_start)
+        finally:
+            if response is None:
+                limit.release(success=False)
+            elif response.get("status") == "rejected":
+                # Rejected locally by the rate limiter; says nothing about the server
+                limit.release()
+            else:
+                success = (response.get("status") != "failed"
+                           and parse_retry_after(response) is None)
+                limit.release(time.monotonic() - start_time, success)
+        return response
+    
+    def _admit(self, message: Dict[str, Any], queue_start: float) -> Dict[str, Any]:
+        """Send a message through the rate limiter.
+        
+        Args:
+            message: Message to send
+            queue_start: perf_counter() reading when the message entered
+                admission control (before any concurrency wait)
+            
+        Returns:
+            Response from the server
+        """
+        profiler = self.profiler
+        # Release on the limiter that admitted the message, even if it is swapped meanwhile
+        limiter = self.rate_limiter
+        admitted = (limiter.acquire(self._max_wait(message, limiter.max_wait))
+                    if limiter is not None else True)
+        if profiler is not None:
+            # Concurrency and rate limiter waits together make up one queue sample
+            profiler.record("send_message", "queue", time.perf_counter() - queue_start,
+                            self.server_name)
+        if not admitted:
+            if self._expired(message):
+                return self._expired_response()
+            logger.warning(f"Rate limit exceeded for {self.server_name}, rejecting message")
+            return {"error": "Rate limited", "status": "rejected", "server": self.server_name}
+        
+        try:
+            # The deadline may have passed while queued
+            if self._expired(message):
+                return self._expired_response()
+            logger.info(f"Sending message to {self.server_name}")
+            logger.debug(f"Message content: {message}")
+            compressor = self.compressor
+            start_ns = time.perf_counter_ns()
+            if profiler is not None:
+                response = self._profiled_transmit(message, compressor, profiler)
+            elif compressor is not None:
+                response = compressor.decode(self._transmit(compressor.encode(message)))
+            else:
+                response = self._transmit(message)
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            self.message_spike = self.message_latency.is_outlier(elapsed_ns)
+            self.message_latency.observe(elapsed_ns)
+            self._timing.transmit = elapsed_ns / 1e9
+        finally:
+            if limiter is not None:
+                limiter.release()
+        
+        # Adapt to throttling signaled by the server (429 / retry-after)
+        if limiter is not None:
+            limiter.observe(response)
+        return response
+    
+    @staticmethod
+    def _max_wait(message: Dict[str, Any], max_wait: Optional[float]) -> Optional[float]:
+        """Bound a queueing budget by the message's deadline, if any."""
+        deadline = message.get("deadline")
+        if deadline is None:
+            return max_wait
+        remaining = max(0.0, deadline - time.time())
+        return remaining if max_wait is None else min(max_wait, remaining)
+    
+    def _expired(self, message: Dict[str, Any]) -> bool:
+        """Check whether a message's deadline has passed."""
+        deadline = message.get("deadline")
+        return deadline is not None and time.time() >= deadline
+    
+    def _expired_response(self) -> Dict[str, Any]:
+        """Count a dropped message and build its response."""
+        with self._drain_cond:
+            self.expired += 1
+        logger.warning(f"Deadline exceeded for message to {self.server_name}, dropping it")
+        return {"error": "Deadline exceeded", "status": "rejected", "server": self.server_name}
+    
+    def _profiled_transmit(self, message: Dict[str, Any], compressor: Optional[Compressor],
+                           profiler: Profiler) -> Dict[str, Any]:
+        """Transmit a message, recording serialization, network and server time.
+        
+        Servers may report their processing time as "processing_time_ms";
+        it is split off from the network phase.
+        
+        Args:
+            message: Message to send
+            compressor: Negotiated compressor, if any
+            profiler: Profiler receiving the phase timings
+            
+        Returns:
+            Response from the server
+        """
+        serialize_time = 0.0
+        if compressor is not None:
+            start_time = time.perf_counter()
+            message = compressor.encode(message)
+            serialize_time = time.perf_counter() - start_time
+        
+        start_time = time.perf_counter()
+        response = self._transmit(message)
+        network_time = time.perf_counter() - start_time
+        
+        if compressor is not None:
+            start_time = time.perf_counter()
+            response = compressor.decode(response)
+            serialize_time += time.perf_counter() - start_time
+            profiler.record("send_message", "serialize", serialize_time, self.server_name)
+        
+        server_time = response.get("processing_time_ms")
+        if isinstance(server_time, (int, float)):
+            server_time = min(network_time, server_time / 1000)
+            profiler.record("send_message", "server", server_time, self.server_name)
+            network_time -= server_time
+        profiler.record("send_message", "network", network_time, self.server_name)
+        return response
+    
+    def _transmit(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Transmit a message over the connection and wait for the response.
+        
+        Args:
+            message: Message to send
+            
+        Returns:
+            Response from the server
+        """
         # Actual message sending would happen here
         
+        # The server expands compressed payloads with the negotiated codec
+        if message.get("type") == "compressed" and self.compressor is not None:
+            message = self.compressor.decode(message)
+        
+        if message.get("type") == "batch":
+            return {
+                "status": "delivered",
+                "server": self.server_name,
+                "timestamp": time.time(),
+                "responses": [
+                    {"status": "delivered", "server": self.server_name, "timestamp": time.time()}
+                    for _ in message["messages"]
+                ],
+            }
+        
         # Return response
         return {
             "status": "delivered",
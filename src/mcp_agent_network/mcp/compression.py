@@ -0,0 +1,248 @@
+"""Payload compression for large MCP messages."""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without zstandard
+    zstandard = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Codecs in order of preference
+CODECS = ("zstd", "zlib")
+
+# Messages smaller than this are sent uncompressed (bytes)
+DEFAULT_THRESHOLD = 1024
+
+
+def available_codecs() -> List[str]:
+    """Get the codecs usable in this process.
+
+    Returns:
+        Codec names in order of preference
+    """
+    return [codec for codec in CODECS if codec != "zstd" or zstandard is not None]
+
+
+def dictionary_id(dictionary: bytes) -> str:
+    """Get the identifier both ends use to refer to a shared dictionary."""
+    return hashlib.sha256(dictionary).hexdigest()[:16]
+
+
+def train_dictionary(samples: Iterable[Dict[str, Any]], size: int = 16384) -> bytes:
+    """Build a shared compression dictionary from typical messages.
+
+    Uses zstd dictionary training when available. Otherwise the most
+    frequent JSON fragments are concatenated, most common last, which is the
+    layout zlib preset dictionaries work best with.
+
+    Args:
+        samples: Representative messages
+        size: Maximum dictionary size in bytes
+
+    Returns:
+        Dictionary bytes
+    """
+    encoded = [_encode(sample) for sample in samples]
+    if zstandard is not None and len(encoded) >= 8:
+        try:
+            return zstandard.train_dictionary(size, encoded).as_bytes()
+        except zstandard.ZstdError as e:
+            logger.warning(f"zstd dictionary training failed, using fragments: {e}")
+
+    fragments: Counter = Counter()
+    for data in encoded:
+        fragments.update(part for part in data.split(b",") if len(part) > 3)
+    dictionary = b""
+    for fragment, _ in fragments.most_common():
+        if len(dictionary) + len(fragment) + 1 > size:
+            break
+        dictionary = fragment + b"," + dictionary
+    return dictionary
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    """Serialize a message for the wire."""
+    return json.dumps(message, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class Compressor:
+    """Compresses outgoing messages and decompresses compressed payloads.
+
+    Messages are serialized to JSON and, when at least ``threshold`` bytes
+    long, sent as a "compressed" envelope naming the codec and the shared
+    dictionary (if any). Compression ratio and CPU time are recorded.
+    """
+
+    def __init__(self, codec: str = "zlib", level: Optional[int] = None,
+                 threshold: int = DEFAULT_THRESHOLD, dictionary: Optional[bytes] = None):
+        """Initialize the compressor.
+
+        Args:
+            codec: "zstd" or "zlib"
+            level: Compression level, defaults to the codec's default
+            threshold: Minimum serialized size in bytes to compress
+            dictionary: Optional shared dictionary trained on typical payloads
+        """
+        if codec not in available_codecs():
+            raise ValueError(f"Compression codec not available: {codec}")
+        self.codec = codec
+        self.level = level
+        self.threshold = threshold
+        self.dictionary = dictionary
+        self.dictionary_id = dictionary_id(dictionary) if dictionary else None
+        self.compressed = 0
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_time = 0.0
+        self._lock = threading.Lock()
+        # zstd contexts are not thread-safe, so each thread gets its own
+        self._local = threading.local()
+
+    def _zstd(self) -> Any:
+        """Get this thread's zstd compressor and decompressor."""
+        contexts = getattr(self._local, "zstd", None)
+        if contexts is None:
+            zdict = zstandard.ZstdCompressionDict(self.dictionary) if self.dictionary else None
+            level = self.level if self.level is not None else 3
+            contexts = (
+                zstandard.ZstdCompressor(level=level, dict_data=zdict),
+                zstandard.ZstdDecompressor(dict_data=zdict),
+            )
+            self._local.zstd = contexts
+        return contexts
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress raw bytes with the configured codec."""
+        if self.codec == "zstd":
+            return self._zstd()[0].compress(data)
+        level = self.level if self.level is not None else 6
+        if self.dictionary:
+            compressor = zlib.compressobj(level, zdict=self.dictionary)
+        else:
+            compressor = zlib.compressobj(level)
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress raw bytes with the configured codec."""
+        if self.codec == "zstd":
+            return self._zstd()[1].decompress(data)
+        if self.dictionary:
+            decompressor = zlib.decompressobj(zdict=self.dictionary)
+        else:
+            decompressor = zlib.decompressobj()
+        return decompressor.decompress(data) + decompressor.flush()
+
+    def encode(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Compress a message if it is large enough.
+
+        Args:
+            message: Message to send
+
+        Returns:
+            The message itself, or a "compressed" envelope
+        """
+        start = time.thread_time()
+        data = _encode(message)
+        if len(data) < self.threshold:
+            with self._lock:
+                self.skipped += 1
+            return message
+
+        payload = self.compress(data)
+        elapsed = time.thread_time() - start
+        with self._lock:
+            self.compressed += 1
+            self.bytes_in += len(data)
+            self.bytes_out += len(payload)
+            self.cpu_time += elapsed
+        return {
+            "type": "compressed",
+            "encoding": self.codec,
+            "dictionary": self.dictionary_id,
+            "original_size": len(data),
+            "payload": payload,
+        }
+
+    def decode(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Expand a "compressed" envelope; other messages pass through.
+
+        Args:
+            message: Message or response, possibly compressed
+
+        Returns:
+            The decompressed message
+        """
+        if message.get("type") != "compressed":
+            return message
+        if message.get("encoding") != self.codec or message.get("dictionary") != self.dictionary_id:
+            raise ValueError(
+                f"Cannot decode {message.get('encoding')} payload "
+                f"with dictionary {message.get('dictionary')}"
+            )
+        start = time.thread_time()
+        decoded = json.loads(self.decompress(message["payload"]))
+        with self._lock:
+            self.cpu_time += time.thread_time() - start
+        return decoded
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get compression statistics.
+
+        Returns:
+            Dictionary with codec, counters, ratio and CPU time
+        """
+        with self._lock:
+            return {
+                "codec": self.codec,
+                "dictionary": self.dictionary_id,
+                "threshold": self.threshold,
+                "compressed": self.compressed,
+                "skipped": self.skipped,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "ratio": self.bytes_in / self.bytes_out if self.bytes_out else None,
+                "cpu_time_ms": round(self.cpu_time * 1000, 3),
+            }
+
+
+def negotiate(config: Optional[Dict[str, Any]],
+              server_codecs: Iterable[str]) -> Optional[Compressor]:
+    """Pick the codec to use with a server at connect time.
+
+    Args:
+        config: Client compression configuration with optional "codecs"
+            (preference order), "level", "threshold", "dictionary" (bytes)
+            and "dictionary_path" keys, or None to disable compression
+        server_codecs: Codecs advertised by the server
+
+    Returns:
+        Compressor for the first codec supported by both ends, or None
+    """
+    if config is None or not config.get("enabled", True):
+        return None
+    dictionary = config.get("dictionary")
+    if dictionary is None and config.get("dictionary_path"):
+        with open(config["dictionary_path"], "rb") as f:
+            dictionary = f.read()
+    server_codecs = set(server_codecs)
+    local_codecs = available_codecs()
+    for codec in config.get("codecs", CODECS):
+        if codec in server_codecs and codec in local_codecs:
+            return Compressor(
+                codec,
+                level=config.get("level"),
+                threshold=config.get("threshold", DEFAULT_THRESHOLD),
+                dictionary=dictionary,
+            )
+    return None
@@ -0,0 +1,264 @@
+"""Adaptive concurrency limits for MCP server requests."""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+ALGORITHMS = ("aimd", "gradient")
+
+# Dispatch lanes, highest priority first
+PRIORITIES = ("interactive", "normal", "bulk")
+
+# Latencies below this floor are treated as noise when comparing to the baseline
+MIN_LATENCY_FLOOR = 0.001
+# Number of samples after which the minimum latency baseline is re-measured
+BASELINE_WINDOW = 500
+
+
+class AdaptiveConcurrencyLimit:
+    """In-flight limit that adapts to a server's observed latency and errors.
+
+    Two algorithms are available:
+
+    - "aimd": additive increase (about +1 per limit's worth of successes),
+      multiplicative decrease on errors or when latency exceeds the baseline
+      by the tolerance factor.
+    - "gradient": the limit follows the ratio of the baseline (minimum)
+      latency to the smoothed latency, plus a sqrt(limit) queue allowance,
+      so it grows while latency stays flat and shrinks as queueing builds up.
+
+    The limit is kept as a float internally; the effective limit is its floor.
+
+    Waiters are served by lane (see PRIORITIES): a slot freed while
+    interactive requests are queued goes to them before normal or bulk
+    requests, and bulk requests leave ``interactive_reserve`` slots free so
+    interactive traffic does not queue behind a batch run.
+    """
+
+    def __init__(self, name: str, initial_limit: int = 4, min_limit: int = 1,
+                 max_limit: int = 64, algorithm: str = "aimd", backoff: float = 0.9,
+                 latency_tolerance: float = 2.0, smoothing: float = 0.2,
+                 max_wait: Optional[float] = 30.0, history_size: int = 50,
+                 interactive_reserve: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the limit.
+
+        Args:
+            name: Name of the limit (usually the server name)
+            initial_limit: Starting in-flight limit
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            algorithm: "aimd" or "gradient"
+            backoff: Multiplicative decrease factor applied on errors
+            latency_tolerance: Latency over baseline ratio treated as congestion
+            smoothing: Weight of new samples in latency and limit smoothing
+            max_wait: Maximum time to queue for a slot in seconds, or None
+                to wait forever
+            history_size: Number of limit changes to remember
+            interactive_reserve: Slots bulk requests leave free (bulk always
+                gets at least one slot)
+            clock: Monotonic clock returning seconds
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown concurrency algorithm: {algorithm}")
+        self.name = name
+        self.algorithm = algorithm
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.max_wait = max_wait
+        self.interactive_reserve = interactive_reserve
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self.successes = 0
+        self.errors = 0
+        self.rejected = 0
+        self.waiting = [0] * len(PRIORITIES)
+        self.min_latency: Optional[float] = None
+        self.smoothed_latency: Optional[float] = None
+        self.history: Deque[Tuple[float, int]] = deque(maxlen=history_size)
+        self._samples = 0
+        self._clock = clock
+        self._cond = threading.Condition()
+        self.history.append((clock(), int(self.limit)))
+
+    @classmethod
+    def from_config(cls, name: str, config: Dict[str, Any]) -> "AdaptiveConcurrencyLimit":
+        """Create a limit from a configuration dictionary.
+
+        Args:
+            name: Name of the limit
+            config: Dictionary with optional "initial_limit", "min_limit",
+                "max_limit", "algorithm", "backoff", "latency_tolerance",
+                "smoothing", "max_wait" and "interactive_reserve" keys
+
+        Returns:
+            Configured AdaptiveConcurrencyLimit instance
+        """
+        return cls(
+            name,
+            initial_limit=config.get("initial_limit", 4),
+            min_limit=config.get("min_limit", 1),
+            max_limit=config.get("max_limit", 64),
+            algorithm=config.get("algorithm", "aimd"),
+            backoff=config.get("backoff", 0.9),
+            latency_tolerance=config.get("latency_tolerance", 2.0),
+            smoothing=config.get("smoothing", 0.2),
+            max_wait=config.get("max_wait", 30.0),
+            interactive_reserve=config.get("interactive_reserve", 1),
+        )
+
+    @property
+    def current_limit(self) -> int:
+        """Effective in-flight limit."""
+        return int(self.limit)
+
+    def acquire(self, max_wait: Optional[float] = None, priority: str = "normal") -> bool:
+        """Wait for an in-flight slot.
+
+        Args:
+            max_wait: Override for the configured maximum wait in seconds
+            priority: Dispatch lane, one of PRIORITIES
+
+        Returns:
+            True if a slot was taken and must be released later
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        lane = PRIORITIES.index(priority)
+        timeout = self.max_wait if max_wait is None else max_wait
+        with self._cond:
+            self.waiting[lane] += 1
+            try:
+                admitted = self._cond.wait_for(lambda: self._can_admit(lane), timeout)
+            finally:
+                self.waiting[lane] -= 1
+                # Lower lanes may have been held back only by this waiter
+                self._cond.notify_all()
+            if not admitted:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def _can_admit(self, lane: int) -> bool:
+        """Check whether a waiter in a lane may take a slot (lock held)."""
+        if any(self.waiting[:lane]):
+            return False
+        slots = int(self.limit)
+        if PRIORITIES[lane] == "bulk":
+            slots = max(1, slots - self.interactive_reserve)
+        return self.in_flight < slots
+
+    def release(self, latency: Optional[float] = None, success: bool = True) -> None:
+        """Release a slot and adapt the limit to the outcome.
+
+        Args:
+            latency: Duration of the request in seconds, if it completed
+            success: Whether the request succeeded
+        """
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            previous = int(self.limit)
+            if success and latency is not None:
+                self.successes += 1
+                self._on_sample(latency)
+            elif not success:
+                self.errors += 1
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+            current = int(self.limit)
+            if current != previous:
+                self.history.append((self._clock(), current))
+                logger.debug(f"Concurrency limit for {self.name}: {previous} -> {current}")
+            self._cond.notify_all()
+
+    def _on_sample(self, latency: float) -> None:
+        """Update the latency statistics and the limit (lock held)."""
+        self._samples += 1
+        if self._samples % BASELINE_WINDOW == 0:
+            # Re-measure the baseline so a permanently slower server is not
+            # mistaken for a congested one forever
+            self.min_latency = None
+        if self.min_latency is None or latency < self.min_latency:
+            self.min_latency = latency
+        if self.smoothed_latency is None:
+            self.smoothed_latency = latency
+        else:
+            self.smoothed_latency += self.smoothing * (latency - self.smoothed_latency)
+
+        baseline = max(self.min_latency, MIN_LATENCY_FLOOR)
+        if self.algorithm == "aimd":
+            if latency > baseline * self.latency_tolerance:
+                self.limit *= self.backoff
+            elif self.in_flight + 1 >= int(self.limit):
+                # Only grow while the limit is actually being used
+                self.limit += 1.0 / self.limit
+        else:
+            sample = max(self.smoothed_latency, MIN_LATENCY_FLOOR)
+            gradient = max(0.5, min(1.0, self.latency_tolerance * baseline / sample))
+            target = self.limit * gradient + math.sqrt(self.limit)
+            self.limit += self.smoothing * (target - self.limit)
+        self.limit = min(float(self.max_limit), max(float(self.min_limit), self.limit))
+
+    def export_state(self) -> Dict[str, Any]:
+        """Get the learned limit and latency baseline for a snapshot.
+
+        Returns:
+            Dictionary accepted by restore_state()
+        """
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "min_latency": self.min_latency,
+                "smoothed_latency": self.smoothed_latency,
+            }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Resume from a limit and latency baseline learned earlier.
+
+        Args:
+            state: Dictionary from export_state()
+        """
+        with self._cond:
+            limit = state.get("limit", self.limit)
+            self.limit = min(float(self.max_limit), max(float(self.min_limit), float(limit)))
+            self.min_latency = state.get("min_latency")
+            self.smoothed_latency = state.get("smoothed_latency")
+            self.history.append((self._clock(), int(self.limit)))
+            self._cond.notify_all()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current limit and its recent history.
+
+        Returns:
+            Dictionary with limit, in-flight, latency and counter details
+        """
+        with self._cond:
+            return {
+                "algorithm": self.algorithm,
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "min_latency_ms": _ms(self.min_latency),
+                "smoothed_latency_ms": _ms(self.smoothed_latency),
+                "successes": self.successes,
+                "errors": self.errors,
+                "rejected": self.rejected,
+                "waiting": dict(zip(PRIORITIES, self.waiting)),
+                "history": [
+                    {"timestamp": timestamp, "limit": limit}
+                    for timestamp, limit in self.history
+                ],
+            }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    """Convert seconds to rounded milliseconds."""
+    return round(seconds * 1000, 3) if seconds is not None else None
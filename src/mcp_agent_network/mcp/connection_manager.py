@@ -1,48 +1,253 @@
 """MCP connection manager for handling multiple server connections."""
 
 import logging
+import math
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 
 from mcp_agent_network.mcp.client import MCPClient
+from mcp_agent_network.mcp.concurrency import AdaptiveConcurrencyLimit
+from mcp_agent_network.mcp.events import (
+    LATENCY_CHANGED,
+    PROGRESS,
+    SERVER_CONNECTED,
+    SERVER_DEGRADED,
+    SERVER_DISCONNECTED,
+    TOOLS_LIST_CHANGED,
+    EventBus,
+)
+from mcp_agent_network.mcp import fleet_metrics
+from mcp_agent_network.mcp.fleet_metrics import FleetMetrics
+from mcp_agent_network.mcp.profiling import Profiler
 from mcp_agent_network.mcp.progress import ProgressBar
+from mcp_agent_network.mcp.rate_limit import RateLimiter, parse_retry_after
+from mcp_agent_network.mcp.tool_catalog import ToolCatalog
+from mcp_agent_network.mcp.tool_index import ToolIndex
+from mcp_agent_network.mcp.traffic import TrafficRecorder
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# A latency EWMA must move by this fraction of the last published value,
+# and by at least LATENCY_CHANGE_MIN_NS, before LATENCY_CHANGED fires
+LATENCY_CHANGE_RATIO = 0.1
+LATENCY_CHANGE_MIN_NS = 50_000
+
+
+def _latency_moved(previous: Optional[float], latency_ns: float) -> bool:
+    """Check whether a latency EWMA moved enough to publish since the last value."""
+    if previous is None:
+        return True
+    threshold = max(LATENCY_CHANGE_MIN_NS, previous * LATENCY_CHANGE_RATIO)
+    return abs(latency_ns - previous) >= threshold
+
 
 class MCPConnectionManager:
     """Manages connections to multiple MCP servers.
     
     Provides a unified interface for connecting to and communicating with
     different MCP servers like glama and smithery.
+    
+    The client registry and status cache are copy-on-write: writers build a
+    new dictionary under the registry lock and swap it in, so readers on the
+    routing path can iterate over ``self.clients`` without locking.
     """
     
-    def __init__(self):
-        """Initialize the connection manager."""
+    def __init__(self, catalog: Optional[ToolCatalog] = None,
+                 tool_index: Optional[ToolIndex] = None,
+                 events: Optional[EventBus] = None):
+        """Initialize the connection manager.
+        
+        Args:
+            catalog: Optional capability catalog (defaults to an in-memory one)
+            tool_index: Optional tool search index (defaults to keyword search)
+            events: Optional event bus for status change notifications
+        """
+        self._registry_lock = threading.RLock()
+        # Connects in progress by server name, set when they finish
+        self._connecting: Dict[str, threading.Event] = {}
         self.clients: Dict[str, MCPClient] = {}
         self.connection_statuses: Dict[str, Dict[str, Any]] = {}
         self.default_servers = ["glama", "smithery"]
+        self.max_disconnect_workers = 32
+        self.max_connect_workers = 32
+        # Connection fan-out adapts to how quickly connects complete
+        self.connect_limit = AdaptiveConcurrencyLimit(
+            "connect", initial_limit=5, max_limit=self.max_connect_workers, max_wait=None
+        )
+        self.concurrency_config: Dict[str, Any] = {}
+        self.concurrency_configs: Dict[str, Dict[str, Any]] = {}
+        self.global_rate_limiter: Optional[RateLimiter] = None
+        self.global_rate_limit_config: Optional[Dict[str, Any]] = None
+        self.rate_limit_configs: Dict[str, Dict[str, Any]] = {}
+        self.catalog = catalog or ToolCatalog()
+        self.tool_index = tool_index or ToolIndex()
+        # Tool providers served in-process rather than by an MCP server
+        self.local_providers: List[str] = []
+        self.catalog.add_listener(self.tool_index.on_catalog_change)
+        self.events = events or EventBus()
+        # Latency EWMA (ns) last published in LATENCY_CHANGED per server and
+        # metric, and servers whose last message was a latency spike
+        self._published_latency: Dict[Tuple[str, str], float] = {}
+        self._message_spikes: Dict[str, bool] = {}
+        self._latency_lock = threading.Lock()
+        self.recorder: Optional[TrafficRecorder] = None
+        self.profiler: Optional[Profiler] = None
+        self.catalog.add_listener(self._on_catalog_change)
+        # Columnar per-server metrics for fleet-wide queries (requires numpy)
+        self.fleet_metrics: Optional[FleetMetrics] = (
+            FleetMetrics() if fleet_metrics.available() else None
+        )
         
-    def add_server(self, server_name: str, api_key: Optional[str] = None) -> bool:
+    def add_server(self, server_name: str, api_key: Optional[str] = None,
+                   rate_limit: Optional[Dict[str, Any]] = None, trusted: bool = False,
+                   concurrency: Optional[Dict[str, Any]] = None,
+                   batching: Optional[Dict[str, Any]] = None,
+                   compression: Optional[Dict[str, Any]] = None) -> bool:
         """Add a server to the manager.
         
         Args:
             server_name: Name of the server to add
             api_key: Optional API key for authentication
+            rate_limit: Optional per-server rate limit configuration
+                (see RateLimiter.from_config)
+            trusted: Whether to skip tool schema validation for this server
+            concurrency: Optional per-server adaptive concurrency configuration
+                (see AdaptiveConcurrencyLimit.from_config)
+            batching: Optional micro-batching configuration for small messages
+                (see MicroBatcher.from_config)
+            compression: Optional compression preferences negotiated at connect
+                time (see compression.negotiate)
             
         Returns:
             Success status
         """
-        if server_name in self.clients:
-            logger.warning(f"Server {server_name} already exists")
-            return False
-        
-        logger.info(f"Adding server: {server_name}")
-        self.clients[server_name] = MCPClient(server_name, api_key)
+        with self._registry_lock:
+            if server_name in self.clients:
+                logger.warning(f"Server {server_name} already exists")
+                return False
+            
+            logger.info(f"Adding server: {server_name}")
+            if rate_limit:
+                self.rate_limit_configs[server_name] = rate_limit
+            if concurrency:
+                self.concurrency_configs[server_name] = concurrency
+            client = MCPClient(
+                server_name, api_key, rate_limiter=self._build_rate_limiter(server_name),
+                validate_schemas=not trusted,
+                concurrency_limit=self._build_concurrency_limit(server_name),
+                batching=batching,
+                compression=compression,
+            )
+            client.add_notification_handler(self.catalog.handle_notification)
+            client.profiler = self.profiler
+            self.clients = {**self.clients, server_name: client}
+            if self.fleet_metrics is not None:
+                self.fleet_metrics.add(server_name)
         return True
     
+    def _add_configured_server(self, server_name: str, server_config: Dict[str, Any]) -> bool:
+        """Add a server from its configuration dictionary."""
+        return self.add_server(
+            server_name,
+            server_config.get("api_key"),
+            rate_limit=server_config.get("rate_limit"),
+            trusted=server_config.get("trusted", False),
+            concurrency=server_config.get("concurrency"),
+            batching=server_config.get("batching"),
+            compression=server_config.get("compression"),
+        )
+    
+    def set_global_rate_limit(self, rate_limit: Optional[Dict[str, Any]]) -> None:
+        """Configure the rate limit shared by all servers.
+        
+        An existing global limiter is updated in place, so requests already
+        in flight stay accounted for; per-server limiters are re-chained when
+        the global limiter is added or removed. Setting an unchanged
+        configuration is a no-op.
+        
+        Args:
+            rate_limit: Global rate limit configuration, or None to remove it
+        """
+        rate_limit = rate_limit or None
+        with self._registry_lock:
+            if rate_limit == self.global_rate_limit_config:
+                return
+            self.global_rate_limit_config = rate_limit
+            if rate_limit and self.global_rate_limiter is not None:
+                self.global_rate_limiter.update_config(rate_limit)
+                return
+            self.global_rate_limiter = (
+                RateLimiter.from_config("global", rate_limit) if rate_limit else None
+            )
+            for server_name, client in self.clients.items():
+                self._apply_rate_limit(server_name, client)
+    
+    def set_concurrency_config(self, concurrency: Optional[Dict[str, Any]]) -> None:
+        """Configure the adaptive concurrency defaults for all servers.
+        
+        Limits of servers without their own configuration are rebuilt, which
+        resets what they learned. Setting an unchanged configuration is a no-op.
+        
+        Args:
+            concurrency: Default concurrency configuration, or None for defaults
+        """
+        concurrency = concurrency or {}
+        with self._registry_lock:
+            if concurrency == self.concurrency_config:
+                return
+            self.concurrency_config = concurrency
+            for server_name, client in self.clients.items():
+                if server_name not in self.concurrency_configs:
+                    client.concurrency_limit = self._build_concurrency_limit(server_name)
+    
+    def _build_concurrency_limit(self, server_name: str) -> AdaptiveConcurrencyLimit:
+        """Build the adaptive concurrency limit for a server.
+        
+        Args:
+            server_name: Name of the server
+            
+        Returns:
+            AdaptiveConcurrencyLimit instance
+        """
+        config = {**self.concurrency_config, **self.concurrency_configs.get(server_name, {})}
+        return AdaptiveConcurrencyLimit.from_config(server_name, config)
+    
+    def _build_rate_limiter(self, server_name: str) -> Optional[RateLimiter]:
+        """Build the admission controller for a server.
+        
+        Args:
+            server_name: Name of the server
+            
+        Returns:
+            RateLimiter instance, or None if no limits apply to the server
+        """
+        config = self.rate_limit_configs.get(server_name)
+        if config is None and self.global_rate_limiter is None:
+            return None
+        return RateLimiter.from_config(server_name, config or {}, parent=self.global_rate_limiter)
+    
+    def _apply_rate_limit(self, server_name: str, client: MCPClient) -> None:
+        """Bring a server's admission controller in line with the configuration.
+        
+        An existing limiter is updated and re-chained in place, keeping its
+        in-flight accounting; one is only built or dropped when limits start
+        or stop applying to the server.
+        
+        Args:
+            server_name: Name of the server
+            client: Client of the server
+        """
+        config = self.rate_limit_configs.get(server_name)
+        limiter = client.rate_limiter
+        if limiter is None or (config is None and self.global_rate_limiter is None):
+            client.rate_limiter = self._build_rate_limiter(server_name)
+            return
+        limiter.update_config(config or {})
+        limiter.set_parent(self.global_rate_limiter)
+    
     def remove_server(self, server_name: str) -> bool:
         """Remove a server from the manager.
         
@@ -52,32 +257,62 @@ class MCPConnectionManager:
         Returns:
             Success status
         """
-        if server_name not in self.clients:
-            logger.warning(f"Server {server_name} not found")
-            return False
-        
-        # Disconnect first if connected
-        if self.clients[server_name].connected:
-            self.clients[server_name].disconnect()
+        with self._registry_lock:
+            clients = dict(self.clients)
+            client = clients.pop(server_name, None)
+            if client is None:
+                logger.warning(f"Server {server_name} not found")
+                return False
+            
+            # Unpublish first so no new messages are routed to the server
+            logger.info(f"Removing server: {server_name}")
+            self.clients = clients
+            self.rate_limit_configs.pop(server_name, None)
+            self.concurrency_configs.pop(server_name, None)
+            if self.fleet_metrics is not None:
+                self.fleet_metrics.remove(server_name)
+            with self._latency_lock:
+                self._published_latency.pop((server_name, "latency"), None)
+                self._published_latency.pop((server_name, "message_latency"), None)
+                self._message_spikes.pop(server_name, None)
+            if server_name in self.connection_statuses:
+                statuses = dict(self.connection_statuses)
+                del statuses[server_name]
+                self.connection_statuses = statuses
         
-        logger.info(f"Removing server: {server_name}")
-        del self.clients[server_name]
-        if server_name in self.connection_statuses:
-            del self.connection_statuses[server_name]
+        # Disconnect if connected
+        if client.connected:
+            client.disconnect()
+            self.events.publish(SERVER_DISCONNECTED, server_name, reason="removed")
+        if client.batcher is not None:
+            client.batcher.close()
+        self.catalog.remove(server_name)
         return True
     
+    def _on_catalog_change(self, server_name: str, kind: str,
+                           entries: Optional[List[Dict[str, Any]]]) -> None:
+        """Publish tool listing changes (catalog listener)."""
+        if kind != "tools" or not self.events.has_subscribers(TOOLS_LIST_CHANGED):
+            return
+        tools = [tool["name"] for tool in entries] if entries is not None else []
+        self.events.publish(TOOLS_LIST_CHANGED, server_name,
+                            tools=tools, removed=entries is None)
+    
     def connect_to_servers(self, server_names: Optional[List[str]] = None, 
-                           show_progress: bool = True) -> Dict[str, Dict[str, Any]]:
+                           show_progress: bool = True,
+                           cancel: Optional[threading.Event] = None) -> Dict[str, Dict[str, Any]]:
         """Connect to specified servers.
         
         Args:
             server_names: List of server names to connect to, or None for all
             show_progress: Whether to show a progress bar
+            cancel: Optional event; once set, handshakes that have not
+                started yet are skipped and reported as cancelled
             
         Returns:
             Dictionary of server names to connection results
         """
-        server_names = server_names or list(self.clients.keys())
+        server_names = server_names or list(self.clients)
         if not server_names:
             # Add default servers if none specified and none added
             for server in self.default_servers:
@@ -89,18 +324,74 @@ class MCPConnectionManager:
             if server not in self.clients:
                 self.add_server(server)
         
-        total_servers = len(server_names)
-        logger.info(f"Connecting to {total_servers} MCP servers: {', '.join(server_names)}")
-        
+        # Leave healthy connections untouched, and let connects already in
+        # progress in another thread finish instead of repeating them
         results = {}
+        pending = []
+        in_progress: Dict[str, threading.Event] = {}
+        with self._registry_lock:
+            clients = self.clients
+            for server in server_names:
+                client = clients.get(server)
+                if client is None:
+                    # Removed concurrently
+                    results[server] = {"success": False, "error": "Server removed"}
+                elif client.connected:
+                    results[server] = {
+                        "success": True,
+                        "info": client.connection_info,
+                        "already_connected": True,
+                    }
+                elif server in self._connecting:
+                    in_progress[server] = self._connecting[server]
+                elif server not in pending:
+                    pending.append(server)
+                    self._connecting[server] = threading.Event()
+        
+        try:
+            if pending:
+                self._connect_pending(clients, pending, show_progress, results, cancel)
+        finally:
+            with self._registry_lock:
+                for server in pending:
+                    self._connecting.pop(server).set()
+        
+        for server, done in in_progress.items():
+            done.wait()
+            client = clients[server]
+            results[server] = {
+                "success": client.connected,
+                "info": client.connection_info,
+                "already_connecting": True,
+            }
+        
+        if not pending and not in_progress:
+            logger.info("All requested MCP servers are already connected")
+        return results
+    
+    def _connect_pending(self, clients: Dict[str, MCPClient], pending: List[str],
+                         show_progress: bool, results: Dict[str, Dict[str, Any]],
+                         cancel: Optional[threading.Event] = None) -> None:
+        """Connect servers claimed by connect_to_servers in parallel.
+        
+        Args:
+            clients: Client registry the servers were claimed from
+            pending: Names of the servers to connect
+            show_progress: Whether to show a progress bar
+            results: Dictionary to store the connection results in
+            cancel: Optional event that skips handshakes not yet started
+        """
+        total_servers = len(pending)
+        logger.info(f"Connecting to {total_servers} MCP servers: {', '.join(pending)}")
+        
         progress = ProgressBar(total_servers, "Connecting to MCP servers") if show_progress else None
         
-        # Use ThreadPoolExecutor for parallel connections
-        with ThreadPoolExecutor(max_workers=min(total_servers, 5)) as executor:
+        # Connect in parallel; the adaptive connect limit gates the fan-out
+        with ThreadPoolExecutor(max_workers=min(total_servers, self.max_connect_workers)) as executor:
             # Submit connection tasks
             future_to_server = {
-                executor.submit(self.clients[server].connect): server
-                for server in server_names
+                executor.submit(self._connect_client, clients[server], cancel): server
+                for server in pending
             }
             
             # Process results as they complete
@@ -114,6 +405,8 @@ class MCPConnectionManager:
                     }
                     if progress:
                         progress.update(i + 1, f"Connected to {server}")
+                    self.events.publish(PROGRESS, "connect_to_servers", completed=i + 1,
+                                        total=total_servers, server=server, success=success)
                 except Exception as e:
                     logger.error(f"Error connecting to {server}: {e}")
                     results[server] = {
@@ -122,24 +415,205 @@ class MCPConnectionManager:
                     }
                     if progress:
                         progress.update(i + 1, f"Failed to connect to {server}")
+                    self.events.publish(PROGRESS, "connect_to_servers", completed=i + 1,
+                                        total=total_servers, server=server, success=False)
         
         if progress:
             progress.finish()
         
-        # Update status cache
-        self.update_all_statuses()
+        # Update status cache for the servers that changed
+        self.update_statuses(pending)
+    
+    def _connect_client(self, client: MCPClient,
+                        cancel: Optional[threading.Event] = None) -> Tuple[bool, Dict[str, Any]]:
+        """Connect a client and make sure its capabilities are cataloged.
         
-        return results
+        Args:
+            client: Client to connect
+            cancel: Optional event that skips the handshake once set
+            
+        Returns:
+            Tuple of (success, connection_info)
+        """
+        if cancel is not None and cancel.is_set():
+            return False, {"error": "Connect cancelled", "cancelled": True}
+        self.connect_limit.acquire()
+        if cancel is not None and cancel.is_set():
+            # Cancelled while waiting for a slot; says nothing about the server
+            self.connect_limit.release()
+            return False, {"error": "Connect cancelled", "cancelled": True}
+        start_time = time.perf_counter()
+        success = False
+        try:
+            success, info = client.connect()
+        finally:
+            duration = time.perf_counter() - start_time
+            self.connect_limit.release(duration, success)
+            recorder = self.recorder
+            if recorder is not None:
+                recorder.record("connect", client.server_name, start_time, duration,
+                                response={"success": success})
+        if success:
+            self.catalog.sync(client)
+            self.events.publish(SERVER_CONNECTED, client.server_name,
+                                latency_ms=client.connection_latency)
+        return success, info
     
-    def disconnect_from_all(self) -> Dict[str, bool]:
+    def reconcile(self, desired_servers: Dict[str, Dict[str, Any]],
+                  show_progress: bool = False) -> Dict[str, Any]:
+        """Bring the managed servers in line with a desired configuration.
+        
+        Servers missing from the desired set are disconnected and removed,
+        new servers are added, and only new or dead connections are
+        (re)established. Servers whose API key or compression preferences
+        changed are reconnected, while rate limit, concurrency and batching
+        changes are applied in place. Healthy servers with an unchanged
+        configuration are left untouched.
+        
+        Args:
+            desired_servers: Dictionary of server names to server configuration
+                (with optional "api_key", "rate_limit", "trusted",
+                "concurrency", "batching" and "compression" keys)
+            show_progress: Whether to show a progress bar
+            
+        Returns:
+            Dictionary with "added", "removed", "reconnected", "unchanged"
+            server lists and the connection "results"
+        """
+        # Plan under the registry lock, but remove and disconnect outside it:
+        # disconnecting waits on a round trip (e.g., flushing the batcher)
+        with self._registry_lock:
+            current = set(self.clients)
+            desired = set(desired_servers)
+            
+            removed = sorted(current - desired)
+            added = sorted(desired - current)
+            rekeyed = []
+            reconfigured = []
+            reconnected = []
+            unchanged = []
+            
+            for server_name in sorted(current & desired):
+                server_config = desired_servers[server_name] or {}
+                client = self.clients[server_name]
+                if server_config.get("api_key") != client.api_key:
+                    # Credentials changed; the existing session is no longer valid
+                    rekeyed.append(server_name)
+                    reconnected.append(server_name)
+                    continue
+                
+                client.validate_schemas = not server_config.get("trusted", False)
+                
+                rate_limit = server_config.get("rate_limit")
+                if rate_limit != self.rate_limit_configs.get(server_name):
+                    if rate_limit:
+                        self.rate_limit_configs[server_name] = rate_limit
+                    else:
+                        self.rate_limit_configs.pop(server_name, None)
+                    self._apply_rate_limit(server_name, client)
+                
+                concurrency = server_config.get("concurrency")
+                if concurrency != self.concurrency_configs.get(server_name):
+                    if concurrency:
+                        self.concurrency_configs[server_name] = concurrency
+                    else:
+                        self.concurrency_configs.pop(server_name, None)
+                    client.concurrency_limit = self._build_concurrency_limit(server_name)
+                
+                batching = server_config.get("batching")
+                if batching != client.batching_config:
+                    client.set_batching(batching)
+                
+                compression = server_config.get("compression")
+                if compression != client.compression_config:
+                    # Compression is negotiated at connect time
+                    client.compression_config = compression
+                    if client.connected:
+                        reconfigured.append(client)
+                        reconnected.append(server_name)
+                        continue
+                
+                if client.connected:
+                    unchanged.append(server_name)
+                else:
+                    reconnected.append(server_name)
+        
+        for server_name in removed + rekeyed:
+            self.remove_server(server_name)
+        
+        for client in reconfigured:
+            client.disconnect()
+            self.events.publish(SERVER_DISCONNECTED, client.server_name,
+                                reason="reconfigured")
+        
+        for server_name in rekeyed + added:
+            self._add_configured_server(server_name, desired_servers[server_name] or {})
+        
+        to_connect = added + reconnected
+        results = self.connect_to_servers(to_connect, show_progress) if to_connect else {}
+        
+        logger.info(
+            f"Reconciled MCP servers: {len(added)} added, {len(removed)} removed, "
+            f"{len(reconnected)} reconnected, {len(unchanged)} unchanged"
+        )
+        return {
+            "added": added,
+            "removed": removed,
+            "reconnected": reconnected,
+            "unchanged": unchanged,
+            "results": results,
+        }
+    
+    def disconnect_from_all(self, drain_timeout: Optional[float] = None) -> Dict[str, bool]:
         """Disconnect from all servers.
         
+        New messages are rejected immediately. When a drain timeout is given,
+        in-flight messages are allowed to complete until the deadline before
+        the sessions are closed. Sessions are closed in parallel.
+        
+        Args:
+            drain_timeout: Maximum time in seconds to wait for in-flight
+                messages across all servers, or None to close immediately
+            
         Returns:
             Dictionary of server names to disconnection results
         """
+        clients = dict(self.clients)
+        if not clients:
+            return {}
+        
+        # Stop admitting new requests everywhere before draining
+        for client in clients.values():
+            client.stop_accepting()
+        
+        if drain_timeout is not None:
+            deadline = time.monotonic() + drain_timeout
+            for server_name, client in clients.items():
+                remaining = max(0.0, deadline - time.monotonic())
+                if not client.drain(remaining):
+                    logger.warning(
+                        f"Drain deadline expired for {server_name} with "
+                        f"{client.in_flight} messages in flight"
+                    )
+        
         results = {}
-        for server_name, client in self.clients.items():
-            results[server_name] = client.disconnect()
+        with ThreadPoolExecutor(max_workers=min(len(clients), self.max_disconnect_workers)) as executor:
+            future_to_server = {
+                executor.submit(client.disconnect): server_name
+                for server_name, client in clients.items()
+            }
+            for future in as_completed(future_to_server):
+                server_name = future_to_server[future]
+                try:
+                    results[server_name] = future.result()
+                except Exception as e:
+                    logger.error(f"Error disconnecting from {server_name}: {e}")
+                    results[server_name] = False
+        
+        for server_name in clients:
+            self.tool_index.remove_server(server_name)
+            if results.get(server_name):
+                self.events.publish(SERVER_DISCONNECTED, server_name, reason="shutdown")
         
         # Update status cache
         self.update_all_statuses()
@@ -152,9 +626,281 @@ class MCPConnectionManager:
         Returns:
             Dictionary of server names to status information
         """
+        clients = self.clients
+        statuses = {
+            server_name: client.get_status()
+            for server_name, client in clients.items()
+        }
+        with self._registry_lock:
+            if self.clients is not clients:
+                # Registry changed while polling; drop servers removed meanwhile
+                statuses = {
+                    server_name: status for server_name, status in statuses.items()
+                    if server_name in self.clients
+                }
+            previous = self.connection_statuses
+            self.connection_statuses = statuses
+        self._update_fleet_metrics(clients, statuses)
+        self._publish_status_changes(previous, statuses)
+        return statuses
+    
+    def update_statuses(self, server_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Update status information for specific servers only.
+        
+        Args:
+            server_names: Names of the servers to refresh
+            
+        Returns:
+            Dictionary of server names to status information
+        """
+        clients = self.clients
+        updates = {
+            server_name: clients[server_name].get_status()
+            for server_name in server_names if server_name in clients
+        }
+        with self._registry_lock:
+            previous = self.connection_statuses
+            statuses = {
+                server_name: status
+                for server_name, status in {**previous, **updates}.items()
+                if server_name in self.clients
+            }
+            self.connection_statuses = statuses
+        self._update_fleet_metrics(clients, updates)
+        self._publish_status_changes(previous, updates)
+        return statuses
+    
+    def _publish_status_changes(self, previous: Dict[str, Dict[str, Any]],
+                                current: Dict[str, Dict[str, Any]]) -> None:
+        """Publish latency changes and spikes between two status snapshots."""
+        if not (self.events.has_subscribers(LATENCY_CHANGED)
+                or self.events.has_subscribers(SERVER_DEGRADED)):
+            return
+        for server_name, status in current.items():
+            old_status = previous.get(server_name, {})
+            latency_ns = (status.get("latency") or {}).get("ewma_ns")
+            self._publish_latency_change(server_name, "latency", latency_ns)
+            if status.get("latency_spike") and not old_status.get("latency_spike"):
+                self.events.publish(SERVER_DEGRADED, server_name, error="Latency spike",
+                                    retry_after=None, latency_ns=latency_ns)
+    
+    def _publish_latency_change(self, server_name: str, metric: str,
+                                latency_ns: Optional[float]) -> None:
+        """Publish LATENCY_CHANGED when a latency EWMA moved past the change threshold.
+        
+        The first measurement of a server only sets the baseline.
+        
+        Args:
+            server_name: Name of the server
+            metric: "latency" for pings or "message_latency" for messages
+            latency_ns: Current latency EWMA in nanoseconds, if measured
+        """
+        if latency_ns is None:
+            return
+        key = (server_name, metric)
+        # Unlocked check first; most samples do not cross the threshold
+        if not _latency_moved(self._published_latency.get(key), latency_ns):
+            return
+        with self._latency_lock:
+            previous = self._published_latency.get(key)
+            if not _latency_moved(previous, latency_ns):
+                return
+            self._published_latency[key] = latency_ns
+        if previous is not None:
+            self.events.publish(LATENCY_CHANGED, server_name, metric=metric,
+                                previous_ns=round(previous), latency_ns=round(latency_ns))
+    
+    def _publish_message_latency(self, server_name: str) -> None:
+        """Publish message latency changes and spikes after a response."""
+        client = self.clients.get(server_name)
+        if client is None:
+            return
+        latency_ns = client.message_latency.ewma_ns
+        self._publish_latency_change(server_name, "message_latency", latency_ns)
+        spike = client.message_spike
+        if spike == self._message_spikes.get(server_name, False):
+            return
+        with self._latency_lock:
+            if spike == self._message_spikes.get(server_name, False):
+                return
+            self._message_spikes[server_name] = spike
+        if spike:
+            self.events.publish(SERVER_DEGRADED, server_name, error="Latency spike",
+                                retry_after=None, latency_ns=round(latency_ns))
+    
+    def _update_fleet_metrics(self, clients: Dict[str, MCPClient],
+                              statuses: Dict[str, Dict[str, Any]]) -> None:
+        """Copy refreshed client state into the fleet metric columns."""
+        metrics = self.fleet_metrics
+        if metrics is None:
+            return
+        for server_name in statuses:
+            client = clients.get(server_name)
+            if client is None:
+                continue
+            metrics.update(server_name, client.connected, client.latency.ewma_ns,
+                           client.message_latency.ewma_ns, client.in_flight,
+                           client.last_ping_time)
+    
+    def _observe(self, server_name: str, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Count a response and publish degraded and latency events about it.
+        
+        Failed or throttled responses are reported as degradation; other
+        responses publish message latency changes and spikes as they happen
+        rather than on the next status poll.
+        """
+        retry_after = parse_retry_after(response)
+        # Arguments rejected locally say nothing about the server's health
+        rejected_locally = "validation_errors" in response and "response" not in response
+        failed = ((response.get("status") == "failed" and not rejected_locally)
+                  or retry_after is not None)
+        if failed:
+            self.events.publish(SERVER_DEGRADED, server_name,
+                                error=response.get("error"), retry_after=retry_after)
+        elif (self.events.has_subscribers(LATENCY_CHANGED)
+              or self.events.has_subscribers(SERVER_DEGRADED)):
+            self._publish_message_latency(server_name)
+        metrics = self.fleet_metrics
+        if metrics is not None and response.get("status") != "rejected" and not rejected_locally:
+            client = self.clients.get(server_name)
+            metrics.record(server_name, failed,
+                           client.message_latency.ewma_ns if client is not None else None)
+        return response
+    
+    def get_concurrency_status(self) -> Dict[str, Any]:
+        """Get the adaptive concurrency limits and their history.
+        
+        Returns:
+            Dictionary with the "connect" limit and per-server limits
+        """
+        return {
+            "connect": self.connect_limit.get_status(),
+            "servers": {
+                server_name: client.concurrency_limit.get_status()
+                for server_name, client in self.clients.items()
+                if client.concurrency_limit is not None
+            },
+        }
+    
+    def export_state(self) -> Dict[str, Any]:
+        """Get the learned state of all servers for a snapshot.
+        
+        API keys are not included; they come from the configuration.
+        
+        Returns:
+            Dictionary with per-server settings, latency statistics and
+            concurrency limits, plus the capability catalog
+        """
+        servers = {}
         for server_name, client in self.clients.items():
-            self.connection_statuses[server_name] = client.get_status()
-        return self.connection_statuses
+            server_state = {
+                "trusted": not client.validate_schemas,
+                "latency": client.latency.export_state(),
+                "message_latency": client.message_latency.export_state(),
+            }
+            if client.concurrency_limit is not None:
+                server_state["concurrency"] = client.concurrency_limit.export_state()
+            servers[server_name] = server_state
+        return {
+            "servers": servers,
+            "connect_limit": self.connect_limit.export_state(),
+            "catalog": self.catalog.export_entries(),
+        }
+    
+    def restore_state(self, state: Dict[str, Any],
+                      servers: Optional[Iterable[str]] = None) -> List[str]:
+        """Resume from a snapshot taken by export_state().
+        
+        Servers missing from the registry are added. Connections are not
+        opened, but cataloged capabilities let connects skip discovery and
+        latency statistics drive routing from the first request.
+        
+        Args:
+            state: Dictionary from export_state()
+            servers: Optional names of the configured servers; snapshot
+                state of any other server is ignored, so servers removed
+                from the configuration are not brought back
+            
+        Returns:
+            Names of the servers whose state was restored
+        """
+        catalog = state.get("catalog", {})
+        server_states = state.get("servers", {})
+        if servers is not None:
+            servers = set(servers)
+            catalog = {name: entry for name, entry in catalog.items() if name in servers}
+            server_states = {name: server_state for name, server_state in server_states.items()
+                             if name in servers}
+        self.catalog.restore_entries(catalog)
+        if "connect_limit" in state:
+            self.connect_limit.restore_state(state["connect_limit"])
+        restored = []
+        for server_name, server_state in server_states.items():
+            if server_name not in self.clients:
+                self.add_server(server_name, trusted=server_state.get("trusted", False))
+            client = self.clients.get(server_name)
+            if client is None:
+                continue
+            client.latency.restore_state(server_state.get("latency", {}))
+            client.message_latency.restore_state(server_state.get("message_latency", {}))
+            if client.concurrency_limit is not None and "concurrency" in server_state:
+                client.concurrency_limit.restore_state(server_state["concurrency"])
+            restored.append(server_name)
+        logger.info(f"Restored state of {len(restored)} MCP servers")
+        return restored
+    
+    def _require_fleet_metrics(self) -> FleetMetrics:
+        """Get the fleet metrics, which need numpy."""
+        if self.fleet_metrics is None:
+            raise ImportError("numpy is required for fleet metrics: pip install numpy")
+        return self.fleet_metrics
+    
+    def get_slowest_servers(self, k: int = 10,
+                            metric: str = "latency_ns") -> List[Tuple[str, float]]:
+        """Get the connected servers with the highest latency.
+        
+        Args:
+            k: Number of servers
+            metric: "latency_ns" (ping) or "message_latency_ns" (messages)
+            
+        Returns:
+            List of (server name, latency EWMA in nanoseconds), slowest first
+        """
+        return self._require_fleet_metrics().top_k(k, metric)
+    
+    def get_servers_above_error_rate(self, threshold: float,
+                                     min_requests: int = 1) -> List[str]:
+        """Get the servers whose error rate exceeds a threshold.
+        
+        Args:
+            threshold: Error rate (0-1) that must be exceeded
+            min_requests: Minimum number of requests for a rate to count
+            
+        Returns:
+            Server names, highest error rate first
+        """
+        return self._require_fleet_metrics().above_error_rate(threshold, min_requests)
+    
+    def get_fleet_latency_percentile(self, q: Any, metric: str = "latency_ns") -> Any:
+        """Get latency percentiles across connected servers.
+        
+        Args:
+            q: Percentile or sequence of percentiles (0-100)
+            metric: "latency_ns" (ping) or "message_latency_ns" (messages)
+            
+        Returns:
+            Latency in nanoseconds, or a list for a sequence of percentiles
+        """
+        return self._require_fleet_metrics().percentile(q, metric)
+    
+    def get_fleet_summary(self) -> Dict[str, Any]:
+        """Get fleet-wide aggregates.
+        
+        Returns:
+            Dictionary with server, request, error and in-flight totals and
+            latency percentiles (see FleetMetrics.summary)
+        """
+        return self._require_fleet_metrics().summary()
     
     def get_connected_servers(self) -> List[str]:
         """Get a list of connected server names.
@@ -178,17 +924,166 @@ class MCPConnectionManager:
         """
         return self.clients.get(server_name)
     
-    def broadcast_message(self, message: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    def register_local_tools(self, provider: str, tools: List[Dict[str, Any]]) -> None:
+        """Catalog and index tools served in-process (e.g., browser tools).
+        
+        Args:
+            provider: Name the tools are listed under
+            tools: MCP tool descriptors
+        """
+        with self._registry_lock:
+            if provider not in self.local_providers:
+                self.local_providers = self.local_providers + [provider]
+        self.catalog.register(provider, {"tools": tools})
+    
+    def find_tools(self, query: str, limit: int = 5,
+                   include_local: bool = False) -> List[Dict[str, Any]]:
+        """Find the tools of connected servers most relevant to a query.
+        
+        Args:
+            query: Free-text query (e.g., a task description)
+            limit: Maximum number of results
+            include_local: Whether to also search tools registered with
+                register_local_tools()
+            
+        Returns:
+            List of matches with "server", "tool", "score" and "descriptor";
+            equally relevant tools are ordered by server latency
+        """
+        servers = set(self.get_connected_servers())
+        if include_local:
+            servers.update(self.local_providers)
+        # Over-fetch so ties cut off at the limit can still be reordered
+        matches = self.tool_index.search(query, limit * 2, servers=servers)
+        clients = self.clients
+        scores = {
+            server_name: client.latency.score()
+            for server_name, client in clients.items()
+        }
+        matches.sort(key=lambda match: (-match["score"], scores.get(match["server"], math.inf)))
+        return matches[:limit]
+    
+    @staticmethod
+    def _stamp(message: Dict[str, Any], priority: Optional[str],
+               timeout: Optional[float]) -> Dict[str, Any]:
+        """Attach a priority and an absolute deadline to a message."""
+        if priority is None and timeout is None:
+            return message
+        message = dict(message)
+        if priority is not None:
+            message["priority"] = priority
+        if timeout is not None:
+            message["deadline"] = time.time() + timeout
+        return message
+    
+    def send_message(self, server_name: str, message: Dict[str, Any],
+                     priority: Optional[str] = None,
+                     timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a message to a single server.
+        
+        Args:
+            server_name: Name of the server
+            message: Message to send
+            priority: Optional dispatch lane ("interactive", "normal" or "bulk")
+            timeout: Optional time in seconds after which the message is
+                dropped instead of sent
+            
+        Returns:
+            Response from the server
+        """
+        client = self.clients.get(server_name)
+        if client is None:
+            logger.error(f"Cannot send message: server {server_name} not found")
+            return {"error": f"Unknown server: {server_name}", "status": "failed"}
+        message = self._stamp(message, priority, timeout)
+        start_time = time.perf_counter()
+        response = self._observe(server_name, client.send_message(message))
+        recorder = self.recorder
+        if recorder is not None:
+            # Only wire time: replays queue again on their own
+            recorder.record("send_message", server_name, start_time,
+                            client.last_transmit_time(), message, response)
+        return response
+    
+    def call_tool(self, server_name: str, tool_name: str,
+                  arguments: Dict[str, Any], priority: Optional[str] = None,
+                  timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Call a tool on a single server with schema validation.
+        
+        Args:
+            server_name: Name of the server
+            tool_name: Name of the tool
+            arguments: Tool arguments
+            priority: Optional dispatch lane ("interactive", "normal" or "bulk")
+            timeout: Optional time in seconds after which the call is
+                dropped instead of sent
+            
+        Returns:
+            Response from the server
+        """
+        client = self.clients.get(server_name)
+        if client is None:
+            logger.error(f"Cannot call tool: server {server_name} not found")
+            return {"error": f"Unknown server: {server_name}", "status": "failed"}
+        deadline = time.time() + timeout if timeout is not None else None
+        return self._observe(server_name, client.call_tool(tool_name, arguments,
+                                                           priority=priority, deadline=deadline))
+    
+    def broadcast_message(self, message: Dict[str, Any], priority: Optional[str] = None,
+                          timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
         """Broadcast a message to all connected servers.
         
         Args:
             message: Message to broadcast
+            priority: Optional dispatch lane ("interactive", "normal" or "bulk")
+            timeout: Optional time in seconds after which the message is
+                dropped instead of sent
             
         Returns:
             Dictionary of server names to response information
         """
+        message = self._stamp(message, priority, timeout)
+        start_time = time.perf_counter()
         responses = {}
+        durations = {}
         for server_name, client in self.clients.items():
             if client.connected:
-                responses[server_name] = client.send_message(message)
-        return responses 
\ No newline at end of file
+                responses[server_name] = self._observe(server_name, client.send_message(message))
+                durations[server_name] = client.last_transmit_time()
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record("broadcast_message", None, start_time, sum(durations.values()),
+                            message, responses, durations)
+        return responses
+    
+    def set_profiler(self, profiler: Optional[Profiler]) -> None:
+        """Attach a profiler to all current and future clients.
+        
+        Args:
+            profiler: Profiler recording phase timings, or None to stop profiling
+        """
+        with self._registry_lock:
+            self.profiler = profiler
+            for client in self.clients.values():
+                client.profiler = profiler
+    
+    def start_recording(self, path: str, include_payloads: bool = True) -> TrafficRecorder:
+        """Record connects and messages to a trace for later replay.
+        
+        Args:
+            path: Trace file to write (gzip-compressed if it ends in .gz)
+            include_payloads: Whether to record message and response bodies
+            
+        Returns:
+            The active TrafficRecorder
+        """
+        self.stop_recording()
+        self.recorder = TrafficRecorder(path, include_payloads)
+        logger.info(f"Recording MCP traffic to {path}")
+        return self.recorder
+    
+    def stop_recording(self) -> None:
+        """Stop recording and close the trace file."""
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close() 
\ No newline at end of file
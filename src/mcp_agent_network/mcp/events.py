@@ -0,0 +1,321 @@
+"""In-process event bus for server notifications and status changes."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Event types emitted by the agent network
+SERVER_CONNECTED = "server.connected"
+SERVER_DISCONNECTED = "server.disconnected"
+SERVER_DEGRADED = "server.degraded"
+LATENCY_CHANGED = "server.latency_changed"
+PROGRESS = "progress"
+TOOLS_LIST_CHANGED = "tools.list_changed"
+TASK_COMPLETED = "task.completed"
+
+EVENT_TYPES = (
+    SERVER_CONNECTED,
+    SERVER_DISCONNECTED,
+    SERVER_DEGRADED,
+    LATENCY_CHANGED,
+    PROGRESS,
+    TOOLS_LIST_CHANGED,
+    TASK_COMPLETED,
+)
+
+# What a full subscriber queue does with new events
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "coalesce")
+
+
+class Event:
+    """Event published on the bus."""
+
+    __slots__ = ("type", "source", "data", "timestamp")
+
+    def __init__(self, type: str, source: Optional[str] = None,
+                 data: Optional[Dict[str, Any]] = None):
+        """Initialize the event.
+
+        Args:
+            type: Event type (e.g., "server.connected")
+            source: Name of the server or component the event is about
+            data: Event payload
+        """
+        self.type = type
+        self.source = source
+        self.data = data or {}
+        self.timestamp = time.time()
+
+    def __repr__(self) -> str:
+        return f"Event({self.type!r}, source={self.source!r}, data={self.data!r})"
+
+
+class Subscription:
+    """Filtered, bounded queue of events for one subscriber.
+
+    Subscriptions without a callback are polled with get() or drain().
+    Subscriptions with a callback are served by a dedicated delivery thread,
+    so a slow callback only backs up its own queue, never the publisher.
+    When the queue is full the overflow policy applies: "drop_oldest" and
+    "drop_newest" discard events, while "coalesce" keeps only the newest
+    event per (type, source) so consumers always see the latest state.
+    """
+
+    def __init__(self, bus: "EventBus", event_types: Optional[Iterable[str]] = None,
+                 sources: Optional[Iterable[str]] = None,
+                 predicate: Optional[Callable[[Event], bool]] = None,
+                 callback: Optional[Callable[[Event], None]] = None,
+                 max_queue: int = 1000, overflow: str = "drop_oldest"):
+        """Initialize the subscription.
+
+        Args:
+            bus: Event bus the subscription belongs to
+            event_types: Event types to receive, or None for all
+            sources: Event sources to receive, or None for all
+            predicate: Optional additional filter
+            callback: Optional function called for every event
+            max_queue: Maximum number of queued events
+            overflow: One of "drop_oldest", "drop_newest" or "coalesce"
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        self.bus = bus
+        self.event_types = frozenset(event_types) if event_types is not None else None
+        self.sources = frozenset(sources) if sources is not None else None
+        self.predicate = predicate
+        self.callback = callback
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+        if overflow == "coalesce":
+            self._queue: Any = OrderedDict()
+        else:
+            self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        if callback is not None:
+            self._thread = threading.Thread(
+                target=self._deliver, name="event-subscriber", daemon=True
+            )
+            self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def matches(self, event: Event) -> bool:
+        """Check whether an event passes the subscription filters."""
+        if self.sources is not None and event.source not in self.sources:
+            return False
+        return self.predicate is None or self.predicate(event)
+
+    def _offer(self, event: Event) -> None:
+        """Queue an event according to the overflow policy."""
+        with self._cond:
+            if self.closed:
+                return
+            if self.overflow == "coalesce":
+                key: Tuple[str, Optional[str]] = (event.type, event.source)
+                if key in self._queue:
+                    del self._queue[key]
+                    self.coalesced += 1
+                elif len(self._queue) >= self.max_queue:
+                    self._queue.popitem(last=False)
+                    self.dropped += 1
+                self._queue[key] = event
+            elif len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                if self.overflow == "drop_newest":
+                    return
+                self._queue.popleft()
+                self._queue.append(event)
+            else:
+                self._queue.append(event)
+            self._cond.notify()
+
+    def _pop(self) -> Event:
+        """Take the oldest queued event (lock held, queue not empty)."""
+        self.delivered += 1
+        if self.overflow == "coalesce":
+            return self._queue.popitem(last=False)[1]
+        return self._queue.popleft()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Wait for the next event.
+
+        Args:
+            timeout: Maximum time to wait in seconds, or None to wait forever
+
+        Returns:
+            The next event, or None on timeout or after close()
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._queue or self.closed, timeout):
+                return None
+            if not self._queue:
+                return None
+            return self._pop()
+
+    def drain(self) -> List[Event]:
+        """Take all queued events without waiting.
+
+        Returns:
+            List of queued events, oldest first
+        """
+        with self._cond:
+            events = []
+            while self._queue:
+                events.append(self._pop())
+            return events
+
+    def _deliver(self) -> None:
+        """Call the callback for queued events until closed."""
+        while True:
+            event = self.get()
+            if event is None:
+                return
+            try:
+                self.callback(event)
+            except Exception as e:
+                logger.error(f"Error in event subscriber for {event.type}: {e}")
+
+    def close(self) -> None:
+        """Stop receiving events and release a waiting consumer."""
+        self.bus.unsubscribe(self)
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get subscription statistics.
+
+        Returns:
+            Dictionary with queue length and delivered/dropped/coalesced counters
+        """
+        with self._cond:
+            return {
+                "queued": len(self._queue),
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+                "coalesced": self.coalesced,
+                "overflow": self.overflow,
+            }
+
+
+class EventBus:
+    """Publish/subscribe hub for agent network events.
+
+    Subscribers are indexed by event type, so publishing only touches the
+    subscribers interested in that type. The index is copy-on-write and
+    publishing does not take the bus lock.
+    """
+
+    def __init__(self):
+        """Initialize an event bus without subscribers."""
+        self._lock = threading.Lock()
+        # Event type (None for wildcard subscriptions) to subscriptions
+        self._subscribers: Dict[Optional[str], Tuple[Subscription, ...]] = {}
+        self.published = 0
+
+    def subscribe(self, event_types: Optional[Iterable[str]] = None,
+                  callback: Optional[Callable[[Event], None]] = None,
+                  sources: Optional[Iterable[str]] = None,
+                  predicate: Optional[Callable[[Event], bool]] = None,
+                  max_queue: int = 1000, overflow: str = "drop_oldest") -> Subscription:
+        """Subscribe to events.
+
+        Args:
+            event_types: Event types to receive, or None for all
+            callback: Optional function called for every event; without one,
+                poll the returned subscription with get() or drain()
+            sources: Event sources (e.g., server names) to receive, or None for all
+            predicate: Optional additional filter
+            max_queue: Maximum number of queued events
+            overflow: One of "drop_oldest", "drop_newest" or "coalesce"
+
+        Returns:
+            Subscription instance
+        """
+        if isinstance(event_types, str):
+            event_types = [event_types]
+        subscription = Subscription(self, event_types, sources, predicate, callback,
+                                    max_queue, overflow)
+        keys = list(subscription.event_types) if subscription.event_types is not None else [None]
+        with self._lock:
+            subscribers = dict(self._subscribers)
+            for key in keys:
+                subscribers[key] = subscribers.get(key, ()) + (subscription,)
+            self._subscribers = subscribers
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription.
+
+        Args:
+            subscription: Subscription returned by subscribe()
+        """
+        with self._lock:
+            subscribers = {}
+            for key, subscriptions in self._subscribers.items():
+                remaining = tuple(s for s in subscriptions if s is not subscription)
+                if remaining:
+                    subscribers[key] = remaining
+            self._subscribers = subscribers
+
+    def has_subscribers(self, event_type: str) -> bool:
+        """Check whether anyone listens for an event type.
+
+        Publishers can use this to skip building expensive payloads.
+        """
+        subscribers = self._subscribers
+        return event_type in subscribers or None in subscribers
+
+    def publish(self, event_type: str, source: Optional[str] = None,
+                **data: Any) -> Optional[Event]:
+        """Publish an event to matching subscribers.
+
+        Args:
+            event_type: Event type
+            source: Name of the server or component the event is about
+            **data: Event payload
+
+        Returns:
+            The published event, or None if nobody subscribed to its type
+        """
+        subscribers = self._subscribers
+        targets = subscribers.get(event_type, ()) + subscribers.get(None, ())
+        if not targets:
+            return None
+        event = Event(event_type, source, data)
+        with self._lock:
+            self.published += 1
+        for subscription in targets:
+            try:
+                if subscription.matches(event):
+                    subscription._offer(event)
+            except Exception as e:
+                logger.error(f"Error filtering {event_type} event: {e}")
+        return event
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get event bus statistics.
+
+        Returns:
+            Dictionary with the published count and per-type subscriber counts
+        """
+        return {
+            "published": self.published,
+            "subscribers": {
+                key or "*": len(subscriptions)
+                for key, subscriptions in self._subscribers.items()
+            },
+        }
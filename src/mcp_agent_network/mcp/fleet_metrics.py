@@ -0,0 +1,296 @@
+"""Columnar fleet-wide server metrics with vectorized queries."""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+# Float columns; latencies are EWMAs in nanoseconds, NaN until measured
+FLOAT_COLUMNS = ("latency_ns", "message_latency_ns", "last_seen")
+# Integer columns
+INT_COLUMNS = ("requests", "errors", "in_flight")
+# Responses a thread buffers before folding them into the columns itself
+MAX_BUFFERED = 1024
+
+# Buffered response: (server name, error, message latency EWMA, epoch time)
+_Record = Tuple[str, bool, Optional[float], float]
+
+
+def available() -> bool:
+    """Check whether fleet metrics can be used (numpy is installed)."""
+    return np is not None
+
+
+class FleetMetrics:
+    """Per-server metrics kept in NumPy columns indexed by server row.
+
+    Each server gets a row when it is added; rows of removed servers are
+    reused. Queries run over whole columns, so fleet aggregates stay cheap
+    with tens of thousands of servers. Responses are counted without taking
+    the lock: each thread appends them to its own buffer, and the buffers
+    are folded into the columns by the next query (or by the thread once
+    its buffer fills up).
+    """
+
+    def __init__(self, capacity: int = 256):
+        """Initialize empty columns.
+
+        Args:
+            capacity: Initial number of rows (grows by doubling)
+        """
+        if np is None:
+            raise ImportError("numpy is required for fleet metrics: pip install numpy")
+        self.rows: Dict[str, int] = {}
+        self.names: List[Optional[str]] = [None] * capacity
+        self._free: List[int] = []
+        self._size = 0
+        self.columns: Dict[str, Any] = {}
+        for column in FLOAT_COLUMNS:
+            self.columns[column] = np.full(capacity, np.nan)
+        for column in INT_COLUMNS:
+            self.columns[column] = np.zeros(capacity, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.connected = np.zeros(capacity, dtype=bool)
+        self._lock = threading.Lock()
+        # Per-thread response buffers, with the threads that own them
+        self._local = threading.local()
+        self._buffers: List[Tuple[threading.Thread, List[_Record]]] = []
+
+    def _grow(self) -> None:
+        """Double the capacity of all columns (lock held)."""
+        capacity = len(self.names)
+        for column, values in self.columns.items():
+            fill = np.nan if column in FLOAT_COLUMNS else 0
+            self.columns[column] = np.concatenate([values, np.full(capacity, fill, values.dtype)])
+        self.active = np.concatenate([self.active, np.zeros(capacity, dtype=bool)])
+        self.connected = np.concatenate([self.connected, np.zeros(capacity, dtype=bool)])
+        self.names.extend([None] * capacity)
+
+    def add(self, server_name: str) -> int:
+        """Allocate a row for a server.
+
+        Args:
+            server_name: Name of the server
+
+        Returns:
+            Row index of the server
+        """
+        with self._lock:
+            row = self.rows.get(server_name)
+            if row is not None:
+                return row
+            if self._free:
+                row = self._free.pop()
+            else:
+                if self._size == len(self.names):
+                    self._grow()
+                row = self._size
+                self._size += 1
+            for column, values in self.columns.items():
+                values[row] = np.nan if column in FLOAT_COLUMNS else 0
+            self.active[row] = True
+            self.connected[row] = False
+            self.names[row] = server_name
+            self.rows[server_name] = row
+            return row
+
+    def remove(self, server_name: str) -> None:
+        """Release a server's row.
+
+        Args:
+            server_name: Name of the server
+        """
+        with self._lock:
+            row = self.rows.pop(server_name, None)
+            if row is None:
+                return
+            self.active[row] = False
+            self.connected[row] = False
+            self.names[row] = None
+            self._free.append(row)
+
+    def update(self, server_name: str, connected: bool, latency_ns: Optional[float],
+               message_latency_ns: Optional[float], in_flight: int,
+               last_seen: Optional[float]) -> None:
+        """Store a server's current status.
+
+        Args:
+            server_name: Name of the server
+            connected: Whether the server is connected
+            latency_ns: Ping latency EWMA in nanoseconds, if measured
+            message_latency_ns: Message latency EWMA in nanoseconds, if measured
+            in_flight: Messages currently in flight
+            last_seen: Epoch time the server last answered a ping, if ever
+        """
+        with self._lock:
+            row = self.rows.get(server_name)
+            if row is None:
+                return
+            columns = self.columns
+            self.connected[row] = connected
+            columns["latency_ns"][row] = np.nan if latency_ns is None else latency_ns
+            columns["message_latency_ns"][row] = (
+                np.nan if message_latency_ns is None else message_latency_ns
+            )
+            columns["in_flight"][row] = in_flight
+            columns["last_seen"][row] = np.nan if not last_seen else last_seen
+
+    def record(self, server_name: str, error: bool,
+               message_latency_ns: Optional[float] = None) -> None:
+        """Count a response.
+
+        Args:
+            server_name: Name of the server
+            error: Whether the response was a failure or throttling signal
+            message_latency_ns: Current message latency EWMA, if measured
+        """
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = []
+            with self._lock:
+                self._buffers.append((threading.current_thread(), buffer))
+        buffer.append((server_name, error, message_latency_ns, time.time()))
+        if len(buffer) >= MAX_BUFFERED:
+            with self._lock:
+                self._drain()
+
+    def _drain(self) -> None:
+        """Fold buffered responses into the columns (lock held)."""
+        columns = self.columns
+        live = []
+        for thread, buffer in self._buffers:
+            # Owners only append, so the first n records can be taken safely
+            count = len(buffer)
+            records = buffer[:count]
+            del buffer[:count]
+            for server_name, error, message_latency_ns, seen in records:
+                row = self.rows.get(server_name)
+                if row is None:
+                    continue
+                columns["requests"][row] += 1
+                if error:
+                    columns["errors"][row] += 1
+                if message_latency_ns is not None:
+                    columns["message_latency_ns"][row] = message_latency_ns
+                columns["last_seen"][row] = np.fmax(columns["last_seen"][row], seen)
+            if buffer or thread.is_alive():
+                live.append((thread, buffer))
+        self._buffers = live
+
+    def _view(self, column: str, connected_only: bool) -> Tuple[Any, Any]:
+        """Get the rows in use and a copy of a column over them (lock held)."""
+        if column not in self.columns:
+            raise ValueError(f"Unknown metric column: {column}")
+        self._drain()
+        mask = self.active[:self._size]
+        if connected_only:
+            mask = mask & self.connected[:self._size]
+        rows = np.flatnonzero(mask)
+        return rows, self.columns[column][rows]
+
+    def top_k(self, k: int, column: str = "latency_ns",
+              connected_only: bool = True) -> List[Tuple[str, float]]:
+        """Get the servers with the highest values of a metric.
+
+        Args:
+            k: Number of servers
+            column: Metric column (e.g., "latency_ns", "errors")
+            connected_only: Only consider connected servers
+
+        Returns:
+            List of (server name, value) pairs, highest first; servers
+            without a measurement are skipped
+        """
+        with self._lock:
+            rows, values = self._view(column, connected_only)
+            values = values.astype(np.float64)
+            measured = ~np.isnan(values)
+            rows, values = rows[measured], values[measured]
+            k = min(k, len(values))
+            if k <= 0:
+                return []
+            top = np.argpartition(-values, k - 1)[:k]
+            top = top[np.argsort(-values[top], kind="stable")]
+            return [(self.names[rows[i]], float(values[i])) for i in top]
+
+    def error_rates(self, connected_only: bool = False) -> Dict[str, float]:
+        """Get the error rate of every server with at least one request.
+
+        Args:
+            connected_only: Only consider connected servers
+
+        Returns:
+            Dictionary of server names to errors / requests
+        """
+        with self._lock:
+            rows, requests = self._view("requests", connected_only)
+            errors = self.columns["errors"][rows]
+            seen = requests > 0
+            rates = errors[seen] / requests[seen]
+            return {self.names[row]: float(rate) for row, rate in zip(rows[seen], rates)}
+
+    def above_error_rate(self, threshold: float, min_requests: int = 1,
+                         connected_only: bool = False) -> List[str]:
+        """Get the servers whose error rate exceeds a threshold.
+
+        Args:
+            threshold: Error rate (0-1) that must be exceeded
+            min_requests: Minimum requests for a rate to count
+            connected_only: Only consider connected servers
+
+        Returns:
+            Server names, highest error rate first
+        """
+        with self._lock:
+            rows, requests = self._view("requests", connected_only)
+            errors = self.columns["errors"][rows]
+            rates = np.divide(errors, requests, out=np.zeros(len(rows)), where=requests > 0)
+            hits = np.flatnonzero((rates > threshold) & (requests >= max(1, min_requests)))
+            hits = hits[np.argsort(-rates[hits], kind="stable")]
+            return [self.names[rows[i]] for i in hits]
+
+    def percentile(self, q: Any, column: str = "latency_ns",
+                   connected_only: bool = True) -> Any:
+        """Get percentiles of a metric across the fleet.
+
+        Args:
+            q: Percentile or sequence of percentiles (0-100)
+            column: Metric column
+            connected_only: Only consider connected servers
+
+        Returns:
+            Float, or list of floats for a sequence; NaN when no server has
+            a measurement
+        """
+        with self._lock:
+            _, values = self._view(column, connected_only)
+            values = values.astype(np.float64)
+            values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return [float("nan")] * len(q) if np.ndim(q) else float("nan")
+        result = np.percentile(values, q)
+        return result.tolist() if np.ndim(result) else float(result)
+
+    def summary(self) -> Dict[str, Any]:
+        """Get fleet-wide aggregates.
+
+        Returns:
+            Dictionary with server counts, request/error totals, in-flight
+            total and latency percentiles in nanoseconds
+        """
+        p50, p95, p99 = self.percentile([50, 95, 99])
+        with self._lock:
+            self._drain()
+            rows = np.flatnonzero(self.active[:self._size])
+            return {
+                "servers": int(len(rows)),
+                "connected": int(self.connected[rows].sum()),
+                "requests": int(self.columns["requests"][rows].sum()),
+                "errors": int(self.columns["errors"][rows].sum()),
+                "in_flight": int(self.columns["in_flight"][rows].sum()),
+                "latency_ns": {"p50": p50, "p95": p95, "p99": p99},
+            }
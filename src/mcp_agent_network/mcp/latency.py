@@ -0,0 +1,138 @@
+"""High-resolution latency statistics for MCP servers."""
+
+import math
+import threading
+from typing import Any, Dict, Optional
+
+# Weight of a new sample in the moving averages
+DEFAULT_ALPHA = 0.2
+
+# Samples needed before outliers are reported
+MIN_OUTLIER_SAMPLES = 5
+
+
+class LatencyStats:
+    """Exponentially weighted latency average and variance in nanoseconds.
+
+    Samples come from monotonic ``perf_counter_ns`` measurements, so
+    sub-millisecond servers remain distinguishable and wall-clock
+    adjustments cannot corrupt them.
+    """
+
+    def __init__(self, alpha: float = DEFAULT_ALPHA):
+        """Initialize empty statistics.
+
+        Args:
+            alpha: Weight of a new sample in the moving averages (0-1)
+        """
+        self.alpha = alpha
+        self.samples = 0
+        self.last_ns: Optional[int] = None
+        self.min_ns: Optional[int] = None
+        self.ewma_ns: Optional[float] = None
+        self.ewmv_ns2 = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, elapsed_ns: int) -> None:
+        """Add a latency sample.
+
+        Args:
+            elapsed_ns: Measured latency in nanoseconds
+        """
+        with self._lock:
+            self.samples += 1
+            self.last_ns = elapsed_ns
+            if self.min_ns is None or elapsed_ns < self.min_ns:
+                self.min_ns = elapsed_ns
+            if self.ewma_ns is None:
+                self.ewma_ns = float(elapsed_ns)
+                return
+            # Incremental EWMA and EW variance (West, 1979)
+            diff = elapsed_ns - self.ewma_ns
+            increment = self.alpha * diff
+            self.ewma_ns += increment
+            self.ewmv_ns2 = (1 - self.alpha) * (self.ewmv_ns2 + diff * increment)
+
+    @property
+    def stddev_ns(self) -> float:
+        """Exponentially weighted standard deviation in nanoseconds."""
+        return math.sqrt(self.ewmv_ns2)
+
+    def score(self, deviations: float = 1.0) -> float:
+        """Get a routing score; lower is better.
+
+        Args:
+            deviations: Number of standard deviations added to the average,
+                penalizing servers with jittery latency
+
+        Returns:
+            Average plus the weighted deviation in nanoseconds, or infinity
+            without samples
+        """
+        with self._lock:
+            if self.ewma_ns is None:
+                return math.inf
+            return self.ewma_ns + deviations * math.sqrt(self.ewmv_ns2)
+
+    def is_outlier(self, elapsed_ns: int, deviations: float = 3.0) -> bool:
+        """Check whether a sample is a latency spike.
+
+        A sample is a spike when it exceeds both the average plus
+        ``deviations`` standard deviations and twice the average, so tiny
+        variances of very fast servers do not cause false alarms.
+
+        Args:
+            elapsed_ns: Measured latency in nanoseconds
+            deviations: Number of standard deviations tolerated
+
+        Returns:
+            True if the sample is a spike relative to the history so far
+        """
+        with self._lock:
+            if self.ewma_ns is None or self.samples < MIN_OUTLIER_SAMPLES:
+                return False
+            threshold = self.ewma_ns + deviations * math.sqrt(self.ewmv_ns2)
+            return elapsed_ns > threshold and elapsed_ns > 2 * self.ewma_ns
+
+    def export_state(self) -> Dict[str, Any]:
+        """Get the full statistics for a snapshot.
+
+        Returns:
+            Dictionary accepted by restore_state()
+        """
+        with self._lock:
+            return {
+                "samples": self.samples,
+                "last_ns": self.last_ns,
+                "min_ns": self.min_ns,
+                "ewma_ns": self.ewma_ns,
+                "ewmv_ns2": self.ewmv_ns2,
+            }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Replace the statistics with ones from a snapshot.
+
+        Args:
+            state: Dictionary from export_state()
+        """
+        with self._lock:
+            self.samples = state.get("samples", 0)
+            self.last_ns = state.get("last_ns")
+            self.min_ns = state.get("min_ns")
+            self.ewma_ns = state.get("ewma_ns")
+            self.ewmv_ns2 = state.get("ewmv_ns2", 0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the statistics as integer nanoseconds.
+
+        Returns:
+            Dictionary with sample count and last/min/average/stddev latency
+        """
+        with self._lock:
+            return {
+                "samples": self.samples,
+                "last_ns": self.last_ns,
+                "min_ns": self.min_ns,
+                "ewma_ns": round(self.ewma_ns) if self.ewma_ns is not None else None,
+                "stddev_ns": round(math.sqrt(self.ewmv_ns2)),
+            }
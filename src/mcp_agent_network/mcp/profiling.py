@@ -0,0 +1,212 @@
+"""Profiling of agent network operations."""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Phases a message goes through in MCPClient
+PHASES = ("queue", "serialize", "network", "server", "total")
+
+
+class _PhaseStats:
+    """Running statistics of one phase."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class Profiler:
+    """Records per-phase timings of operations and samples call stacks.
+
+    Timings are aggregated by (operation, phase) and by (server, phase), so
+    a slow task can be attributed to queueing, serialization, the network or
+    server processing. The optional sampling profiler periodically captures
+    the stacks of all threads and emits them in the collapsed-stack format
+    understood by flamegraph.pl, speedscope and similar tools.
+    """
+
+    def __init__(self, sampling_interval: Optional[float] = None,
+                 output_dir: str = "profile"):
+        """Initialize the profiler.
+
+        Args:
+            sampling_interval: Seconds between stack samples, or None to
+                record phase timings only
+            output_dir: Directory for write_report()
+        """
+        self.sampling_interval = sampling_interval
+        self.output_dir = output_dir
+        self.operations: Dict[Tuple[str, str], _PhaseStats] = {}
+        self.servers: Dict[Tuple[str, str], _PhaseStats] = {}
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config: Any) -> "Profiler":
+        """Create a profiler from the "profile" configuration value.
+
+        Args:
+            config: True, an output directory, or a dictionary with optional
+                "sampling_interval" and "output_dir" keys
+
+        Returns:
+            Configured Profiler instance
+        """
+        if isinstance(config, str):
+            config = {"output_dir": config}
+        elif not isinstance(config, dict):
+            config = {}
+        return cls(
+            sampling_interval=config.get("sampling_interval"),
+            output_dir=config.get("output_dir", "profile"),
+        )
+
+    def record(self, operation: str, phase: str, seconds: float,
+               server: Optional[str] = None) -> None:
+        """Record the duration of one phase of an operation.
+
+        Args:
+            operation: Operation name (e.g., "send_message")
+            phase: Phase name (e.g., "network")
+            seconds: Duration in seconds
+            server: Server the phase ran against, if any
+        """
+        with self._lock:
+            key = (operation, phase)
+            stats = self.operations.get(key)
+            if stats is None:
+                stats = self.operations[key] = _PhaseStats()
+            stats.add(seconds)
+            if server is not None:
+                # Per server, whole operations are listed under their own name
+                key = (server, operation if phase == "total" else phase)
+                stats = self.servers.get(key)
+                if stats is None:
+                    stats = self.servers[key] = _PhaseStats()
+                stats.add(seconds)
+
+    @contextmanager
+    def phase(self, operation: str, phase: str = "total",
+              server: Optional[str] = None) -> Iterator[None]:
+        """Time a block as one phase of an operation.
+
+        Args:
+            operation: Operation name
+            phase: Phase name
+            server: Server the phase runs against, if any
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(operation, phase, time.perf_counter() - start, server)
+
+    def start(self) -> None:
+        """Start the sampling profiler, if a sampling interval is configured."""
+        if self.sampling_interval is None or self._sampler is not None:
+            return
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop the sampling profiler."""
+        sampler, self._sampler = self._sampler, None
+        if sampler is not None:
+            self._stop.set()
+            sampler.join()
+
+    def _sample_loop(self) -> None:
+        """Capture stacks of all other threads until stopped."""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.sampling_interval):
+            frames = sys._current_frames()
+            collapsed = []
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                names: List[str] = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+                    frame = frame.f_back
+                collapsed.append(";".join(reversed(names)))
+            with self._lock:
+                self.stacks.update(collapsed)
+                self.samples += 1
+
+    def flamegraph_lines(self) -> List[str]:
+        """Get sampled stacks in collapsed-stack format.
+
+        Returns:
+            Lines of "frame;frame;frame count", most frequent first
+        """
+        with self._lock:
+            return [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+
+    def report(self) -> Dict[str, Any]:
+        """Get the aggregated phase timings.
+
+        Returns:
+            Dictionary with per-operation and per-server phase statistics
+        """
+        with self._lock:
+            operations: Dict[str, Dict[str, Any]] = {}
+            for (operation, phase), stats in sorted(self.operations.items()):
+                operations.setdefault(operation, {})[phase] = stats.to_dict()
+            servers: Dict[str, Dict[str, Any]] = {}
+            for (server, phase), stats in sorted(self.servers.items()):
+                servers.setdefault(server, {})[phase] = stats.to_dict()
+            return {"operations": operations, "servers": servers, "samples": self.samples}
+
+    def write_report(self, output_dir: Optional[str] = None) -> Dict[str, str]:
+        """Write the phase report and the flamegraph input to disk.
+
+        Args:
+            output_dir: Target directory, defaults to the configured one
+
+        Returns:
+            Dictionary with the paths of the "report" and "flamegraph" files
+        """
+        output_dir = output_dir or self.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        paths = {
+            "report": os.path.join(output_dir, "profile.json"),
+            "flamegraph": os.path.join(output_dir, "stacks.folded"),
+        }
+        with open(paths["report"], "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        with open(paths["flamegraph"], "w", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in self.flamegraph_lines())
+        logger.info(f"Wrote profile to {output_dir}")
+        return paths
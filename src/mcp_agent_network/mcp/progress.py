@@ -1,136 +1,302 @@
 """Progress indicators for MCP operations."""
 
+import abc
+import shutil
 import sys
+import threading
 import time
-from typing import Optional
+from typing import List, Optional, TextIO
 
+# ANSI sequences used to redraw the block of live indicators in place
+_CLEAR_LINE = "\x1b[2K"
+_CLEAR_TO_END = "\x1b[J"
 
-class ProgressBar:
+
+class ProgressRenderer:
+    """Background renderer for one or more progress indicators.
+
+    Indicators only update their counters; a single render thread redraws
+    all live indicators at most ``max_fps`` times per second, so frequent
+    updates from many worker threads cost almost nothing. Rendering is
+    disabled automatically when the output stream is not a terminal.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, max_fps: float = 10.0,
+                 enabled: Optional[bool] = None):
+        """Initialize the renderer.
+
+        Args:
+            stream: Output stream (defaults to sys.stdout at render time)
+            max_fps: Maximum number of redraws per second
+            enabled: Force rendering on or off; None auto-detects a TTY
+        """
+        self._stream = stream
+        self.max_fps = max_fps
+        self._enabled = enabled
+        self._indicators: List["_Indicator"] = []
+        self._retired: List[str] = []
+        self._drawn_lines = 0
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def stream(self) -> TextIO:
+        """Get the output stream."""
+        return self._stream if self._stream is not None else sys.stdout
+
+    @property
+    def enabled(self) -> bool:
+        """Check whether the renderer writes any output."""
+        if self._enabled is not None:
+            return self._enabled
+        isatty = getattr(self.stream, "isatty", None)
+        return bool(isatty and isatty())
+
+    def register(self, indicator: "_Indicator") -> None:
+        """Start rendering an indicator.
+
+        Args:
+            indicator: Progress bar or spinner to render
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if indicator not in self._indicators:
+                self._indicators.append(indicator)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="mcp-progress-renderer", daemon=True
+                )
+                self._thread.start()
+
+    def unregister(self, indicator: "_Indicator", keep: bool = False) -> None:
+        """Stop rendering an indicator and redraw immediately.
+
+        Args:
+            indicator: Progress bar or spinner to remove
+            keep: Whether to leave the final state of the indicator on screen
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if indicator not in self._indicators:
+                return
+            if keep:
+                self._retired.append(indicator.render_line(self._terminal_width()))
+            self._indicators.remove(indicator)
+            self._draw()
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        """Redraw live indicators at the configured frame rate."""
+        interval = 1.0 / self.max_fps if self.max_fps > 0 else 0.1
+        while True:
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            with self._lock:
+                if not self._indicators:
+                    self._thread = None
+                    return
+                self._draw()
+
+    def _terminal_width(self) -> int:
+        """Get the current terminal width in columns."""
+        return shutil.get_terminal_size(fallback=(80, 24)).columns
+
+    def _draw(self) -> None:
+        """Write retired lines and redraw the live block (lock held)."""
+        width = self._terminal_width()
+        parts = ["\r"]
+        if self._drawn_lines > 1:
+            parts.append(f"\x1b[{self._drawn_lines - 1}A")
+        for line in self._retired:
+            parts.append(f"{_CLEAR_LINE}{line}\n")
+        self._retired = []
+
+        live = [indicator.render_line(width) for indicator in self._indicators]
+        parts.append("\n".join(f"{_CLEAR_LINE}{line}" for line in live))
+        parts.append(_CLEAR_TO_END)
+        self._drawn_lines = len(live)
+
+        self.stream.write("".join(parts))
+        self.stream.flush()
+
+
+_default_renderer: Optional[ProgressRenderer] = None
+_default_renderer_lock = threading.Lock()
+
+
+def get_default_renderer() -> ProgressRenderer:
+    """Get the renderer shared by indicators created without one.
+
+    Returns:
+        Process-wide ProgressRenderer instance
+    """
+    global _default_renderer
+    with _default_renderer_lock:
+        if _default_renderer is None:
+            _default_renderer = ProgressRenderer()
+        return _default_renderer
+
+
+def _truncate(line: str, width: int) -> str:
+    """Truncate a line to fit within the terminal width."""
+    if len(line) >= width:
+        return line[:max(width - 4, 0)] + "..."
+    return line
+
+
+class _Indicator(abc.ABC):
+    """Base class for indicators drawn by a ProgressRenderer."""
+
+    @abc.abstractmethod
+    def render_line(self, width: int) -> str:
+        """Render the indicator as a single line of at most ``width`` columns."""
+
+
+class ProgressBar(_Indicator):
     """Simple progress bar for command-line interfaces.
-    
-    Displays a progress bar with percentage and status message.
+
+    Displays a progress bar with percentage and status message. Updates are
+    cheap and thread-safe; drawing happens on the renderer thread.
     """
-    
-    def __init__(self, total: int, description: str = "Progress", width: int = 40):
+
+    def __init__(self, total: int, description: str = "Progress", width: int = 40,
+                 renderer: Optional[ProgressRenderer] = None):
         """Initialize the progress bar.
-        
+
         Args:
             total: Total number of steps
             description: Description of the operation
             width: Width of the progress bar in characters
+            renderer: Renderer to draw with (defaults to the shared renderer)
         """
         self.total = total
         self.description = description
         self.width = width
         self.current = 0
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.status = ""
-        
+        self.renderer = renderer or get_default_renderer()
+        self._lock = threading.Lock()
+        self.renderer.register(self)
+
     def update(self, current: int, status: Optional[str] = None) -> None:
         """Update the progress bar.
-        
+
         Args:
             current: Current step
             status: Optional status message
         """
-        self.current = current
-        if status:
-            self.status = status
-        
-        self._render()
-        
+        with self._lock:
+            self.current = current
+            if status:
+                self.status = status
+
+    def advance(self, steps: int = 1, status: Optional[str] = None) -> None:
+        """Atomically advance the progress bar.
+
+        Args:
+            steps: Number of completed steps to add
+            status: Optional status message
+        """
+        with self._lock:
+            self.current += steps
+            if status:
+                self.status = status
+
     def finish(self) -> None:
         """Mark the progress as complete."""
         self.update(self.total, "Complete")
-        sys.stdout.write("\n")
-        sys.stdout.flush()
-        
-    def _render(self) -> None:
-        """Render the progress bar."""
-        percent = self.current / self.total
+        self.renderer.unregister(self, keep=True)
+
+    def render_line(self, width: int) -> str:
+        """Render the progress bar.
+
+        Args:
+            width: Terminal width in columns
+
+        Returns:
+            Rendered line
+        """
+        with self._lock:
+            current, status = self.current, self.status
+        percent = min(current / self.total, 1.0) if self.total > 0 else 1.0
         filled_width = int(self.width * percent)
         bar = "█" * filled_width + "░" * (self.width - filled_width)
-        
-        elapsed = time.time() - self.start_time
+
+        elapsed = time.monotonic() - self.start_time
         if percent > 0:
             eta = elapsed / percent - elapsed
             eta_str = f"ETA: {eta:.1f}s"
         else:
             eta_str = "ETA: --"
-            
+
         # Format: [Description] [Progress Bar] xx% Status | Elapsed: xx.xs | ETA: xx.xs
-        output = f"\r{self.description}: [{bar}] {percent*100:.1f}% | {self.status} | Elapsed: {elapsed:.1f}s | {eta_str}"
-        
-        # Truncate if too long for terminal
-        term_width = 80  # Assume default terminal width
-        if len(output) > term_width:
-            output = output[:term_width-3] + "..."
-            
-        sys.stdout.write(output)
-        sys.stdout.flush()
-
-
-class SpinnerIndicator:
+        output = f"{self.description}: [{bar}] {percent*100:.1f}% | {status} | Elapsed: {elapsed:.1f}s | {eta_str}"
+        return _truncate(output, width)
+
+
+class SpinnerIndicator(_Indicator):
     """Spinner indicator for processes without known progress.
-    
-    Displays a spinning cursor to indicate activity.
+
+    Displays a spinning cursor to indicate activity. The spinner animates on
+    the renderer thread while it is running.
     """
-    
-    def __init__(self, description: str = "Processing"):
+
+    def __init__(self, description: str = "Processing",
+                 renderer: Optional[ProgressRenderer] = None):
         """Initialize the spinner.
-        
+
         Args:
             description: Description of the operation
+            renderer: Renderer to draw with (defaults to the shared renderer)
         """
         self.description = description
         self.frames = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-        self.current_frame = 0
-        self.start_time = 0
+        self.frame_rate = 10.0
+        self.start_time = 0.0
         self.running = False
         self.status = ""
-        
+        self.renderer = renderer or get_default_renderer()
+
     def start(self, status: Optional[str] = None) -> None:
         """Start the spinner.
-        
+
         Args:
             status: Optional status message
         """
         self.running = True
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         if status:
             self.status = status
-        
+        self.renderer.register(self)
+
     def update(self, status: str) -> None:
         """Update the spinner status.
-        
+
         Args:
             status: New status message
         """
         self.status = status
-        self._render()
-        
+
     def stop(self) -> None:
         """Stop the spinner."""
         self.running = False
-        sys.stdout.write("\r")
-        sys.stdout.flush()
-        
-    def _render(self) -> None:
-        """Render the spinner."""
-        if not self.running:
-            return
-        
-        frame = self.frames[self.current_frame]
-        self.current_frame = (self.current_frame + 1) % len(self.frames)
-        
-        elapsed = time.time() - self.start_time
-        
-        output = f"\r{frame} {self.description}: {self.status} | Elapsed: {elapsed:.1f}s"
-        
-        # Truncate if too long for terminal
-        term_width = 80  # Assume default terminal width
-        if len(output) > term_width:
-            output = output[:term_width-3] + "..."
-            
-        sys.stdout.write(output)
-        sys.stdout.flush() 
\ No newline at end of file
+        self.renderer.unregister(self)
+
+    def render_line(self, width: int) -> str:
+        """Render the spinner.
+
+        Args:
+            width: Terminal width in columns
+
+        Returns:
+            Rendered line
+        """
+        elapsed = time.monotonic() - self.start_time
+        frame = self.frames[int(elapsed * self.frame_rate) % len(self.frames)]
+
+        output = f"{frame} {self.description}: {self.status} | Elapsed: {elapsed:.1f}s"
+        return _truncate(output, width)
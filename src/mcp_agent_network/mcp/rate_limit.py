@@ -0,0 +1,371 @@
+"""Admission control and rate limiting for MCP server requests."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Multiplicative factor applied to the request rate when a server throttles us
+THROTTLE_BACKOFF = 0.5
+# Fraction of the configured rate recovered after each successful request
+RECOVERY_STEP = 0.05
+# Pause applied on a throttle signal that carries no retry-after hint (seconds)
+DEFAULT_RETRY_AFTER = 1.0
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate.
+
+    Not thread-safe on its own; callers are expected to hold a lock.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size), defaults to the rate
+            clock: Monotonic clock returning seconds
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self.tokens = self.capacity
+        self._clock = clock
+        self._last_refill = clock()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accumulated since the last refill."""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Get the time until the requested tokens become available.
+
+        Args:
+            tokens: Number of tokens required
+
+        Returns:
+            Seconds to wait, 0.0 if the tokens are available now
+        """
+        now = self._clock()
+        self._refill(now)
+        wait = max(0.0, self._blocked_until - now)
+        if self.tokens < tokens:
+            if self.rate <= 0:
+                return float("inf")
+            wait = max(wait, (tokens - self.tokens) / self.rate)
+        return wait
+
+    def consume(self, tokens: float = 1.0) -> bool:
+        """Take tokens from the bucket if they are available.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            True if the tokens were taken, False otherwise
+        """
+        if self.wait_time(tokens) > 0:
+            return False
+        self.tokens -= tokens
+        return True
+
+    def block_for(self, seconds: float) -> None:
+        """Stop handing out tokens for the given duration.
+
+        Args:
+            seconds: Duration of the pause
+        """
+        now = self._clock()
+        self._blocked_until = max(self._blocked_until, now + seconds)
+        self.tokens = 0.0
+        self._last_refill = max(now, self._blocked_until)
+
+
+class RateLimiter:
+    """Admission controller combining a token bucket and an in-flight cap.
+
+    A limiter may have a parent (typically a network-wide limiter); a request
+    is only admitted when both the limiter and its parent allow it. Each
+    limiter has its own condition variable: releases wake the limiter's own
+    waiters, and a parent only wakes the children that were blocked on it.
+    Locks are always taken child first, then parent.
+    """
+
+    def __init__(self, name: str, rate: Optional[float] = None,
+                 burst: Optional[float] = None, max_in_flight: Optional[int] = None,
+                 max_wait: float = 0.0, min_rate: Optional[float] = None,
+                 parent: Optional["RateLimiter"] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the rate limiter.
+
+        Args:
+            name: Name of the limiter (server name or "global")
+            rate: Sustained requests per second, or None for no rate limit
+            burst: Maximum burst size, defaults to the rate
+            max_in_flight: Maximum number of concurrent requests, or None
+            max_wait: Maximum time to queue for admission in seconds (0 rejects fast)
+            min_rate: Lower bound for the adaptive rate, defaults to 10% of rate
+            parent: Optional parent limiter that must also admit the request
+            clock: Monotonic clock returning seconds
+        """
+        self.name = name
+        self.bucket: Optional[TokenBucket] = None
+        self.parent = parent
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.throttled = 0
+        self._paused_until = 0.0
+        self._clock = clock
+        self._cond = threading.Condition()
+        # Conditions of children waiting for this limiter to admit them
+        self._waiters: Set[threading.Condition] = set()
+        self._configure(rate, burst, max_in_flight, max_wait, min_rate)
+
+    @classmethod
+    def from_config(cls, name: str, config: Dict[str, Any],
+                    parent: Optional["RateLimiter"] = None) -> "RateLimiter":
+        """Create a rate limiter from a configuration dictionary.
+
+        Args:
+            name: Name of the limiter
+            config: Dictionary with optional "rate", "burst", "max_in_flight",
+                "max_wait" and "min_rate" keys
+            parent: Optional parent limiter
+
+        Returns:
+            Configured RateLimiter instance
+        """
+        return cls(name, parent=parent, **_limits(config))
+
+    def _configure(self, rate: Optional[float], burst: Optional[float],
+                   max_in_flight: Optional[int], max_wait: float,
+                   min_rate: Optional[float]) -> None:
+        """Apply limits, keeping the bucket's tokens where possible (lock held)."""
+        self.base_rate = rate
+        self.min_rate = min_rate if min_rate is not None else (rate * 0.1 if rate else None)
+        if not rate:
+            self.bucket = None
+        elif self.bucket is None:
+            self.bucket = TokenBucket(rate, burst, self._clock)
+        else:
+            self.bucket.rate = float(rate)
+            self.bucket.capacity = float(burst if burst is not None else max(rate, 1.0))
+            self.bucket.tokens = min(self.bucket.tokens, self.bucket.capacity)
+        self.max_in_flight = max_in_flight
+        self.max_wait = max_wait
+
+    def update_config(self, config: Dict[str, Any]) -> None:
+        """Change the limits in place.
+
+        In-flight requests, counters and pauses are kept, so requests admitted
+        under the old limits are still accounted for when they are released.
+
+        Args:
+            config: Dictionary with optional "rate", "burst", "max_in_flight",
+                "max_wait" and "min_rate" keys
+        """
+        with self._cond:
+            self._configure(**_limits(config))
+            self._cond.notify_all()
+        self._notify_waiters()
+
+    def set_parent(self, parent: Optional["RateLimiter"]) -> None:
+        """Chain the limiter to another parent, moving its in-flight requests.
+
+        Args:
+            parent: New parent limiter, or None to remove the parent
+        """
+        with self._cond:
+            previous = self.parent
+            if parent is previous:
+                return
+            if previous is not None:
+                previous._add_in_flight(-self.in_flight)
+            if parent is not None:
+                parent._add_in_flight(self.in_flight)
+            self.parent = parent
+            self._cond.notify_all()
+        _notify_ancestors(previous)
+
+    def _admission_delay(self) -> float:
+        """Get the time until this limiter could admit a request (lock held)."""
+        if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+            return float("inf")
+        delay = max(0.0, self._paused_until - self._clock())
+        if self.bucket:
+            delay = max(delay, self.bucket.wait_time())
+        return delay
+
+    def _try_admit(self, waiter: threading.Condition) -> float:
+        """Admit a request here and in all ancestors if they all allow it now.
+
+        Args:
+            waiter: Condition to notify when a blocked request may retry
+
+        Returns:
+            0.0 if admitted, otherwise the time until admission could succeed
+        """
+        with self._cond:
+            delay = self._admission_delay()
+            if delay <= 0 and self.parent is not None:
+                delay = self.parent._try_admit(waiter)
+            if delay > 0:
+                if waiter is not self._cond:
+                    self._waiters.add(waiter)
+                return delay
+            if self.bucket:
+                self.bucket.consume()
+            self.in_flight += 1
+            self.admitted += 1
+            return 0.0
+
+    def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """Wait for admission of a single request.
+
+        Requests that cannot be admitted within the wait budget are rejected
+        immediately instead of sleeping for the full budget.
+
+        Args:
+            max_wait: Override for the configured maximum wait in seconds
+
+        Returns:
+            True if the request was admitted and must be released later
+        """
+        budget = self.max_wait if max_wait is None else max_wait
+        deadline = self._clock() + budget
+        with self._cond:
+            while True:
+                delay = self._try_admit(self._cond)
+                if delay <= 0:
+                    return True
+                remaining = deadline - self._clock()
+                if remaining <= 0 or (delay != float("inf") and delay > remaining):
+                    self.rejected += 1
+                    return False
+                self._cond.wait(min(delay, remaining))
+
+    def release(self) -> None:
+        """Release an in-flight slot taken by acquire()."""
+        with self._cond:
+            self._add_in_flight(-1)
+            self._cond.notify_all()
+            parent = self.parent
+        _notify_ancestors(parent)
+
+    def _add_in_flight(self, count: int) -> None:
+        """Adjust the in-flight count here and in all ancestors."""
+        with self._cond:
+            self.in_flight = max(0, self.in_flight + count)
+            if self.parent is not None:
+                self.parent._add_in_flight(count)
+
+    def _notify_waiters(self) -> None:
+        """Wake the children that were blocked on this limiter (no lock held)."""
+        with self._cond:
+            waiters, self._waiters = self._waiters, set()
+        for waiter in waiters:
+            with waiter:
+                waiter.notify_all()
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Back off after the server signaled throttling.
+
+        Args:
+            retry_after: Server-provided pause in seconds, if any
+        """
+        pause = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER
+        with self._cond:
+            self.throttled += 1
+            self._paused_until = max(self._paused_until, self._clock() + pause)
+            if self.bucket is not None:
+                self.bucket.rate = max(self.min_rate or 0.0, self.bucket.rate * THROTTLE_BACKOFF)
+                self.bucket.block_for(pause)
+        logger.warning(f"Server {self.name} throttled requests; pausing {pause:.2f}s")
+
+    def record_success(self) -> None:
+        """Recover the request rate gradually after a successful request."""
+        with self._cond:
+            if self.bucket is None or self.bucket.rate >= self.base_rate:
+                return
+            step = self.base_rate * RECOVERY_STEP
+            self.bucket.rate = min(self.base_rate, self.bucket.rate + step)
+
+    def observe(self, response: Dict[str, Any]) -> None:
+        """Adapt the limiter to a server response.
+
+        Args:
+            response: Response returned by the server
+        """
+        retry_after = parse_retry_after(response)
+        if retry_after is not None:
+            self.record_throttle(retry_after if retry_after > 0 else None)
+        elif response.get("status") != "failed":
+            self.record_success()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current limiter state.
+
+        Returns:
+            Dictionary with rate, in-flight and counter details
+        """
+        with self._cond:
+            return {
+                "rate": self.bucket.rate if self.bucket else None,
+                "configured_rate": self.base_rate,
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self.in_flight,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "throttled": self.throttled,
+            }
+
+
+def _notify_ancestors(limiter: Optional[RateLimiter]) -> None:
+    """Wake children blocked on a limiter or any of its ancestors."""
+    while limiter is not None:
+        limiter._notify_waiters()
+        limiter = limiter.parent
+
+
+def _limits(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the limiter arguments from a configuration dictionary."""
+    return {
+        "rate": config.get("rate"),
+        "burst": config.get("burst"),
+        "max_in_flight": config.get("max_in_flight"),
+        "max_wait": config.get("max_wait", 0.0),
+        "min_rate": config.get("min_rate"),
+    }
+
+
+def parse_retry_after(response: Dict[str, Any]) -> Optional[float]:
+    """Extract a throttling signal from a server response.
+
+    Args:
+        response: Response returned by the server
+
+    Returns:
+        Retry-after delay in seconds (0.0 when throttled without a hint),
+        or None if the response does not signal throttling
+    """
+    retry_after = response.get("retry_after")
+    if retry_after is None and response.get("headers"):
+        # Header names are case-insensitive
+        headers = {str(name).lower(): value for name, value in response["headers"].items()}
+        retry_after = headers.get("retry-after")
+    throttled = response.get("status_code") == 429 or response.get("status") == "throttled"
+    if retry_after is None:
+        return 0.0 if throttled else None
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        return 0.0
@@ -0,0 +1,316 @@
+"""Compiled JSON Schema validators for tool arguments and results."""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+# A compiled check appends error messages for an instance at a path
+Check = Callable[[Any, str, List[str]], None]
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+class SchemaValidator:
+    """Validator compiled from a JSON Schema.
+
+    Compilation turns the schema into a tree of closures once, so validating
+    an instance does not re-interpret the schema. Supports the commonly used
+    subset of JSON Schema: type, enum, const, properties, required,
+    additionalProperties, items, length/size/range bounds, pattern, allOf,
+    anyOf, oneOf and not. Unsupported keywords (such as $ref) are ignored.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        """Compile a schema.
+
+        Args:
+            schema: JSON Schema dictionary
+        """
+        self.schema = schema
+        self._check = _compile(schema)
+
+    def validate(self, instance: Any) -> List[str]:
+        """Validate an instance.
+
+        Args:
+            instance: Value to validate
+
+        Returns:
+            List of error messages, empty if the instance is valid
+        """
+        errors: List[str] = []
+        self._check(instance, "$", errors)
+        return errors
+
+    def is_valid(self, instance: Any) -> bool:
+        """Check whether an instance is valid."""
+        return not self.validate(instance)
+
+
+def _compile(schema: Any) -> Check:
+    """Compile a schema node into a check function."""
+    if schema is True or schema is None or schema == {}:
+        return lambda instance, path, errors: None
+    if schema is False:
+        return lambda instance, path, errors: errors.append(f"{path}: no value allowed")
+
+    checks: List[Check] = []
+
+    if "type" in schema:
+        types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        type_checks = [_TYPE_CHECKS[name] for name in types if name in _TYPE_CHECKS]
+        expected = " or ".join(types)
+
+        def check_type(instance: Any, path: str, errors: List[str]) -> None:
+            if not any(check(instance) for check in type_checks):
+                errors.append(f"{path}: expected {expected}, got {type(instance).__name__}")
+
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = schema["enum"]
+
+        def check_enum(instance: Any, path: str, errors: List[str]) -> None:
+            if instance not in allowed:
+                errors.append(f"{path}: {instance!r} is not one of {allowed!r}")
+
+        checks.append(check_enum)
+
+    if "const" in schema:
+        const = schema["const"]
+
+        def check_const(instance: Any, path: str, errors: List[str]) -> None:
+            if instance != const:
+                errors.append(f"{path}: expected {const!r}")
+
+        checks.append(check_const)
+
+    checks.extend(_compile_object(schema))
+    checks.extend(_compile_array(schema))
+    checks.extend(_compile_string(schema))
+    checks.extend(_compile_number(schema))
+    checks.extend(_compile_combinators(schema))
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(instance: Any, path: str, errors: List[str]) -> None:
+        for check in checks:
+            check(instance, path, errors)
+
+    return check_all
+
+
+def _compile_object(schema: Dict[str, Any]) -> List[Check]:
+    """Compile object keywords."""
+    checks: List[Check] = []
+    properties = {name: _compile(sub) for name, sub in (schema.get("properties") or {}).items()}
+    required = list(schema.get("required") or [])
+    additional = schema.get("additionalProperties", True)
+    additional_check = _compile(additional) if isinstance(additional, dict) else None
+
+    if not properties and not required and additional is True:
+        return checks
+
+    def check_object(instance: Any, path: str, errors: List[str]) -> None:
+        if not isinstance(instance, dict):
+            return
+        for name in required:
+            if name not in instance:
+                errors.append(f"{path}: missing required property {name!r}")
+        for name, value in instance.items():
+            check = properties.get(name)
+            if check is not None:
+                check(value, f"{path}.{name}", errors)
+            elif additional is False:
+                errors.append(f"{path}: unexpected property {name!r}")
+            elif additional_check is not None:
+                additional_check(value, f"{path}.{name}", errors)
+
+    checks.append(check_object)
+    return checks
+
+
+def _compile_array(schema: Dict[str, Any]) -> List[Check]:
+    """Compile array keywords."""
+    checks: List[Check] = []
+    items = _compile(schema["items"]) if isinstance(schema.get("items"), dict) else None
+    min_items = schema.get("minItems")
+    max_items = schema.get("maxItems")
+
+    if items is None and min_items is None and max_items is None:
+        return checks
+
+    def check_array(instance: Any, path: str, errors: List[str]) -> None:
+        if not isinstance(instance, list):
+            return
+        if min_items is not None and len(instance) < min_items:
+            errors.append(f"{path}: expected at least {min_items} items")
+        if max_items is not None and len(instance) > max_items:
+            errors.append(f"{path}: expected at most {max_items} items")
+        if items is not None:
+            for i, value in enumerate(instance):
+                items(value, f"{path}[{i}]", errors)
+
+    checks.append(check_array)
+    return checks
+
+
+def _compile_string(schema: Dict[str, Any]) -> List[Check]:
+    """Compile string keywords."""
+    checks: List[Check] = []
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+
+    if min_length is None and max_length is None and pattern is None:
+        return checks
+
+    def check_string(instance: Any, path: str, errors: List[str]) -> None:
+        if not isinstance(instance, str):
+            return
+        if min_length is not None and len(instance) < min_length:
+            errors.append(f"{path}: shorter than {min_length} characters")
+        if max_length is not None and len(instance) > max_length:
+            errors.append(f"{path}: longer than {max_length} characters")
+        if pattern is not None and not pattern.search(instance):
+            errors.append(f"{path}: does not match pattern {pattern.pattern!r}")
+
+    checks.append(check_string)
+    return checks
+
+
+def _compile_number(schema: Dict[str, Any]) -> List[Check]:
+    """Compile numeric range keywords."""
+    is_number = _TYPE_CHECKS["number"]
+    minimum, maximum = schema.get("minimum"), schema.get("maximum")
+    exclusive_minimum = schema.get("exclusiveMinimum")
+    exclusive_maximum = schema.get("exclusiveMaximum")
+    # Draft-04 spells exclusive bounds as booleans that modify minimum/maximum
+    if exclusive_minimum is True and is_number(minimum):
+        minimum, exclusive_minimum = None, minimum
+    if exclusive_maximum is True and is_number(maximum):
+        maximum, exclusive_maximum = None, maximum
+    bounds = [
+        (minimum, lambda value, bound: value >= bound, "less than"),
+        (maximum, lambda value, bound: value <= bound, "greater than"),
+        (exclusive_minimum, lambda value, bound: value > bound, "at most"),
+        (exclusive_maximum, lambda value, bound: value < bound, "at least"),
+    ]
+    bounds = [bound for bound in bounds if is_number(bound[0])]
+    if not bounds:
+        return []
+
+    def check_number(instance: Any, path: str, errors: List[str]) -> None:
+        if not is_number(instance):
+            return
+        for bound, ok, message in bounds:
+            if not ok(instance, bound):
+                errors.append(f"{path}: {instance} is {message} {bound}")
+
+    return [check_number]
+
+
+def _compile_combinators(schema: Dict[str, Any]) -> List[Check]:
+    """Compile allOf/anyOf/oneOf/not."""
+    checks: List[Check] = []
+
+    for sub in schema.get("allOf") or []:
+        checks.append(_compile(sub))
+
+    for keyword in ("anyOf", "oneOf"):
+        if keyword not in schema:
+            continue
+        options = [_compile(sub) for sub in schema[keyword]]
+        exactly_one = keyword == "oneOf"
+
+        def check_options(instance: Any, path: str, errors: List[str],
+                          options: List[Check] = options, exactly_one: bool = exactly_one,
+                          keyword: str = keyword) -> None:
+            matches = 0
+            for option in options:
+                option_errors: List[str] = []
+                option(instance, path, option_errors)
+                if not option_errors:
+                    matches += 1
+                    if not exactly_one:
+                        return
+            if matches == 0 or (exactly_one and matches > 1):
+                errors.append(f"{path}: does not match {keyword} ({matches} matched)")
+
+        checks.append(check_options)
+
+    if "not" in schema:
+        negated = _compile(schema["not"])
+
+        def check_not(instance: Any, path: str, errors: List[str]) -> None:
+            negated_errors: List[str] = []
+            negated(instance, path, negated_errors)
+            if not negated_errors:
+                errors.append(f"{path}: must not match schema")
+
+        checks.append(check_not)
+
+    return checks
+
+
+# Maximum number of distinct compiled schemas kept for reuse
+MAX_VALIDATORS = 1024
+
+# Schema hash -> validator, least recently used first
+_validators: "OrderedDict[str, SchemaValidator]" = OrderedDict()
+_validators_lock = threading.Lock()
+
+
+def schema_key(schema: Dict[str, Any]) -> str:
+    """Get a stable hash of a schema.
+
+    Args:
+        schema: JSON Schema dictionary
+
+    Returns:
+        Hex digest of the canonical JSON encoding
+    """
+    encoded = json.dumps(schema, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def get_validator(schema: Optional[Dict[str, Any]]) -> Optional[SchemaValidator]:
+    """Get the compiled validator for a schema, compiling it on first use.
+
+    Identical schemas declared by different servers share one validator.
+    At most MAX_VALIDATORS are kept; the least recently used are dropped
+    (clients keep the validators they use for as long as they need them).
+
+    Args:
+        schema: JSON Schema dictionary, or None
+
+    Returns:
+        SchemaValidator instance, or None if no schema was given
+    """
+    if not schema:
+        return None
+    key = schema_key(schema)
+    with _validators_lock:
+        validator = _validators.get(key)
+        if validator is not None:
+            _validators.move_to_end(key)
+            return validator
+    validator = SchemaValidator(schema)
+    with _validators_lock:
+        validator = _validators.setdefault(key, validator)
+        _validators.move_to_end(key)
+        while len(_validators) > MAX_VALIDATORS:
+            _validators.popitem(last=False)
+    return validator
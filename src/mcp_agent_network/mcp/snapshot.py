@@ -0,0 +1,199 @@
+"""On-disk snapshots of learned network state for fast restarts."""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised only without msgpack
+    msgpack = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bumped when the snapshot layout changes incompatibly
+SNAPSHOT_VERSION = 1
+
+# Seconds between periodic snapshots
+DEFAULT_INTERVAL = 300.0
+
+
+def encode_snapshot(state: Dict[str, Any]) -> bytes:
+    """Serialize a snapshot, as msgpack when available and JSON otherwise.
+
+    Args:
+        state: Snapshot dictionary
+
+    Returns:
+        Encoded bytes
+    """
+    if msgpack is not None:
+        return msgpack.packb(state, use_bin_type=True)
+    return json.dumps(state, separators=(",", ":")).encode("utf-8")
+
+
+def decode_snapshot(data: bytes) -> Dict[str, Any]:
+    """Deserialize a snapshot written by encode_snapshot().
+
+    Args:
+        data: Encoded bytes
+
+    Returns:
+        Snapshot dictionary
+    """
+    # A msgpack map never starts with "{", so the format is unambiguous
+    if data[:1] == b"{":
+        return json.loads(data)
+    if msgpack is None:
+        raise ValueError("Snapshot is msgpack-encoded but msgpack is not installed")
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def save_snapshot(manager: Any, path: str) -> int:
+    """Write the manager's state to disk atomically.
+
+    Args:
+        manager: MCPConnectionManager to snapshot
+        path: Snapshot file
+
+    Returns:
+        Size of the snapshot in bytes
+    """
+    state = {"version": SNAPSHOT_VERSION, "saved_at": time.time(), **manager.export_state()}
+    data = encode_snapshot(state)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    logger.debug(f"Wrote {len(data)} byte snapshot to {path}")
+    return len(data)
+
+
+def load_snapshot(manager: Any, path: str,
+                  servers: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+    """Restore the manager's state from disk, if a usable snapshot exists.
+
+    Args:
+        manager: MCPConnectionManager to restore into
+        path: Snapshot file
+        servers: Optional names of the configured servers to restore
+            (see MCPConnectionManager.restore_state)
+
+    Returns:
+        Dictionary with the restored "servers", the snapshot's "saved_at"
+        time and the load time in seconds, or None if nothing was restored
+    """
+    start = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            state = decode_snapshot(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable snapshot {path}: {e}")
+        return None
+    if state.get("version") != SNAPSHOT_VERSION:
+        logger.warning(f"Ignoring snapshot {path} with version {state.get('version')}")
+        return None
+    servers = manager.restore_state(state, servers)
+    elapsed = time.perf_counter() - start
+    logger.info(f"Loaded snapshot {path} in {elapsed * 1000:.1f}ms")
+    return {"servers": servers, "saved_at": state.get("saved_at"), "elapsed": elapsed}
+
+
+class SnapshotWriter:
+    """Periodically snapshots a manager's state in a background thread."""
+
+    def __init__(self, manager: Any, path: str, interval: float = DEFAULT_INTERVAL):
+        """Initialize the writer.
+
+        Args:
+            manager: MCPConnectionManager to snapshot
+            path: Snapshot file
+            interval: Seconds between snapshots
+        """
+        self.manager = manager
+        self.path = path
+        self.interval = interval
+        self.snapshots = 0
+        self.last_size = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, manager: Any, config: Any) -> "SnapshotWriter":
+        """Create a writer from the "snapshot" configuration value.
+
+        Args:
+            manager: MCPConnectionManager to snapshot
+            config: Snapshot path, or a dictionary with "path" and optional
+                "interval" keys
+
+        Returns:
+            Configured SnapshotWriter instance
+        """
+        if isinstance(config, str):
+            config = {"path": config}
+        return cls(manager, config["path"], config.get("interval", DEFAULT_INTERVAL))
+
+    def save(self) -> bool:
+        """Write a snapshot now.
+
+        Returns:
+            True if the snapshot was written
+        """
+        with self._lock:
+            try:
+                self.last_size = save_snapshot(self.manager, self.path)
+            except Exception as e:
+                logger.error(f"Failed to write snapshot {self.path}: {e}")
+                return False
+            self.snapshots += 1
+            return True
+
+    def start(self) -> None:
+        """Start writing snapshots periodically."""
+        if self._thread is not None or not self.interval:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="snapshot", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Write snapshots until stopped."""
+        while not self._stop.wait(self.interval):
+            self.save()
+
+    def stop(self) -> None:
+        """Stop the periodic snapshots and write a final one."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+        self.save()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get snapshot statistics.
+
+        Returns:
+            Dictionary with path, interval, snapshot count and last size
+        """
+        return {
+            "path": self.path,
+            "interval": self.interval,
+            "snapshots": self.snapshots,
+            "last_size": self.last_size,
+        }
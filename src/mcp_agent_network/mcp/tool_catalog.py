@@ -0,0 +1,290 @@
+"""Cached catalog of MCP server capability listings."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mcp_agent_network.mcp.client import CAPABILITY_KINDS, MCPClient
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Notification methods mapped to the capability kind they invalidate
+LIST_CHANGED_NOTIFICATIONS = {
+    f"notifications/{kind}/list_changed": kind for kind in CAPABILITY_KINDS
+}
+
+# Called with (server_name, kind, entries); entries is None when a server is removed
+CatalogListener = Callable[[str, str, Optional[List[Dict[str, Any]]]], None]
+
+
+class ToolCatalog:
+    """Catalog of tools, resources and prompts offered by each server.
+
+    Listings are cached in memory and, optionally, on disk keyed by server
+    name and the server version reported at connect time. A warm start with
+    an unchanged server version skips discovery entirely; list_changed
+    notifications refetch only the affected listing.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_age: Optional[float] = None):
+        """Initialize the catalog.
+
+        Args:
+            cache_dir: Optional directory for the on-disk cache
+            max_age: Optional maximum age of cached listings in seconds
+        """
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.listeners: List[CatalogListener] = []
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        # Disk writes happen outside the catalog lock; this lock only orders
+        # them, and stale writes are skipped by comparing generations
+        self._io_lock = threading.Lock()
+        self._generations: Dict[str, int] = {}
+        # Listing each (server, kind) was last announced with, so that
+        # re-syncing an unchanged server does not wake the listeners
+        self._notified: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def add_listener(self, listener: CatalogListener) -> None:
+        """Register a callback for listing changes.
+
+        Args:
+            listener: Callable receiving (server_name, kind, entries)
+        """
+        self.listeners.append(listener)
+        with self._lock:
+            # Announce every listing again on the next sync so the new listener catches up
+            self._notified.clear()
+
+    def _notify(self, server_name: str, kind: str, entries: Optional[List[Dict[str, Any]]]) -> None:
+        """Inform listeners about a listing unless they have already seen it."""
+        with self._lock:
+            if entries is None:
+                self._notified.pop((server_name, kind), None)
+            elif self._notified.get((server_name, kind)) == entries:
+                return
+            else:
+                self._notified[(server_name, kind)] = entries
+        for listener in list(self.listeners):
+            try:
+                listener(server_name, kind, entries)
+            except Exception as e:
+                logger.error(f"Error in catalog listener for {server_name}: {e}")
+
+    def _path(self, server_name: str) -> str:
+        """Get the cache file path for a server."""
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", server_name)[:64]
+        digest = hashlib.sha1(server_name.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.cache_dir, f"{safe}-{digest}.json")
+
+    def _load(self, server_name: str) -> Optional[Dict[str, Any]]:
+        """Load a server's entry from disk."""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(server_name), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable catalog cache for {server_name}: {e}")
+            return None
+
+    def _install(self, entry: Dict[str, Any]) -> int:
+        """Store an entry in memory and get its generation (lock held)."""
+        server_name = entry["server"]
+        self.entries[server_name] = entry
+        generation = self._generations.get(server_name, 0) + 1
+        self._generations[server_name] = generation
+        return generation
+
+    def _save(self, entry: Dict[str, Any], generation: int) -> None:
+        """Write a server's entry to disk atomically (catalog lock not held).
+
+        Entries are never mutated once installed, so the entry is its own
+        snapshot. A write is skipped if a newer entry was installed since.
+        """
+        if not self.cache_dir:
+            return
+        path = self._path(entry["server"])
+        with self._io_lock:
+            if self._generations.get(entry["server"]) != generation:
+                return
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entry, f, separators=(",", ":"))
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Failed to write catalog cache for {entry['server']}: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def _is_fresh(self, entry: Optional[Dict[str, Any]], version: Optional[str]) -> bool:
+        """Check whether a cached entry matches the server's current version."""
+        if entry is None or entry.get("version") != version:
+            return False
+        if self.max_age is not None and time.time() - entry["fetched_at"] > self.max_age:
+            return False
+        return all(kind in entry for kind in CAPABILITY_KINDS)
+
+    def sync(self, client: MCPClient) -> Dict[str, Any]:
+        """Make sure the catalog holds current listings for a connected client.
+
+        Args:
+            client: Connected MCP client
+
+        Returns:
+            Catalog entry with "server", "version" and one list per kind
+        """
+        server_name = client.server_name
+        version = client.connection_info.get("server_version")
+        with self._lock:
+            entry = self.entries.get(server_name)
+            fresh = self._is_fresh(entry, version)
+            if fresh:
+                self.hits += 1
+        if not fresh:
+            # Read the disk cache without holding the catalog lock
+            cached = self._load(server_name)
+            with self._lock:
+                entry = self.entries.get(server_name)
+                fresh = self._is_fresh(entry, version)
+                if not fresh and self._is_fresh(cached, version):
+                    entry, fresh = cached, True
+                    self._install(entry)
+                if fresh:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+
+        if fresh:
+            logger.debug(f"Catalog for {server_name} is current, skipping discovery")
+        else:
+            logger.info(f"Discovering capabilities of {server_name}")
+            entry = {
+                "server": server_name,
+                "version": version,
+                "fetched_at": time.time(),
+            }
+            for kind in CAPABILITY_KINDS:
+                entry[kind] = client.list_capabilities(kind)
+            with self._lock:
+                generation = self._install(entry)
+            self._save(entry, generation)
+
+        for kind in CAPABILITY_KINDS:
+            self._notify(server_name, kind, entry[kind])
+        client.capabilities = {kind: entry[kind] for kind in CAPABILITY_KINDS}
+        return entry
+
+    def handle_notification(self, client: MCPClient, notification: Dict[str, Any]) -> None:
+        """Refetch the listing named by a list_changed notification.
+
+        Suitable for MCPClient.add_notification_handler.
+
+        Args:
+            client: Client that received the notification
+            notification: Notification with a "method" key
+        """
+        kind = LIST_CHANGED_NOTIFICATIONS.get(notification.get("method"))
+        if kind is None:
+            return
+        server_name = client.server_name
+        entries = client.list_capabilities(kind)
+        with self._lock:
+            entry = self.entries.get(server_name)
+            if entry is None:
+                return
+            entry = {**entry, kind: entries, "fetched_at": time.time()}
+            generation = self._install(entry)
+        self._save(entry, generation)
+        client.capabilities = {**client.capabilities, kind: entries}
+        logger.info(f"Updated {kind} listing of {server_name} ({len(entries)} entries)")
+        self._notify(server_name, kind, entries)
+
+    def get(self, server_name: str, kind: str = "tools") -> List[Dict[str, Any]]:
+        """Get a cached listing.
+
+        Args:
+            server_name: Name of the server
+            kind: One of "tools", "resources" or "prompts"
+
+        Returns:
+            List of capability descriptors, empty if unknown
+        """
+        entry = self.entries.get(server_name)
+        return list(entry.get(kind, [])) if entry else []
+
+    def remove(self, server_name: str) -> None:
+        """Drop a server from the in-memory catalog (the disk cache is kept).
+
+        Args:
+            server_name: Name of the server
+        """
+        with self._lock:
+            if self.entries.pop(server_name, None) is None:
+                return
+        for kind in CAPABILITY_KINDS:
+            self._notify(server_name, kind, None)
+
+    def register(self, provider: str, capabilities: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Catalog the capabilities of a local provider (e.g., browser tools).
+
+        Local entries are kept in memory only and left out of snapshots.
+
+        Args:
+            provider: Name the capabilities are listed under
+            capabilities: Dictionary of kinds to capability descriptors
+        """
+        entry = {"server": provider, "version": None, "fetched_at": time.time(), "local": True}
+        for kind in CAPABILITY_KINDS:
+            entry[kind] = list(capabilities.get(kind, []))
+        with self._lock:
+            self._install(entry)
+        for kind in CAPABILITY_KINDS:
+            self._notify(provider, kind, entry[kind])
+
+    def export_entries(self) -> Dict[str, Dict[str, Any]]:
+        """Get all in-memory server entries for a snapshot.
+
+        Returns:
+            Dictionary of server names to catalog entries
+        """
+        with self._lock:
+            return {name: entry for name, entry in self.entries.items()
+                    if not entry.get("local")}
+
+    def restore_entries(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Load entries from a snapshot without notifying listeners.
+
+        Entries are only used once the server reports a matching version at
+        connect time, so stale entries cause a normal rediscovery.
+
+        Args:
+            entries: Dictionary from export_entries()
+        """
+        with self._lock:
+            for server_name, entry in entries.items():
+                self.entries.setdefault(server_name, entry)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get catalog statistics.
+
+        Returns:
+            Dictionary with server count and cache hit/miss counters
+        """
+        with self._lock:
+            return {"servers": len(self.entries), "hits": self.hits, "misses": self.misses}
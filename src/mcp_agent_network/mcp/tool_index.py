@@ -0,0 +1,281 @@
+"""Search index over the tools offered by connected MCP servers."""
+
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Maps a batch of texts to embedding vectors
+Embedder = Callable[[List[str]], Sequence[Sequence[float]]]
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Tool name tokens count more than description tokens
+NAME_WEIGHT = 3
+
+_STOPWORDS = {"a", "an", "and", "the", "of", "to", "for", "in", "on", "with", "via", "or", "is"}
+_CAMEL_CASE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+DocId = Tuple[str, str]
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search tokens.
+
+    Handles snake_case, kebab-case and camelCase identifiers.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of tokens without stopwords
+    """
+    text = _CAMEL_CASE.sub(" ", text).lower()
+    return [token for token in _NON_WORD.split(text) if token and token not in _STOPWORDS]
+
+
+def _schema_text(schema: Optional[Dict[str, Any]]) -> str:
+    """Collect property names and descriptions from an input schema."""
+    if not isinstance(schema, dict):
+        return ""
+    parts = []
+    for name, prop in (schema.get("properties") or {}).items():
+        parts.append(name)
+        if isinstance(prop, dict) and prop.get("description"):
+            parts.append(prop["description"])
+    return " ".join(parts)
+
+
+class ToolIndex:
+    """Inverted keyword index with optional vector search over tools.
+
+    Documents are (server, tool) pairs built from the tool name, description
+    and input schema. Keyword queries are ranked with BM25; when an embedder
+    is configured, a NumPy matrix of normalized embeddings enables cosine
+    similarity and hybrid ranking. Updates are incremental per server.
+    """
+
+    def __init__(self, embedder: Optional[Embedder] = None):
+        """Initialize the index.
+
+        Args:
+            embedder: Optional function mapping texts to embedding vectors
+                (requires numpy)
+        """
+        if embedder is not None and np is None:
+            raise ImportError("numpy is required for vector tool search: pip install numpy")
+        self.embedder = embedder
+        self._postings: Dict[str, Dict[DocId, int]] = {}
+        self._doc_lengths: Dict[DocId, int] = {}
+        self._doc_tokens: Dict[DocId, Counter] = {}
+        self._server_docs: Dict[str, Set[DocId]] = {}
+        self._tools: Dict[DocId, Dict[str, Any]] = {}
+        self._total_length = 0
+        self._vectors = None
+        self._row_of: Dict[DocId, int] = {}
+        self._doc_at: List[DocId] = []
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def update_server(self, server_name: str, tools: Iterable[Dict[str, Any]]) -> None:
+        """Replace the indexed tools of a server.
+
+        Args:
+            server_name: Name of the server
+            tools: Tool descriptors with "name", "description" and "inputSchema"
+        """
+        tools = list(tools)
+        embeddings = None
+        if self.embedder is not None and tools:
+            texts = [f"{tool['name']} {tool.get('description', '')}" for tool in tools]
+            embeddings = np.asarray(self.embedder(texts), dtype=np.float32)
+
+        with self._lock:
+            self._remove_server(server_name)
+            docs = set()
+            for i, tool in enumerate(tools):
+                doc_id = (server_name, tool["name"])
+                tokens = Counter()
+                for token in tokenize(tool["name"]):
+                    tokens[token] += NAME_WEIGHT
+                tokens.update(tokenize(tool.get("description") or ""))
+                tokens.update(tokenize(_schema_text(tool.get("inputSchema"))))
+
+                for token, count in tokens.items():
+                    self._postings.setdefault(token, {})[doc_id] = count
+                length = sum(tokens.values())
+                self._doc_lengths[doc_id] = length
+                self._doc_tokens[doc_id] = tokens
+                self._total_length += length
+                self._tools[doc_id] = tool
+                docs.add(doc_id)
+                if embeddings is not None:
+                    self._add_vector(doc_id, embeddings[i])
+            self._server_docs[server_name] = docs
+        logger.debug(f"Indexed {len(tools)} tools from {server_name}")
+
+    def remove_server(self, server_name: str) -> None:
+        """Remove all tools of a server from the index.
+
+        Args:
+            server_name: Name of the server
+        """
+        with self._lock:
+            self._remove_server(server_name)
+
+    def _remove_server(self, server_name: str) -> None:
+        """Remove a server's documents (lock held)."""
+        for doc_id in self._server_docs.pop(server_name, set()):
+            for token in self._doc_tokens.pop(doc_id):
+                postings = self._postings[token]
+                del postings[doc_id]
+                if not postings:
+                    del self._postings[token]
+            self._total_length -= self._doc_lengths.pop(doc_id)
+            del self._tools[doc_id]
+            if doc_id in self._row_of:
+                self._remove_vector(doc_id)
+
+    def _add_vector(self, doc_id: DocId, vector: Any) -> None:
+        """Append a normalized embedding row (lock held)."""
+        norm = float(np.linalg.norm(vector))
+        vector = vector / norm if norm > 0 else vector
+        if self._vectors is None:
+            self._vectors = np.zeros((16, vector.shape[0]), dtype=np.float32)
+        elif len(self._doc_at) == self._vectors.shape[0]:
+            grown = np.zeros((self._vectors.shape[0] * 2, self._vectors.shape[1]), dtype=np.float32)
+            grown[:len(self._doc_at)] = self._vectors
+            self._vectors = grown
+        row = len(self._doc_at)
+        self._vectors[row] = vector
+        self._row_of[doc_id] = row
+        self._doc_at.append(doc_id)
+
+    def _remove_vector(self, doc_id: DocId) -> None:
+        """Remove an embedding row by moving the last row into its place (lock held)."""
+        row = self._row_of.pop(doc_id)
+        last = len(self._doc_at) - 1
+        if row != last:
+            moved = self._doc_at[last]
+            self._vectors[row] = self._vectors[last]
+            self._doc_at[row] = moved
+            self._row_of[moved] = row
+        self._doc_at.pop()
+
+    def on_catalog_change(self, server_name: str, kind: str,
+                          entries: Optional[List[Dict[str, Any]]]) -> None:
+        """Keep the index in sync with a ToolCatalog (catalog listener).
+
+        Args:
+            server_name: Name of the server
+            kind: Capability kind that changed
+            entries: New listing, or None if the server was removed
+        """
+        if kind != "tools":
+            return
+        if entries is None:
+            self.remove_server(server_name)
+        else:
+            self.update_server(server_name, entries)
+
+    def _keyword_scores(self, query: str, servers: Optional[Set[str]]) -> Dict[DocId, float]:
+        """Score documents against a query with BM25 (lock held)."""
+        doc_count = len(self._doc_lengths)
+        if doc_count == 0:
+            return {}
+        avg_length = self._total_length / doc_count
+        scores: Dict[DocId, float] = {}
+        for token in set(tokenize(query)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                if servers is not None and doc_id[0] not in servers:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    def _vector_scores(self, query: str, limit: int,
+                       servers: Optional[Set[str]]) -> Dict[DocId, float]:
+        """Score documents by cosine similarity to the query embedding."""
+        if self.embedder is None or not self._doc_at:
+            return {}
+        query_vector = np.asarray(self.embedder([query])[0], dtype=np.float32)
+        norm = float(np.linalg.norm(query_vector))
+        if norm == 0:
+            return {}
+        with self._lock:
+            count = len(self._doc_at)
+            similarities = self._vectors[:count] @ (query_vector / norm)
+            doc_at = list(self._doc_at)
+        if servers is not None:
+            mask = np.fromiter((doc_id[0] in servers for doc_id in doc_at), dtype=bool, count=count)
+            similarities = np.where(mask, similarities, -np.inf)
+        k = min(limit, count)
+        top = np.argpartition(-similarities, k - 1)[:k]
+        return {
+            doc_at[row]: float(similarities[row])
+            for row in top if np.isfinite(similarities[row]) and similarities[row] > 0
+        }
+
+    def search(self, query: str, limit: int = 5, mode: Optional[str] = None,
+               servers: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """Find the tools most relevant to a query.
+
+        Args:
+            query: Free-text query (e.g., a task description)
+            limit: Maximum number of results
+            mode: "keyword", "vector" or "hybrid"; defaults to hybrid when an
+                embedder is configured and keyword otherwise
+            servers: Optional set of server names to restrict the search to
+
+        Returns:
+            List of dictionaries with "server", "tool", "score" and the tool
+            "descriptor", best match first
+        """
+        mode = mode or ("hybrid" if self.embedder is not None else "keyword")
+        if mode not in ("keyword", "vector", "hybrid"):
+            raise ValueError(f"Unknown search mode: {mode}")
+
+        keyword: Dict[DocId, float] = {}
+        if mode != "vector":
+            with self._lock:
+                keyword = self._keyword_scores(query, servers)
+        vector = self._vector_scores(query, limit, servers) if mode != "keyword" else {}
+
+        if mode == "keyword":
+            scores = keyword
+        elif mode == "vector":
+            scores = vector
+        else:
+            # Normalize BM25 to [0, 1] before blending with cosine similarity
+            top_keyword = max(keyword.values(), default=0.0) or 1.0
+            scores = {
+                doc_id: 0.5 * keyword.get(doc_id, 0.0) / top_keyword + 0.5 * vector.get(doc_id, 0.0)
+                for doc_id in set(keyword) | set(vector)
+            }
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        with self._lock:
+            return [
+                {"server": doc_id[0], "tool": doc_id[1], "score": score,
+                 "descriptor": self._tools[doc_id]}
+                for doc_id, score in best if doc_id in self._tools
+            ]
@@ -0,0 +1,297 @@
+"""Traffic recording and replay for performance testing."""
+
+import gzip
+import json
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, IO, Iterator, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Operations captured in a trace
+OPERATIONS = ("connect", "send_message", "broadcast_message")
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    """Open a trace file, gzip-compressed if the path ends in .gz."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class TrafficRecorder:
+    """Records manager operations and their timing to a JSON Lines trace.
+
+    Each record holds the operation, its start offset from the beginning of
+    the recording, its duration, the server, and (optionally) the message
+    and response. Message durations are wire time only, without local
+    queueing, and broadcasts also record the duration of each server. Traces written to a ``.gz`` path are gzip-compressed.
+    """
+
+    def __init__(self, path: str, include_payloads: bool = True):
+        """Initialize the recorder.
+
+        Args:
+            path: Trace file to write
+            include_payloads: Whether to record message and response bodies
+                (required for replay)
+        """
+        self.path = path
+        self.include_payloads = include_payloads
+        self.records = 0
+        self._file = _open(path, "w")
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, op: str, server: Optional[str], start: float, duration: float,
+               message: Optional[Dict[str, Any]] = None, response: Any = None,
+               durations: Optional[Dict[str, float]] = None) -> None:
+        """Append an operation to the trace.
+
+        Args:
+            op: One of "connect", "send_message" or "broadcast_message"
+            server: Server name, or None for broadcasts
+            start: Start time from time.perf_counter()
+            duration: Duration in seconds
+            message: Message that was sent
+            response: Response (dictionary of responses for broadcasts)
+            durations: Per-server durations in seconds (broadcasts)
+        """
+        entry: Dict[str, Any] = {
+            "op": op,
+            "t": round(start - self._origin, 6),
+            "duration": round(duration, 6),
+            "server": server,
+        }
+        if durations is not None:
+            entry["durations"] = {name: round(value, 6) for name, value in durations.items()}
+        if self.include_payloads:
+            entry["message"] = message
+            entry["response"] = response
+        line = json.dumps(entry, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self.records += 1
+
+    def close(self) -> None:
+        """Flush and close the trace file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        logger.info(f"Recorded {self.records} operations to {self.path}")
+
+
+def load_trace(path: str) -> Iterator[Dict[str, Any]]:
+    """Read the records of a trace.
+
+    Args:
+        path: Trace file written by TrafficRecorder
+
+    Returns:
+        Iterator over trace records in recording order
+    """
+    with _open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class StandInServer:
+    """Local stand-in answering with the responses recorded in a trace.
+
+    Responses are matched by server and message content, so replays are
+    deterministic however concurrent operations interleave; identical
+    messages get their responses in recording order. With latency
+    simulation enabled, each response is delayed by the recorded duration
+    divided by the replay speed.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], speed: float = 1.0,
+                 simulate_latency: bool = True):
+        """Initialize the stand-in server.
+
+        Args:
+            records: Trace records
+            speed: Replay speed factor (2.0 replays twice as fast)
+            simulate_latency: Whether to delay responses by the recorded duration
+        """
+        self.speed = speed
+        self.simulate_latency = simulate_latency
+        self._responses: Dict[Tuple[str, str], Deque] = {}
+        for record in records:
+            key = _message_key(record.get("message"))
+            if record["op"] == "send_message":
+                self._responses.setdefault((record["server"], key), deque()).append(
+                    (record.get("response"), record["duration"])
+                )
+            elif record["op"] == "broadcast_message":
+                durations = record.get("durations") or {}
+                for server, response in (record.get("response") or {}).items():
+                    self._responses.setdefault((server, key), deque()).append(
+                        (response, durations.get(server, record["duration"]))
+                    )
+        self._lock = threading.Lock()
+
+    def transmitter(self, server_name: str) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """Get a transmit function answering for one server.
+
+        Args:
+            server_name: Name of the server
+
+        Returns:
+            Function suitable as MCPClient._transmit
+        """
+        def transmit(message: Dict[str, Any]) -> Dict[str, Any]:
+            with self._lock:
+                queue = self._responses.get((server_name, _message_key(message)))
+                recorded = queue.popleft() if queue else None
+            if recorded is None:
+                return {"status": "delivered", "server": server_name, "timestamp": time.time()}
+            response, duration = recorded
+            if self.simulate_latency and self.speed > 0 and duration > 0:
+                time.sleep(duration / self.speed)
+            return response or {"status": "delivered", "server": server_name}
+
+        return transmit
+
+
+def _message_key(message: Optional[Dict[str, Any]]) -> str:
+    """Get a canonical key for matching replayed messages to recorded ones."""
+    return json.dumps(_without_deadline(message), sort_keys=True, separators=(",", ":"),
+                      default=str)
+
+
+def _without_deadline(message: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Drop the absolute deadline, which has always passed by replay time."""
+    if not message or "deadline" not in message:
+        return message
+    return {key: value for key, value in message.items() if key != "deadline"}
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Get a percentile from sorted values (nearest rank)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class TrafficReplayer:
+    """Replays a recorded trace against a connection manager.
+
+    Operations are issued at their recorded offsets divided by the speed
+    factor (speed 0 issues them as fast as possible), on a thread pool so
+    operations that overlapped in the recording overlap again. Messages wait
+    for the connects recorded before them. Clients are answered by a
+    StandInServer.
+    """
+
+    def __init__(self, manager: Any, speed: float = 1.0, max_workers: int = 32,
+                 simulate_latency: bool = True):
+        """Initialize the replayer.
+
+        Args:
+            manager: MCPConnectionManager to replay against
+            speed: Replay speed factor; 1.0 is real time, 0 means no pacing
+            max_workers: Maximum number of concurrent operations
+            simulate_latency: Whether the stand-in server reproduces recorded
+                response times
+        """
+        self.manager = manager
+        self.speed = speed
+        self.max_workers = max_workers
+        self.simulate_latency = simulate_latency
+
+    def _run(self, record: Dict[str, Any], after: List[Future]) -> Dict[str, Any]:
+        """Issue one recorded operation and time it."""
+        # Messages never overtake the connects recorded before them
+        for future in after:
+            future.result()
+        start = time.perf_counter()
+        op = record["op"]
+        if op == "connect":
+            results = self.manager.connect_to_servers([record["server"]], show_progress=False)
+            ok = results.get(record["server"], {}).get("success", False)
+        elif op == "send_message":
+            response = self.manager.send_message(record["server"],
+                                                 _without_deadline(record.get("message")) or {})
+            ok = response.get("status") not in ("failed", "rejected")
+        else:
+            responses = self.manager.broadcast_message(_without_deadline(record.get("message")) or {})
+            ok = all(r.get("status") not in ("failed", "rejected") for r in responses.values())
+        return {"op": op, "latency": time.perf_counter() - start, "ok": ok}
+
+    def replay(self, path: str) -> Dict[str, Any]:
+        """Replay a trace and measure the result.
+
+        Args:
+            path: Trace file written by TrafficRecorder
+
+        Returns:
+            Dictionary with operation count, errors, elapsed time, throughput
+            and per-operation latency percentiles (milliseconds)
+        """
+        records = [record for record in load_trace(path) if record["op"] in OPERATIONS]
+        stand_in = StandInServer(records, self.speed, self.simulate_latency)
+        servers = set()
+        for record in records:
+            if record["op"] == "broadcast_message":
+                servers.update(record.get("response") or {})
+            elif record["server"]:
+                servers.add(record["server"])
+        for server_name in sorted(servers):
+            self.manager.add_server(server_name)
+            self.manager.clients[server_name]._transmit = stand_in.transmitter(server_name)
+
+        # Traces started after connecting carry no connect records
+        connected_in_trace = {record["server"] for record in records if record["op"] == "connect"}
+        missing = sorted(servers - connected_in_trace)
+        if missing:
+            self.manager.connect_to_servers(missing, show_progress=False)
+
+        logger.info(f"Replaying {len(records)} operations from {path} at {self.speed}x")
+        origin = time.perf_counter()
+        futures = []
+        connects: Dict[str, Future] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for record in records:
+                if self.speed > 0:
+                    delay = record["t"] / self.speed - (time.perf_counter() - origin)
+                    if delay > 0:
+                        time.sleep(delay)
+                if record["op"] == "broadcast_message":
+                    after = list(connects.values())
+                else:
+                    after = [connects[record["server"]]] if record["server"] in connects else []
+                future = executor.submit(self._run, record, after)
+                if record["op"] == "connect":
+                    connects[record["server"]] = future
+                futures.append(future)
+            outcomes = [future.result() for future in futures]
+        elapsed = time.perf_counter() - origin
+
+        latencies: Dict[str, List[float]] = {}
+        for outcome in outcomes:
+            latencies.setdefault(outcome["op"], []).append(outcome["latency"])
+        return {
+            "operations": len(outcomes),
+            "errors": sum(1 for outcome in outcomes if not outcome["ok"]),
+            "elapsed": elapsed,
+            "throughput": len(outcomes) / elapsed if elapsed > 0 else 0.0,
+            "latency_ms": {
+                op: {
+                    "p50": _percentile(values, 0.5) * 1000,
+                    "p95": _percentile(values, 0.95) * 1000,
+                    "p99": _percentile(values, 0.99) * 1000,
+                    "max": values[-1] * 1000,
+                }
+                for op, values in ((op, sorted(values)) for op, values in latencies.items())
+            },
+        }
@@ -0,0 +1,194 @@
+"""Background warm-up of configured MCP servers."""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from mcp_agent_network.mcp.events import PROGRESS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class WarmUp:
+    """Pre-connects servers in the background so the first task does not pay
+    for handshakes.
+
+    Hot servers are connected first, as their own wave, then the remaining
+    servers. Each connected server has its capabilities cataloged and its
+    tool schema validators compiled (both done by the manager's connect
+    path) and a ping sent to seed its latency statistics; servers that were
+    already connected, or connecting elsewhere, are not connected or primed
+    again. ``wait_hot()`` and ``wait()`` act as readiness probes for the hot
+    wave and the whole warm-up. The warm-up ends "ready", or "degraded" when
+    some servers failed to connect (listed under "failed" in the status), or
+    "stopped" when stop() cancelled the servers it had not connected yet.
+    """
+
+    def __init__(self, manager: Any, server_names: Iterable[str],
+                 hot: Iterable[str] = ()):
+        """Initialize the warm-up.
+
+        Args:
+            manager: MCPConnectionManager holding the servers
+            server_names: Servers to warm up
+            hot: Servers to warm up first
+        """
+        self.manager = manager
+        hot = set(hot)
+        server_names = list(server_names)
+        self.hot = [name for name in server_names if name in hot]
+        self.rest = [name for name in server_names if name not in hot]
+        self.servers: Dict[str, str] = {name: "pending" for name in server_names}
+        self.state = "pending"
+        self.started_at: Optional[float] = None
+        self.elapsed: Optional[float] = None
+        self._hot_ready = threading.Event()
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start warming up in a background thread."""
+        if self._thread is not None:
+            return
+        self.state = "running"
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="warm-up", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """Stop the warm-up and wait for its thread to finish.
+
+        Handshakes already under way complete; servers not connected yet
+        are left alone and marked "cancelled".
+
+        Args:
+            timeout: Maximum time to wait in seconds, or None to wait forever
+
+        Returns:
+            True if the warm-up thread has finished
+        """
+        self._stop.set()
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _run(self) -> None:
+        """Warm up hot servers, then the rest."""
+        try:
+            self._warm(self.hot)
+            self._hot_ready.set()
+            self._warm(self.rest)
+        except Exception as e:
+            logger.error(f"Warm-up failed: {e}")
+        finally:
+            self.elapsed = time.monotonic() - self.started_at
+            stopped = self._stop.is_set()
+            with self._lock:
+                # Servers an aborted warm-up never reached count as failed
+                for server_name, state in self.servers.items():
+                    if state == "pending":
+                        self.servers[server_name] = "cancelled" if stopped else "failed"
+            failed = self.failed_servers()
+            if stopped:
+                self.state = "stopped"
+            else:
+                self.state = "degraded" if failed else "ready"
+            self._hot_ready.set()
+            self._ready.set()
+            if failed:
+                logger.warning(f"Warm-up finished in {self.elapsed:.3f}s; "
+                               f"failed servers: {', '.join(failed)}")
+            else:
+                logger.info(f"Warm-up finished in {self.elapsed:.3f}s")
+
+    def _warm(self, server_names: List[str]) -> None:
+        """Connect a wave of servers and prime their caches."""
+        if not server_names or self._stop.is_set():
+            return
+        # Connects already done or in progress elsewhere are not repeated
+        results = self.manager.connect_to_servers(server_names, show_progress=False,
+                                                  cancel=self._stop)
+        for server_name in server_names:
+            result = results.get(server_name, {})
+            if (result.get("info") or {}).get("cancelled"):
+                continue
+            success = result.get("success", False)
+            warmed_elsewhere = result.get("already_connected") or result.get("already_connecting")
+            client = self.manager.get_client(server_name)
+            if success and client is not None and not warmed_elsewhere:
+                self._prime(client)
+            with self._lock:
+                self.servers[server_name] = "ready" if success else "failed"
+            self.manager.events.publish(PROGRESS, "warm_up", server=server_name, success=success,
+                                        completed=self._completed(), total=len(self.servers))
+
+    def _prime(self, client: Any) -> None:
+        """Seed latency statistics."""
+        client.ping()
+
+    def _completed(self) -> int:
+        """Count servers whose warm-up has finished."""
+        with self._lock:
+            return sum(1 for state in self.servers.values() if state != "pending")
+
+    def failed_servers(self) -> List[str]:
+        """Get the servers that failed to warm up."""
+        with self._lock:
+            return [name for name, state in self.servers.items() if state == "failed"]
+
+    def is_ready(self) -> bool:
+        """Check whether the warm-up has finished."""
+        return self._ready.is_set()
+
+    def wait_hot(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the hot servers to be warmed up.
+
+        Args:
+            timeout: Maximum time to wait in seconds, or None to wait forever
+
+        Returns:
+            True if the hot servers are warm
+        """
+        return self._hot_ready.wait(timeout)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the warm-up to finish.
+
+        Args:
+            timeout: Maximum time to wait in seconds, or None to wait forever
+
+        Returns:
+            True if the warm-up has finished
+        """
+        return self._ready.wait(timeout)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the readiness of the warm-up.
+
+        Returns:
+            Dictionary with state ("pending", "running", "ready",
+            "degraded" or "stopped"), hot/overall readiness, per-server states, failed
+            servers and elapsed time in seconds
+        """
+        with self._lock:
+            servers = dict(self.servers)
+        if self.elapsed is not None:
+            elapsed = self.elapsed
+        elif self.started_at is not None:
+            elapsed = time.monotonic() - self.started_at
+        else:
+            elapsed = 0.0
+        return {
+            "state": self.state,
+            "ready": self._ready.is_set(),
+            "hot_ready": self._hot_ready.is_set(),
+            "hot": list(self.hot),
+            "servers": servers,
+            "failed": [name for name, state in servers.items() if state == "failed"],
+            "elapsed": round(elapsed, 6),
+        }
@@ -1 +1,11 @@
-"""Upsonic-based orchestration components.""" 
\ No newline at end of file
+"""Upsonic-based orchestration components."""
+
+from mcp_agent_network.orchestration.workflow import (
+    StepRef,
+    Workflow,
+    WorkflowEngine,
+    WorkflowStep,
+    ref,
+)
+
+__all__ = ["StepRef", "Workflow", "WorkflowEngine", "WorkflowStep", "ref"]
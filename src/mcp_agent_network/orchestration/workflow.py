@@ -0,0 +1,404 @@
+"""DAG workflow engine for multi-step agent jobs."""
+
+import hashlib
+import heapq
+import json
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+STEP_KINDS = ("tool", "chat", "browser", "function")
+
+# Steps with side effects on MCP servers are not memoized unless asked to
+UNCACHED_KINDS = ("tool", "chat")
+
+# Maximum number of memoized step results kept by an engine
+DEFAULT_CACHE_SIZE = 1024
+
+
+class StepRef:
+    """Reference to (part of) the output of an upstream step.
+
+    References are resolved when the step runs, so outputs are handed over
+    as the same Python objects without being serialized in between.
+    """
+
+    def __init__(self, step: str, *path: Any):
+        """Initialize the reference.
+
+        Args:
+            step: Name of the upstream step
+            *path: Optional keys/indices to select inside the output
+        """
+        self.step = step
+        self.path = path
+
+    def resolve(self, results: Dict[str, Any]) -> Any:
+        """Resolve the reference against completed step outputs."""
+        value = results[self.step]
+        for key in self.path:
+            value = value[key]
+        return value
+
+    def __repr__(self) -> str:
+        return f"StepRef({self.step!r}, *{self.path!r})"
+
+
+def ref(step: str, *path: Any) -> StepRef:
+    """Create a reference to the output of an upstream step.
+
+    Args:
+        step: Name of the upstream step
+        *path: Optional keys/indices to select inside the output
+
+    Returns:
+        StepRef instance
+    """
+    return StepRef(step, *path)
+
+
+class WorkflowStep:
+    """Single step in a workflow DAG."""
+
+    def __init__(self, name: str, kind: str, params: Optional[Dict[str, Any]] = None,
+                 depends_on: Optional[List[str]] = None, server: Optional[str] = None,
+                 func: Optional[Callable[..., Any]] = None, cost: float = 1.0,
+                 cacheable: Optional[bool] = None):
+        """Initialize the workflow step.
+
+        Args:
+            name: Unique name of the step
+            kind: One of "tool", "chat", "browser" or "function"
+            params: Step parameters; values may be StepRef instances
+            depends_on: Names of steps that must complete first (steps
+                referenced through StepRef are added automatically)
+            server: MCP server for "tool" and "chat" steps (chat steps
+                broadcast when no server is given)
+            func: Callable for "function" steps, called with resolved params
+            cost: Estimated relative duration, used for critical-path scheduling
+            cacheable: Whether the result may be memoized; defaults to False
+                for "tool" and "chat" steps and True otherwise
+        """
+        if kind not in STEP_KINDS:
+            raise ValueError(f"Unknown step kind: {kind}")
+        if kind == "function" and func is None:
+            raise ValueError(f"Function step {name} requires a callable")
+        self.name = name
+        self.kind = kind
+        self.params = params or {}
+        self.server = server
+        self.func = func
+        self.cost = cost
+        self.cacheable = kind not in UNCACHED_KINDS if cacheable is None else cacheable
+        self.depends_on = list(depends_on or [])
+        for value in _iter_refs(self.params):
+            if value.step not in self.depends_on:
+                self.depends_on.append(value.step)
+
+
+def _iter_refs(value: Any):
+    """Yield all StepRef instances nested in a parameter structure."""
+    if isinstance(value, StepRef):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_refs(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_refs(item)
+
+
+def _resolve(value: Any, results: Dict[str, Any]) -> Any:
+    """Replace StepRef instances in a parameter structure with their values."""
+    if isinstance(value, StepRef):
+        return value.resolve(results)
+    if isinstance(value, dict):
+        return {key: _resolve(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, results) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_resolve(item, results) for item in value)
+    return value
+
+
+class Workflow:
+    """Directed acyclic graph of workflow steps."""
+
+    def __init__(self, name: str = "workflow"):
+        """Initialize an empty workflow.
+
+        Args:
+            name: Name of the workflow
+        """
+        self.name = name
+        self.steps: Dict[str, WorkflowStep] = {}
+
+    def add_step(self, name: str, kind: str, **kwargs: Any) -> WorkflowStep:
+        """Add a step to the workflow.
+
+        Args:
+            name: Unique name of the step
+            kind: One of "tool", "chat", "browser" or "function"
+            **kwargs: Additional WorkflowStep arguments
+
+        Returns:
+            The created WorkflowStep
+        """
+        if name in self.steps:
+            raise ValueError(f"Duplicate step name: {name}")
+        step = WorkflowStep(name, kind, **kwargs)
+        self.steps[name] = step
+        return step
+
+    def successors(self) -> Dict[str, List[str]]:
+        """Get the downstream steps of every step."""
+        successors: Dict[str, List[str]] = {name: [] for name in self.steps}
+        for step in self.steps.values():
+            for dependency in step.depends_on:
+                successors[dependency].append(step.name)
+        return successors
+
+    def validate(self) -> List[str]:
+        """Check the DAG and return its steps in topological order.
+
+        Returns:
+            Step names in topological order
+
+        Raises:
+            ValueError: If a dependency is missing or the graph has a cycle
+        """
+        for step in self.steps.values():
+            for dependency in step.depends_on:
+                if dependency not in self.steps:
+                    raise ValueError(f"Step {step.name} depends on unknown step {dependency}")
+
+        successors = self.successors()
+        in_degree = {name: len(step.depends_on) for name, step in self.steps.items()}
+        order = []
+        ready = [name for name, degree in in_degree.items() if degree == 0]
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for successor in successors[name]:
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    ready.append(successor)
+        if len(order) != len(self.steps):
+            raise ValueError(f"Workflow {self.name} contains a cycle")
+        return order
+
+    def critical_path_ranks(self) -> Dict[str, float]:
+        """Get the length of the longest path from each step to a sink.
+
+        Steps with a higher rank lie on longer chains and are scheduled first.
+
+        Returns:
+            Dictionary of step names to ranks
+        """
+        successors = self.successors()
+        ranks: Dict[str, float] = {}
+        for name in reversed(self.validate()):
+            downstream = max((ranks[successor] for successor in successors[name]), default=0.0)
+            ranks[name] = self.steps[name].cost + downstream
+        return ranks
+
+
+class WorkflowEngine:
+    """Runs workflow DAGs through the agent network.
+
+    Independent branches run concurrently, ready steps are dispatched in
+    critical-path order, and step results are memoized by a key derived from
+    the step definition and the keys of its inputs, so re-running a workflow
+    skips steps whose inputs did not change. Uncached steps may return
+    something different on every run, so their keys also cover their output. Function steps are keyed by the
+    identity of their callable, so distinct lambdas and closures never share
+    results. The memo is bounded and evicts least recently used results.
+    """
+
+    def __init__(self, network: Any, max_workers: int = 8,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        """Initialize the workflow engine.
+
+        Args:
+            network: AgentNetwork used to execute steps
+            max_workers: Maximum number of steps running concurrently
+            cache_size: Maximum number of memoized step results
+        """
+        self.network = network
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        # Key -> (callable, result); the callable is held so its id stays unique
+        self.cache: "OrderedDict[str, Tuple[Any, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def clear_cache(self) -> None:
+        """Forget all memoized step results."""
+        with self._cache_lock:
+            self.cache.clear()
+
+    def _cache_get(self, key: str, step: WorkflowStep, results: Dict[str, Any]) -> bool:
+        """Copy a memoized result into results if one exists for the step."""
+        with self._cache_lock:
+            entry = self.cache.get(key)
+            if entry is None or entry[0] is not step.func:
+                return False
+            self.cache.move_to_end(key)
+            results[step.name] = entry[1]
+            return True
+
+    def _cache_put(self, key: str, step: WorkflowStep, result: Any) -> None:
+        """Memoize a step result, evicting the least recently used ones."""
+        with self._cache_lock:
+            self.cache[key] = (step.func, result)
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def _step_key(self, step: WorkflowStep, keys: Dict[str, str]) -> str:
+        """Compute the memoization key of a step from its definition and inputs."""
+        def encode(value: Any) -> Any:
+            if isinstance(value, StepRef):
+                return {"$ref": keys[value.step], "path": list(value.path)}
+            if isinstance(value, dict):
+                return {str(key): encode(item) for key, item in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [encode(item) for item in value]
+            return value
+
+        payload = {
+            "kind": step.kind,
+            "server": step.server,
+            # Identity, not __qualname__: every lambda is "<lambda>"
+            "func": id(step.func) if step.func is not None else None,
+            "params": encode(step.params),
+            "inputs": sorted(keys[dependency] for dependency in step.depends_on),
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=repr)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _output_key(self, key: str, result: Any) -> str:
+        """Extend the key of an uncached step with the output it produced."""
+        encoded = json.dumps({"key": key, "result": result}, sort_keys=True, default=repr)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _execute_step(self, step: WorkflowStep, results: Dict[str, Any]) -> Any:
+        """Run a single step with its resolved parameters."""
+        params = _resolve(step.params, results)
+        manager = self.network.mcp_connection_manager
+        # Workflow steps are batch work and yield to interactive traffic
+        options = self.network.request_options("bulk")
+
+        if step.kind == "function":
+            return step.func(**params)
+        if step.kind == "browser":
+            response = self.network.call_browser_tool(params["tool"], params.get("arguments", {}))
+            if response.get("status") != "success":
+                raise RuntimeError(response.get("error", "Browser tool failed"))
+            return response["result"]
+
+        if step.kind == "tool":
+            if step.server is None:
+                raise ValueError(f"Tool step {step.name} requires a server")
+            response = manager.call_tool(step.server, params["tool"], params.get("arguments", {}),
+                                         **options)
+        else:
+            message = {
+                "type": "chat",
+                "agent_id": params.get("agent_id"),
+                "content": params.get("content"),
+            }
+            if step.server is None:
+                return manager.broadcast_message(message, **options)
+            response = manager.send_message(step.server, message, **options)
+
+        if response.get("status") in ("failed", "rejected"):
+            raise RuntimeError(response.get("error", "Message failed"))
+        return response
+
+    def run(self, workflow: Workflow) -> Dict[str, Any]:
+        """Run a workflow.
+
+        Args:
+            workflow: Workflow to run
+
+        Returns:
+            Dictionary with "status", step "results", step "errors",
+            "skipped" steps (downstream of failures) and "cached" steps
+        """
+        ranks = workflow.critical_path_ranks()
+        successors = workflow.successors()
+        remaining = {name: len(step.depends_on) for name, step in workflow.steps.items()}
+
+        results: Dict[str, Any] = {}
+        keys: Dict[str, str] = {}
+        errors: Dict[str, str] = {}
+        cached: List[str] = []
+        skipped: Set[str] = set()
+
+        ready: List = []
+        for name, count in remaining.items():
+            if count == 0:
+                heapq.heappush(ready, (-ranks[name], name))
+
+        def complete(name: str) -> None:
+            for successor in successors[name]:
+                remaining[successor] -= 1
+                if remaining[successor] == 0 and successor not in skipped:
+                    heapq.heappush(ready, (-ranks[successor], successor))
+
+        def skip_descendants(name: str) -> None:
+            for successor in successors[name]:
+                if successor not in skipped:
+                    skipped.add(successor)
+                    skip_descendants(successor)
+
+        logger.info(f"Running workflow {workflow.name} with {len(workflow.steps)} steps")
+        running: Dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while ready or running:
+                # Dispatch ready steps, longest remaining path first
+                while ready and len(running) < self.max_workers:
+                    _, name = heapq.heappop(ready)
+                    step = workflow.steps[name]
+                    keys[name] = self._step_key(step, keys)
+                    hit = step.cacheable and self._cache_get(keys[name], step, results)
+                    if hit:
+                        logger.debug(f"Workflow step {name} served from cache")
+                        cached.append(name)
+                        complete(name)
+                        continue
+                    running[executor.submit(self._execute_step, step, dict(results))] = name
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        logger.error(f"Workflow step {name} failed: {e}")
+                        errors[name] = str(e)
+                        skip_descendants(name)
+                        continue
+                    if workflow.steps[name].cacheable:
+                        self._cache_put(keys[name], workflow.steps[name], results[name])
+                    else:
+                        # Downstream keys must change when this output does
+                        keys[name] = self._output_key(keys[name], results[name])
+                    complete(name)
+
+        status = "completed" if not errors else "failed"
+        logger.info(f"Workflow {workflow.name} {status}")
+        return {
+            "status": status,
+            "results": results,
+            "errors": errors,
+            "skipped": sorted(skipped),
+            "cached": cached,
+        }
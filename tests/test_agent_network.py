@@ -3,6 +3,7 @@
 import pytest
 from mcp_agent_network import AgentNetwork
 from mcp_agent_network.mcp import MCPConnectionManager
+from mcp_agent_network.orchestration import WorkflowEngine
 
 
 def test_agent_network_init():
@@ -10,7 +11,7 @@ def test_agent_network_init():
     network = AgentNetwork()
     assert network.config == {}
     assert isinstance(network.mcp_connection_manager, MCPConnectionManager)
-    assert network.orchestrator is None
+    assert isinstance(network.orchestrator, WorkflowEngine)
     assert network.browser_tools is None
 
 
@@ -21,6 +22,15 @@ def test_agent_network_with_config():
     assert network.config == config
 
 
+def test_servers_configured_without_options():
+    """Test that servers with an empty config entry are still added."""
+    network = AgentNetwork({"mcp_servers": {"glama": None, "smithery": {"trusted": True}}})
+    clients = network.mcp_connection_manager.clients
+    assert set(clients) == {"glama", "smithery"}
+    assert clients["glama"].validate_schemas
+    assert not clients["smithery"].validate_schemas
+
+
 def test_connect_to_servers():
     """Test connecting to servers."""
     network = AgentNetwork()
@@ -57,4 +67,16 @@ def test_chat_with_agent():
     response = network.chat_with_agent(agent_id, message)
     
     assert "Message sent to agent" in response
-    assert agent_id in response 
\ No newline at end of file
+    assert agent_id in response 
+
+def test_reload_config():
+    """Test hot-reloading the server configuration."""
+    network = AgentNetwork({"mcp_servers": {"glama": {}, "smithery": {}}})
+    network.connect_to_servers(["glama", "smithery"], show_progress=False)
+    
+    summary = network.reload_config({"mcp_servers": {"glama": {}, "local": {}}})
+    
+    assert summary["added"] == ["local"]
+    assert summary["removed"] == ["smithery"]
+    assert summary["unchanged"] == ["glama"]
+    assert sorted(network.mcp_connection_manager.get_connected_servers()) == ["glama", "local"]
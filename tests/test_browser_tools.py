@@ -0,0 +1,284 @@
+"""Tests for the pooled browser tools."""
+
+import sys
+import threading
+import time
+import types
+
+import pytest
+from mcp_agent_network import AgentNetwork
+from mcp_agent_network.browser import (
+    BrowserContextPool,
+    BrowserDriver,
+    BrowserTools,
+    PlaywrightDriver,
+)
+
+
+class FakePageDriver(BrowserDriver):
+    """In-process page driver that records browser operations."""
+
+    def __init__(self, memory_per_use=0, delay=0.0):
+        self.launches = 0
+        self.contexts_created = 0
+        self.contexts_closed = 0
+        self.memory_per_use = memory_per_use
+        self.delay = delay
+        self.active_per_host = {}
+        self.max_active_per_host = {}
+        self._lock = threading.Lock()
+
+    def launch(self):
+        self.launches += 1
+
+    def new_context(self):
+        with self._lock:
+            self.contexts_created += 1
+            return {"id": self.contexts_created, "memory": 0}
+
+    def new_page(self, context):
+        return {"context": context, "url": None}
+
+    def goto(self, page, url):
+        host = url.split("/")[2]
+        with self._lock:
+            self.active_per_host[host] = self.active_per_host.get(host, 0) + 1
+            self.max_active_per_host[host] = max(
+                self.max_active_per_host.get(host, 0), self.active_per_host[host]
+            )
+        time.sleep(self.delay)
+        with self._lock:
+            self.active_per_host[host] -= 1
+        if "fail" in url:
+            raise RuntimeError("navigation failed")
+        page["url"] = url
+        page["context"]["memory"] += self.memory_per_use
+        return {"url": url, "title": f"Title of {url}"}
+
+    def content(self, page):
+        return f"<html>{page['url']}</html>"
+
+    def evaluate(self, page, script):
+        return len(script)
+
+    def context_memory(self, context):
+        return context["memory"]
+
+    def close_context(self, context):
+        self.contexts_closed += 1
+
+    def close(self):
+        self.launches -= 1
+
+
+def test_browser_tools_reuse_warm_contexts():
+    """Test that tool calls reuse a single launched browser and context."""
+    driver = FakePageDriver()
+    tools = BrowserTools(BrowserContextPool(driver, max_contexts=2))
+    
+    for _ in range(5):
+        response = tools.call_tool("browser_navigate", {"url": "https://example.com/"})
+        assert response["status"] == "success"
+        assert response["result"]["title"] == "Title of https://example.com/"
+    
+    assert driver.launches == 1
+    assert driver.contexts_created == 1
+
+
+def test_browser_tools_recycle_contexts():
+    """Test recycling after max uses, memory growth and failures."""
+    driver = FakePageDriver(memory_per_use=10)
+    pool = BrowserContextPool(driver, max_uses=3, max_memory_bytes=15)
+    tools = BrowserTools(pool)
+    
+    # Recycled on memory growth after the second use
+    tools.call_tool("browser_navigate", {"url": "https://example.com/"})
+    tools.call_tool("browser_navigate", {"url": "https://example.com/"})
+    assert pool.recycled == 1
+    
+    # Recycled after a failure
+    response = tools.call_tool("browser_navigate", {"url": "https://example.com/fail"})
+    assert response["status"] == "failed"
+    assert pool.recycled == 2
+    assert driver.contexts_closed == 2
+
+
+def test_browser_tools_bound_concurrency_per_host():
+    """Test the per-host concurrency limit."""
+    driver = FakePageDriver(delay=0.02)
+    tools = BrowserTools(BrowserContextPool(driver, max_contexts=8, max_per_host=2))
+    
+    threads = [
+        threading.Thread(target=tools.call_tool,
+                         args=("browser_get_content", {"url": "https://example.com/page"}))
+        for _ in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert driver.max_active_per_host["example.com"] <= 2
+
+
+def test_browser_tools_validate_arguments():
+    """Test errors for unknown tools and missing arguments."""
+    tools = BrowserTools(BrowserContextPool(FakePageDriver()))
+    
+    assert tools.call_tool("browser_unknown", {})["status"] == "failed"
+    response = tools.call_tool("browser_evaluate", {"url": "https://example.com/"})
+    assert response["error"] == "Missing required argument: script"
+
+
+def test_agent_network_browser_tools():
+    """Test exposing browser tools through AgentNetwork."""
+    network = AgentNetwork({"browser": {"driver": FakePageDriver(), "prewarm": 1}})
+    
+    names = [tool["name"] for tool in network.list_browser_tools()]
+    assert "browser_navigate" in names
+    
+    response = network.call_browser_tool(
+        "browser_evaluate", {"url": "https://example.com/", "script": "document.title"}
+    )
+    assert response["status"] == "success"
+    assert response["result"]["value"] == len("document.title")
+    assert network.browser_tools.get_status()["created"] == 1
+    
+    assert AgentNetwork().call_browser_tool("browser_navigate", {})["status"] == "failed"
+
+
+class _ThreadBound:
+    """Fake Playwright object that must be used on the thread that created it."""
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+
+    def check(self):
+        assert threading.get_ident() == self.thread
+
+
+class _FakePage(_ThreadBound):
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def __init__(self):
+        super().__init__()
+        self.url = None
+
+    def goto(self, url):
+        self.check()
+        with self.lock:
+            _FakePage.active += 1
+            _FakePage.max_active = max(_FakePage.max_active, _FakePage.active)
+        time.sleep(0.05)
+        with self.lock:
+            _FakePage.active -= 1
+        self.url = url
+
+    def title(self):
+        self.check()
+        return "Title"
+
+
+class _FakeContext(_ThreadBound):
+    def __init__(self):
+        super().__init__()
+        self.pages = []
+
+    def new_page(self):
+        self.check()
+        self.pages.append(_FakePage())
+        return self.pages[-1]
+
+    def close(self):
+        self.check()
+
+
+class _FakeBrowser(_ThreadBound):
+    launched = []
+
+    def new_context(self):
+        self.check()
+        return _FakeContext()
+
+    def close(self):
+        self.check()
+        self.launched.remove(self)
+
+
+class _FakePlaywright:
+    def start(self):
+        self.chromium = self
+        return self
+
+    def launch(self, headless):
+        browser = _FakeBrowser()
+        browser.launched.append(browser)
+        return browser
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    """Install a fake playwright.sync_api module."""
+    sync_api = types.ModuleType("playwright.sync_api")
+    sync_api.sync_playwright = _FakePlaywright
+    monkeypatch.setitem(sys.modules, "playwright", types.ModuleType("playwright"))
+    monkeypatch.setitem(sys.modules, "playwright.sync_api", sync_api)
+    _FakeBrowser.launched = []
+    _FakePage.max_active = 0
+    return _FakeBrowser.launched
+
+
+def test_browser_driver_is_abstract():
+    """Test that drivers must implement the whole interface."""
+    with pytest.raises(TypeError):
+        BrowserDriver()
+
+
+def test_playwright_driver_runs_contexts_in_parallel(fake_playwright):
+    """Test that contexts are spread over browser workers and run concurrently."""
+    driver = PlaywrightDriver(workers=3)
+    tools = BrowserTools(BrowserContextPool(driver, max_contexts=3, max_per_host=3))
+
+    threads = [
+        threading.Thread(target=tools.call_tool,
+                         args=("browser_navigate", {"url": "https://example.com/"}))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert _FakePage.max_active == 3
+    assert len(fake_playwright) == 3
+
+    tools.close()
+    assert fake_playwright == []
+    response = tools.call_tool("browser_navigate", {"url": "https://example.com/"})
+    assert response == {"status": "success",
+                        "result": {"url": "https://example.com/", "title": "Title",
+                                   "status": None}}
+    assert len(fake_playwright) == 1
+    tools.close()
+
+
+def test_agent_network_catalogs_and_closes_browser_tools():
+    """Test that browser tools are searchable and shut down with the network."""
+    driver = FakePageDriver()
+    network = AgentNetwork({"browser": {"driver": driver, "prewarm": 1}})
+    manager = network.mcp_connection_manager
+    assert [tool["name"] for tool in manager.catalog.get("browser")] == [
+        tool["name"] for tool in network.list_browser_tools()
+    ]
+    matches = manager.find_tools("evaluate javascript", include_local=True)
+    assert matches[0]["server"] == "browser"
+    assert matches[0]["tool"] == "browser_evaluate"
+    assert manager.find_tools("evaluate javascript") == []
+    assert "browser" not in manager.export_state()["catalog"]
+
+    network.shutdown()
+    assert driver.launches == 0
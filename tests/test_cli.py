@@ -0,0 +1,34 @@
+"""Tests for the command line interface."""
+
+import pytest
+from mcp_agent_network.cli.main import parse_args
+
+
+def test_profile_flag_does_not_consume_the_command():
+    """Test that --profile is a flag and the command is still parsed."""
+    args = parse_args(["--profile", "status"])
+    assert args.profile
+    assert args.command == "status"
+    assert args.profile_output == "profile"
+
+    args = parse_args(["--profile", "connect", "--servers", "glama"])
+    assert args.command == "connect"
+    assert args.servers == ["glama"]
+
+    args = parse_args(["--profile-output", "out", "--profile", "task", "summarize"])
+    assert args.profile_output == "out"
+    assert args.description == "summarize"
+
+    args = parse_args(["status"])
+    assert not args.profile
+
+
+def test_commands_parse_their_arguments():
+    """Test the arguments of each subcommand."""
+    args = parse_args(["disconnect", "--drain-timeout", "2.5"])
+    assert args.drain_timeout == 2.5
+    args = parse_args(["chat", "agent-1", "hello"])
+    assert (args.agent_id, args.message) == ("agent-1", "hello")
+    with pytest.raises(SystemExit):
+        parse_args(["chat", "agent-1"])
+
@@ -0,0 +1,143 @@
+"""Tests for the per-agent conversation store."""
+
+import pytest
+from mcp_agent_network import AgentNetwork
+from mcp_agent_network.core.conversation import ConversationStore, JsonlConversationLog
+
+
+def test_window_bounded_by_messages():
+    """Test that the window keeps only the newest messages."""
+    store = ConversationStore(max_messages=3)
+    for i in range(10):
+        store.append("agent", "user", f"message {i}")
+    
+    context = store.get_context("agent")
+    assert [m["content"] for m in context["messages"]] == ["message 7", "message 8", "message 9"]
+    assert context["summary"] is None
+
+
+def test_window_bounded_by_tokens_with_compaction():
+    """Test token bounds and the compaction hook."""
+    def compactor(summary, evicted):
+        contents = [m["content"] for m in evicted]
+        return ", ".join(filter(None, [summary] + contents))
+    
+    store = ConversationStore(max_messages=100, max_tokens=10, compactor=compactor)
+    for word in ("alpha", "beta", "gamma", "delta", "epsilon"):
+        store.append("agent", "user", word * 4)
+    
+    context = store.get_context("agent")
+    assert sum(len(m["content"]) // 4 + 1 for m in context["messages"]) <= 10
+    assert context["summary"].startswith("alphaalpha")
+
+
+def test_delta_for_session_state():
+    """Test sending only unseen messages to servers with sessions."""
+    store = ConversationStore(max_messages=3)
+    first = store.append("agent", "user", "one")
+    assert store.get_delta("agent", "session") is None
+    
+    store.mark_sent("agent", "session", first["seq"])
+    store.append("agent", "user", "two")
+    assert [m["content"] for m in store.get_delta("agent", "session")] == ["two"]
+    
+    # Falls back to the full context once the delta was evicted
+    for content in ("three", "four", "five"):
+        store.append("agent", "user", content)
+    assert store.get_delta("agent", "session") is None
+
+
+def test_persistence_restores_window(tmp_path):
+    """Test restoring a conversation from the append-only log."""
+    store = ConversationStore(max_messages=2, compactor=lambda summary, evicted: "summary",
+                              log=JsonlConversationLog(str(tmp_path)))
+    for i in range(5):
+        store.append("agent/1", "user", f"message {i}")
+    
+    restored = ConversationStore(max_messages=2, log=JsonlConversationLog(str(tmp_path)))
+    context = restored.get_context("agent/1")
+    assert [m["content"] for m in context["messages"]] == ["message 3", "message 4"]
+    assert context["summary"] == "summary"
+    assert restored.append("agent/1", "user", "next")["seq"] == 5
+
+
+def test_chat_with_agent_sends_history():
+    """Test that chat messages carry history or only the delta."""
+    network = AgentNetwork()
+    network.connect_to_servers(["stateless", "stateful"], show_progress=False)
+    manager = network.mcp_connection_manager
+    manager.get_client("stateful").connection_info["features"].append("session_state")
+    
+    sent = {}
+    for name in ("stateless", "stateful"):
+        client = manager.get_client(name)
+        original = client._transmit
+        
+        def transmit(message, name=name, original=original):
+            sent[name] = message
+            return original(message)
+        
+        client._transmit = transmit
+    
+    network.chat_with_agent("agent", "first")
+    network.chat_with_agent("agent", "second")
+    
+    assert [m["content"] for m in sent["stateless"]["history"]] == ["first"]
+    assert "history" not in sent["stateful"]
+    assert [m["content"] for m in sent["stateful"]["history_delta"]] == []
+    assert sent["stateful"]["content"] == "second"
+
+
+def test_reconnect_resets_server_session():
+    """Test that a reconnected server gets the full history again."""
+    network = AgentNetwork()
+    network.connect_to_servers(["stateful"], show_progress=False)
+    manager = network.mcp_connection_manager
+    client = manager.get_client("stateful")
+    client.connection_info["features"].append("session_state")
+    sent = []
+    original = client._transmit
+    client._transmit = lambda message: sent.append(message) or original(message)
+
+    network.chat_with_agent("agent", "first")
+    network.chat_with_agent("agent", "second")
+    assert "history_delta" in sent[-1]
+
+    network.disconnect_from_servers()
+    network.connect_to_servers(["stateful"], show_progress=False)
+    client = manager.get_client("stateful")
+    client._transmit = lambda message: sent.append(message) or original(message)
+    network.chat_with_agent("agent", "third")
+    assert [m["content"] for m in sent[-1]["history"]] == ["first", "second"]
+
+
+def test_least_recently_used_conversations_are_dropped(tmp_path):
+    """Test the bound on conversations held in memory."""
+    store = ConversationStore(max_conversations=2, log=JsonlConversationLog(str(tmp_path)))
+    for agent_id in ("a", "b", "a", "c"):
+        store.append(agent_id, "user", f"hello {agent_id}")
+    assert list(store._conversations) == ["a", "c"]
+
+    # Dropped conversations are restored from the log
+    assert [m["content"] for m in store.get_context("b")["messages"]] == ["hello b"]
+    assert list(store._conversations) == ["c", "b"]
+    with pytest.raises(ValueError):
+        ConversationStore(max_conversations=0)
+
+
+def test_log_is_compacted(tmp_path):
+    """Test that the log is rewritten to the summary and window as it grows."""
+    log = JsonlConversationLog(str(tmp_path))
+    store = ConversationStore(max_messages=5, compactor=lambda summary, evicted: "summary",
+                              log=log)
+    for i in range(500):
+        store.append("agent", "user", f"message {i}")
+
+    with open(log._path("agent"), encoding="utf-8") as f:
+        assert len(f.readlines()) < 2 * 64
+
+    restored = ConversationStore(max_messages=5, log=JsonlConversationLog(str(tmp_path)))
+    context = restored.get_context("agent")
+    assert [m["content"] for m in context["messages"]] == [f"message {i}" for i in range(495, 500)]
+    assert context["summary"] == "summary"
+    assert restored.append("agent", "user", "next")["seq"] == 500
@@ -0,0 +1,155 @@
+"""Tests for the event bus."""
+
+import threading
+import time
+
+import pytest
+from mcp_agent_network.core.agent_network import AgentNetwork
+from mcp_agent_network.mcp import EventBus, MCPConnectionManager
+from mcp_agent_network.mcp.events import (
+    LATENCY_CHANGED,
+    SERVER_CONNECTED,
+    SERVER_DEGRADED,
+    SERVER_DISCONNECTED,
+    TASK_COMPLETED,
+    TOOLS_LIST_CHANGED,
+)
+
+
+def test_subscribe_filters_by_type_and_source():
+    """Test that subscribers only receive matching events."""
+    bus = EventBus()
+    connected = bus.subscribe(SERVER_CONNECTED)
+    glama_only = bus.subscribe(sources=["glama"])
+
+    bus.publish(SERVER_CONNECTED, "glama")
+    bus.publish(SERVER_CONNECTED, "smithery")
+    bus.publish(SERVER_DISCONNECTED, "glama")
+
+    assert [event.source for event in connected.drain()] == ["glama", "smithery"]
+    assert [event.type for event in glama_only.drain()] == [SERVER_CONNECTED, SERVER_DISCONNECTED]
+
+
+def test_publish_without_subscribers_is_skipped():
+    """Test that events nobody listens for are not built."""
+    bus = EventBus()
+    assert bus.publish(SERVER_CONNECTED, "glama") is None
+    assert not bus.has_subscribers(SERVER_CONNECTED)
+
+
+def test_overflow_policies():
+    """Test drop and coalesce behavior of full queues."""
+    bus = EventBus()
+    oldest = bus.subscribe(LATENCY_CHANGED, max_queue=2)
+    newest = bus.subscribe(LATENCY_CHANGED, max_queue=2, overflow="drop_newest")
+    coalesce = bus.subscribe(LATENCY_CHANGED, max_queue=2, overflow="coalesce")
+
+    for latency in (1, 2, 3):
+        bus.publish(LATENCY_CHANGED, "glama", latency=latency)
+    bus.publish(LATENCY_CHANGED, "smithery", latency=9)
+
+    assert [e.data["latency"] for e in oldest.drain()] == [3, 9]
+    assert [e.data["latency"] for e in newest.drain()] == [1, 2]
+    assert [e.data["latency"] for e in coalesce.drain()] == [3, 9]
+    assert oldest.get_status()["dropped"] == 2
+    assert coalesce.get_status()["coalesced"] == 2
+
+
+def test_callback_subscription_and_close():
+    """Test that callbacks run on their own delivery thread."""
+    bus = EventBus()
+    received = []
+    delivered = threading.Event()
+
+    def callback(event):
+        received.append((event.type, threading.current_thread().name))
+        delivered.set()
+
+    subscription = bus.subscribe(SERVER_CONNECTED, callback=callback)
+    bus.publish(SERVER_CONNECTED, "glama")
+    assert delivered.wait(2)
+    assert received == [(SERVER_CONNECTED, "event-subscriber")]
+
+    subscription.close()
+    assert bus.publish(SERVER_CONNECTED, "glama") is None
+    assert subscription.get(timeout=0) is None
+
+
+def test_manager_publishes_lifecycle_events():
+    """Test that the connection manager reports connects, tools and disconnects."""
+    manager = MCPConnectionManager()
+    subscription = manager.events.subscribe()
+    manager.add_server("test-server")
+
+    manager.connect_to_servers(["test-server"], show_progress=False)
+    manager.disconnect_from_all()
+    types = [event.type for event in subscription.drain()]
+
+    assert types.index(TOOLS_LIST_CHANGED) < types.index(SERVER_CONNECTED)
+    assert "progress" in types
+    assert types[-1] == SERVER_DISCONNECTED
+
+
+def test_manager_publishes_degraded_and_latency_events():
+    """Test that failures and latency changes are published."""
+    manager = MCPConnectionManager()
+    manager.add_server("test-server")
+    manager.connect_to_servers(["test-server"], show_progress=False)
+    subscription = manager.events.subscribe([SERVER_DEGRADED, LATENCY_CHANGED])
+
+    client = manager.clients["test-server"]
+    client._transmit = lambda message: {"status": "throttled", "retry_after": 1}
+    manager.send_message("test-server", {"type": "test"})
+
+    # Sub-millisecond moves of the EWMA are published in nanoseconds
+    client.latency.ewma_ns = 100_000.0
+    manager.update_statuses(["test-server"])
+    client.latency.ewma_ns = 400_000.0
+    manager.update_statuses(["test-server"])
+    client.latency.ewma_ns = 410_000.0
+    manager.update_statuses(["test-server"])
+
+    degraded, latency = subscription.drain()
+    assert degraded.type == SERVER_DEGRADED and degraded.data["retry_after"] == 1.0
+    assert latency.type == LATENCY_CHANGED
+    assert latency.data == {"metric": "latency", "previous_ns": 100_000, "latency_ns": 400_000}
+
+
+def test_manager_publishes_message_latency_from_responses():
+    """Test that message latency changes and spikes are published without polling."""
+    manager = MCPConnectionManager()
+    manager.connect_to_servers(["test-server"], show_progress=False)
+    subscription = manager.events.subscribe([SERVER_DEGRADED, LATENCY_CHANGED])
+    client = manager.clients["test-server"]
+
+    def slow_transmit(message):
+        time.sleep(message["delay"])
+        return {"status": "success"}
+
+    client._transmit = slow_transmit
+    for _ in range(5):
+        manager.send_message("test-server", {"type": "test", "delay": 0.001})
+    subscription.drain()
+
+    manager.send_message("test-server", {"type": "test", "delay": 0.05})
+    events = {event.type: event for event in subscription.drain()}
+    assert events[SERVER_DEGRADED].data["error"] == "Latency spike"
+    change = events[LATENCY_CHANGED].data
+    assert change["metric"] == "message_latency"
+    assert change["latency_ns"] > change["previous_ns"] + 1_000_000
+
+    # A spike is reported once, not on every slow response
+    manager.send_message("test-server", {"type": "test", "delay": 0.05})
+    assert all(event.type != SERVER_DEGRADED for event in subscription.drain())
+
+
+def test_network_publishes_task_completed():
+    """Test that finished tasks are announced on the network's bus."""
+    network = AgentNetwork()
+    network.connect_to_servers(["test-server"], show_progress=False)
+    subscription = network.events.subscribe(TASK_COMPLETED)
+
+    network.execute_task("Test task")
+    event = subscription.get(timeout=0)
+    assert event.source == "execute_task"
+    assert event.data["task"] == "Test task"
@@ -0,0 +1,123 @@
+"""Tests for columnar fleet metrics."""
+
+import math
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from mcp_agent_network.mcp import MCPConnectionManager
+from mcp_agent_network.mcp.fleet_metrics import FleetMetrics
+
+
+def _fleet(count):
+    """Build metrics for connected servers with latency i * 1000 ns."""
+    metrics = FleetMetrics(capacity=4)
+    for i in range(count):
+        metrics.add(f"server-{i}")
+        metrics.update(f"server-{i}", True, i * 1000.0, None, 0, 1.0)
+    return metrics
+
+
+def test_rows_are_reused_and_grown():
+    """Test row allocation across growth and removal."""
+    metrics = _fleet(10)
+    assert len(metrics.names) == 16
+    row = metrics.rows["server-3"]
+    metrics.remove("server-3")
+    assert metrics.add("new") == row
+    assert metrics.add("new") == row
+    assert metrics.summary()["servers"] == 10
+    assert metrics.summary()["connected"] == 9
+
+
+def test_top_k_and_percentile():
+    """Test slowest-server and percentile queries."""
+    metrics = _fleet(101)
+    metrics.add("unmeasured")
+    metrics.update("unmeasured", True, None, None, 0, None)
+    metrics.update("server-100", False, 100_000.0, None, 0, 1.0)
+
+    assert metrics.top_k(3) == [("server-99", 99000.0), ("server-98", 98000.0),
+                                ("server-97", 97000.0)]
+    assert metrics.top_k(1, connected_only=False) == [("server-100", 100000.0)]
+    assert metrics.percentile(50) == pytest.approx(49500.0)
+    assert metrics.percentile([0, 100]) == [0.0, 99000.0]
+    assert math.isnan(FleetMetrics().percentile(50))
+    assert all(math.isnan(value) for value in FleetMetrics().percentile([50, 99]))
+    with pytest.raises(ValueError):
+        metrics.top_k(1, column="unknown")
+
+
+def test_error_rates():
+    """Test the error threshold query."""
+    metrics = _fleet(3)
+    for _ in range(4):
+        metrics.record("server-0", error=False)
+    for error in (True, True, False, False):
+        metrics.record("server-1", error=error)
+    metrics.record("server-2", error=True)
+
+    assert metrics.error_rates() == {"server-0": 0.0, "server-1": 0.5, "server-2": 1.0}
+    assert metrics.above_error_rate(0.25) == ["server-2", "server-1"]
+    assert metrics.above_error_rate(0.25, min_requests=2) == ["server-1"]
+
+
+def test_records_from_many_threads():
+    """Test that per-thread response buffers are all counted."""
+    metrics = _fleet(2)
+
+    def worker():
+        for i in range(500):
+            metrics.record(f"server-{i % 2}", error=i % 5 == 0)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.summary()["requests"] == 4000
+    assert metrics.summary()["errors"] == 800
+    # Buffers of finished threads are dropped once drained
+    assert all(thread.is_alive() for thread, _ in metrics._buffers)
+
+
+def test_queries_at_fleet_scale():
+    """Test vectorized queries over tens of thousands of servers."""
+    metrics = FleetMetrics()
+    count = 20_000
+    for i in range(count):
+        metrics.add(f"server-{i}")
+    latencies = np.arange(count, dtype=np.float64)
+    metrics.columns["latency_ns"][:count] = latencies
+    metrics.connected[:count] = True
+
+    assert metrics.top_k(2) == [(f"server-{count - 1}", count - 1.0),
+                                (f"server-{count - 2}", count - 2.0)]
+    assert metrics.percentile(100) == count - 1.0
+
+
+def test_manager_tracks_fleet_metrics():
+    """Test that the manager feeds the columns from statuses and responses."""
+    manager = MCPConnectionManager()
+    manager.connect_to_servers(["glama", "smithery"], show_progress=False)
+    manager.clients["glama"].latency.observe(10**9)
+    manager.update_all_statuses()
+    assert manager.get_slowest_servers(1)[0][0] == "glama"
+
+    manager.send_message("smithery", {"type": "test"})
+    manager.clients["smithery"]._transmit = lambda message: {"error": "boom", "status": "failed"}
+    manager.send_message("smithery", {"type": "test"})
+    assert manager.get_servers_above_error_rate(0.4) == ["smithery"]
+
+    summary = manager.get_fleet_summary()
+    assert summary["servers"] == 2
+    assert summary["connected"] == 2
+    assert summary["requests"] == 2
+    assert summary["errors"] == 1
+    assert manager.get_fleet_latency_percentile(100) == manager.clients["glama"].latency.ewma_ns
+
+    manager.remove_server("glama")
+    assert manager.get_fleet_summary()["servers"] == 1
@@ -0,0 +1,174 @@
+"""Tests for micro-batching of small messages."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from mcp_agent_network import AgentNetwork
+from mcp_agent_network.mcp import MCPClient, MCPConnectionManager
+from mcp_agent_network.mcp.batching import MicroBatcher
+
+
+def test_batcher_collects_messages_into_one_batch():
+    """Test that concurrent messages share a round trip and get their own responses."""
+    batches = []
+
+    def send_batch(messages):
+        batches.append(len(messages))
+        return [{"echo": message["n"]} for message in messages]
+
+    batcher = MicroBatcher(send_batch, max_delay=0.2, max_batch_size=4)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        responses = list(executor.map(lambda n: batcher.submit({"n": n}), range(4)))
+    batcher.close()
+
+    assert [response["echo"] for response in responses] == [0, 1, 2, 3]
+    assert batches == [4]
+    assert batcher.get_status()["average_batch_size"] == 4
+
+
+def test_batcher_flushes_after_max_delay():
+    """Test that a lone message is sent once the window closes."""
+    batcher = MicroBatcher(lambda messages: [{"ok": True}] * len(messages), max_delay=0.01)
+    assert batcher.submit({"n": 1}) == {"ok": True}
+    batcher.close()
+    assert batcher.submit({"n": 2})["status"] == "rejected"
+
+
+def test_batcher_reports_failures_to_every_caller():
+    """Test that a failed batch fails each message in it."""
+    def send_batch(messages):
+        raise ConnectionError("boom")
+
+    batcher = MicroBatcher(send_batch, max_delay=0.01)
+    response = batcher.submit({"n": 1})
+    batcher.close()
+    assert response["status"] == "failed"
+    assert response["error"] == "boom"
+
+
+def test_client_batches_messages_through_admission_control():
+    """Test that a batching client sends one admitted round trip per batch."""
+    client = MCPClient("test-server", batching={"max_delay": 0.2, "max_batch_size": 3})
+    client.connect()
+    sent = []
+
+    def transmit(message):
+        sent.append(message)
+        return {"status": "delivered",
+                "responses": [{"status": "delivered", "id": m["id"]} for m in message["messages"]]}
+
+    client._transmit = transmit
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        responses = list(executor.map(
+            lambda i: client.send_message({"type": "test", "id": i}), range(3)
+        ))
+
+    assert [response["id"] for response in responses] == [0, 1, 2]
+    assert len(sent) == 1 and sent[0]["type"] == "batch"
+    assert client.in_flight == 0
+    assert client.get_status()["batching"]["batches"] == 1
+
+
+def test_rejected_batch_is_returned_to_each_caller():
+    """Test that a batch without per-message responses is fanned out."""
+    manager = MCPConnectionManager()
+    manager.add_server("test-server", batching={"max_delay": 0.01})
+    manager.connect_to_servers(["test-server"], show_progress=False)
+    client = manager.clients["test-server"]
+    client._transmit = lambda message: {"status": "failed", "error": "Server error"}
+
+    response = manager.send_message("test-server", {"type": "test"})
+    assert response == {"status": "failed", "error": "Server error"}
+
+
+def test_batch_takes_highest_priority_and_earliest_deadline():
+    """Test that the batch envelope carries its members' lane and deadline."""
+    client = MCPClient("test-server", batching={"max_delay": 0.2, "max_batch_size": 2})
+    client.connect()
+    sent = []
+    transmit = client._transmit
+    client._transmit = lambda message: sent.append(message) or transmit(message)
+
+    deadline = time.time() + 60
+    messages = [{"type": "test", "priority": "bulk"},
+                {"type": "test", "priority": "normal", "deadline": deadline}]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(client.send_message, messages))
+    assert sent[0]["priority"] == "normal"
+    assert sent[0]["deadline"] == deadline
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(client.send_message, [{"type": "test", "priority": "bulk"}] * 2))
+    assert sent[1]["priority"] == "bulk"
+    assert "deadline" not in sent[1]
+
+
+def test_batch_drops_members_expired_at_flush():
+    """Test that messages whose deadline passes while batching are not sent."""
+    client = MCPClient("test-server", batching={"max_delay": 0.2, "max_batch_size": 8})
+    client.connect()
+    sent = []
+    transmit = client._transmit
+    client._transmit = lambda message: sent.append(message) or transmit(message)
+
+    messages = [{"type": "test", "deadline": time.time() + 0.05}, {"type": "test", "id": 1}]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        expired, delivered = executor.map(client.send_message, messages)
+    assert expired == {"error": "Deadline exceeded", "status": "rejected",
+                       "server": "test-server"}
+    assert delivered["status"] == "delivered"
+    assert [m.get("id") for m in sent[0]["messages"]] == [1]
+    assert client.get_status()["expired"] == 1
+
+
+def _batcher_threads(server_name):
+    """Get the live flusher and sender threads of a server's batcher."""
+    return [thread for thread in threading.enumerate()
+            if thread.name.startswith((f"batcher-{server_name}", f"batch-{server_name}"))]
+
+
+def test_batcher_threads_stop_on_remove_disconnect_and_shutdown():
+    """Test that batchers are closed with their server."""
+    network = AgentNetwork({"mcp_servers": {"batched-a": {"batching": {"max_delay": 0.001}},
+                                            "batched-b": {"batching": {"max_delay": 0.001}}}})
+    network.connect_to_servers(["batched-a", "batched-b"], show_progress=False)
+    manager = network.mcp_connection_manager
+    for server_name in ("batched-a", "batched-b"):
+        manager.send_message(server_name, {"type": "test"})
+        assert _batcher_threads(server_name)
+
+    manager.remove_server("batched-a")
+    assert not _batcher_threads("batched-a")
+
+    client = manager.clients["batched-b"]
+    client.disconnect()
+    assert not _batcher_threads("batched-b")
+    client.connect()
+    assert manager.send_message("batched-b", {"type": "test"})["status"] == "delivered"
+    assert _batcher_threads("batched-b")
+
+    network.shutdown()
+    assert not _batcher_threads("batched-b")
+
+
+def test_reconcile_applies_batching_and_compression_changes():
+    """Test that reconcile updates batching in place and renegotiates compression."""
+    manager = MCPConnectionManager()
+    manager.reconcile({"server": {}})
+    client = manager.clients["server"]
+    assert client.batcher is None
+
+    summary = manager.reconcile({"server": {"batching": {"max_batch_size": 4}}})
+    assert summary["unchanged"] == ["server"]
+    assert client.batcher.max_batch_size == 4
+
+    summary = manager.reconcile({"server": {"batching": {"max_batch_size": 4},
+                                            "compression": {"codecs": ["gzip"]}}})
+    assert summary["reconnected"] == ["server"]
+    assert client.connected
+    assert client.compression_config == {"codecs": ["gzip"]}
+
+    manager.reconcile({"server": {}})
+    assert client.batcher is None
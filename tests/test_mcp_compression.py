@@ -0,0 +1,88 @@
+"""Tests for payload compression."""
+
+import pytest
+from mcp_agent_network.mcp import MCPClient
+from mcp_agent_network.mcp.compression import (
+    Compressor,
+    available_codecs,
+    negotiate,
+    train_dictionary,
+)
+
+
+def large_message(i=0):
+    """Build a repetitive tool result like a browser snapshot."""
+    return {
+        "type": "tool_result",
+        "tool": "browser_get_content",
+        "content": "<div class=\"item\">listing entry</div>" * 50 + str(i),
+    }
+
+
+def test_small_messages_are_not_compressed():
+    """Test that messages below the threshold pass through unchanged."""
+    compressor = Compressor("zlib", threshold=1024)
+    message = {"type": "ping"}
+    assert compressor.encode(message) is message
+    assert compressor.get_status()["skipped"] == 1
+
+
+def test_round_trip_records_ratio():
+    """Test that large messages compress, decode and are measured."""
+    compressor = Compressor("zlib", threshold=256)
+    envelope = compressor.encode(large_message())
+
+    assert envelope["type"] == "compressed"
+    assert envelope["encoding"] == "zlib"
+    assert compressor.decode(envelope) == large_message()
+    status = compressor.get_status()
+    assert status["compressed"] == 1
+    assert status["ratio"] > 10
+    assert status["cpu_time_ms"] >= 0
+
+
+def test_shared_dictionary_improves_small_payloads():
+    """Test that a trained dictionary helps on messages similar to the samples."""
+    samples = [{"type": "tool_call", "tool": "browser_navigate",
+                "arguments": {"url": f"https://example.com/page/{i}", "wait_until": "load"}}
+               for i in range(20)]
+    dictionary = train_dictionary(samples, size=1024)
+    plain = Compressor("zlib", threshold=0)
+    shared = Compressor("zlib", threshold=0, dictionary=dictionary)
+
+    message = {"type": "tool_call", "tool": "browser_navigate",
+               "arguments": {"url": "https://example.com/page/99", "wait_until": "load"}}
+    envelope = shared.encode(message)
+    assert len(envelope["payload"]) < len(plain.encode(message)["payload"])
+    assert shared.decode(envelope) == message
+
+    with pytest.raises(ValueError):
+        plain.decode(envelope)
+
+
+def test_negotiation_picks_first_common_codec():
+    """Test codec negotiation against the server's advertised codecs."""
+    assert negotiate(None, ["zlib"]) is None
+    assert negotiate({"codecs": ["zlib"]}, ["zstd"]) is None
+    assert negotiate({"codecs": ["zstd", "zlib"]}, ["zlib"]).codec == "zlib"
+    assert negotiate({}, ["zstd", "zlib"]).codec == available_codecs()[0]
+
+
+def test_client_compresses_large_messages():
+    """Test that a client sends negotiated compressed envelopes."""
+    client = MCPClient("test-server", compression={"codecs": ["zlib"], "threshold": 512})
+    client.connect()
+    assert client.compressor.codec == "zlib"
+
+    wire = []
+    transmit = client._transmit
+    client._transmit = lambda message: wire.append(message) or transmit(message)
+    client.send_message({"type": "ping"})
+    response = client.send_message(large_message())
+
+    assert response["status"] == "delivered"
+    assert [message["type"] for message in wire] == ["ping", "compressed"]
+    assert client.get_status()["compression"]["compressed"] == 1
+
+    client.disconnect()
+    assert client.compressor is None
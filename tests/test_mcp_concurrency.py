@@ -0,0 +1,96 @@
+"""Tests for adaptive concurrency limits."""
+
+import threading
+
+import pytest
+from mcp_agent_network.core.agent_network import AgentNetwork
+from mcp_agent_network.mcp import AdaptiveConcurrencyLimit, MCPConnectionManager
+
+
+def test_aimd_grows_when_saturated_and_backs_off_on_errors():
+    """Test additive increase and multiplicative decrease."""
+    limit = AdaptiveConcurrencyLimit("test-server", initial_limit=2, max_limit=10)
+    for _ in range(20):
+        assert limit.acquire()
+        assert limit.acquire()
+        limit.release(0.01)
+        limit.release(0.01)
+    assert limit.current_limit > 2
+
+    before = limit.limit
+    limit.acquire()
+    limit.release(success=False)
+    assert limit.limit == pytest.approx(before * 0.9)
+    assert limit.errors == 1
+    assert limit.get_status()["history"][0]["limit"] == 2
+
+
+def test_aimd_backs_off_on_latency_spike():
+    """Test that latency far above the baseline shrinks the limit."""
+    limit = AdaptiveConcurrencyLimit("test-server", initial_limit=8)
+    limit.acquire()
+    limit.release(0.01)
+    before = limit.limit
+
+    limit.acquire()
+    limit.release(0.1)
+    assert limit.limit == pytest.approx(before * 0.9)
+
+
+def test_gradient_tracks_latency():
+    """Test that the gradient limit grows at baseline and shrinks under queueing."""
+    limit = AdaptiveConcurrencyLimit("test-server", initial_limit=10, algorithm="gradient",
+                                     latency_tolerance=1.0, smoothing=0.5)
+    for _ in range(5):
+        limit.acquire()
+        limit.release(0.01)
+    assert limit.current_limit > 10
+
+    peak = limit.limit
+    for _ in range(10):
+        limit.acquire()
+        limit.release(0.1)
+    assert limit.limit < peak
+
+
+def test_acquire_blocks_at_limit():
+    """Test that acquire waits for a released slot and honors max_wait."""
+    limit = AdaptiveConcurrencyLimit("test-server", initial_limit=1, max_limit=1)
+    assert limit.acquire()
+    assert limit.acquire(max_wait=0.01) is False
+    assert limit.rejected == 1
+
+    timer = threading.Timer(0.05, limit.release, args=(0.01,))
+    timer.start()
+    assert limit.acquire(max_wait=2)
+    timer.join()
+
+
+def test_client_rejects_when_limit_is_exhausted():
+    """Test that messages beyond the limit are rejected after max_wait."""
+    manager = MCPConnectionManager()
+    manager.add_server("test-server", concurrency={"initial_limit": 1, "max_wait": 0.01})
+    manager.connect_to_servers(["test-server"], show_progress=False)
+    client = manager.clients["test-server"]
+    client.concurrency_limit.acquire()
+
+    response = manager.send_message("test-server", {"type": "test"})
+    assert response["status"] == "rejected"
+    assert response["error"] == "Concurrency limit reached"
+
+
+def test_limits_are_reported_in_status():
+    """Test that limits and history appear in the status output."""
+    network = AgentNetwork({"concurrency": {"algorithm": "gradient"},
+                            "mcp_servers": {"test-server": {}}})
+    network.connect_to_servers(["test-server"], show_progress=False)
+    network.execute_task("Test task")
+
+    status = network.get_server_status()["test-server"]["concurrency"]
+    assert status["algorithm"] == "gradient"
+    assert status["successes"] == 1
+    assert status["history"]
+
+    overview = network.mcp_connection_manager.get_concurrency_status()
+    assert overview["connect"]["successes"] == 1
+    assert "test-server" in overview["servers"]
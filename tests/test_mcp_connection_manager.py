@@ -1,5 +1,8 @@
 """Tests for the MCP connection manager."""
 
+import threading
+import time
+
 import pytest
 from mcp_agent_network.mcp import MCPConnectionManager, MCPClient
 
@@ -152,4 +155,162 @@ def test_broadcast_message():
     responses = manager.broadcast_message(message)
     
     assert len(responses) == 2
-    assert all(response["status"] == "delivered" for response in responses.values()) 
\ No newline at end of file
+    assert all(response["status"] == "delivered" for response in responses.values()) 
+
+def test_connect_to_servers_skips_connected():
+    """Test that already connected servers are not reconnected."""
+    manager = MCPConnectionManager()
+    manager.connect_to_servers(["test-server"], show_progress=False)
+    
+    client = manager.get_client("test-server")
+    client.connect = lambda: pytest.fail("healthy server was reconnected")
+    
+    results = manager.connect_to_servers(["test-server"], show_progress=False)
+    assert results["test-server"]["success"] is True
+    assert results["test-server"]["already_connected"] is True
+
+
+def test_reconcile():
+    """Test incremental reconciliation against a desired server set."""
+    manager = MCPConnectionManager()
+    manager.connect_to_servers(["keep", "drop", "dead", "rekey"], show_progress=False)
+    manager.get_client("dead").disconnect()
+    keep_client = manager.get_client("keep")
+    
+    summary = manager.reconcile({
+        "keep": {},
+        "dead": {},
+        "rekey": {"api_key": "new-key"},
+        "new": {"rate_limit": {"rate": 10}},
+    })
+    
+    assert summary["added"] == ["new"]
+    assert summary["removed"] == ["drop"]
+    assert sorted(summary["reconnected"]) == ["dead", "rekey"]
+    assert summary["unchanged"] == ["keep"]
+    assert set(summary["results"]) == {"new", "dead", "rekey"}
+    
+    assert manager.get_client("keep") is keep_client
+    assert manager.get_client("rekey").api_key == "new-key"
+    assert manager.get_client("new").rate_limiter.base_rate == 10
+    assert "drop" not in manager.clients
+    assert sorted(manager.get_connected_servers()) == ["dead", "keep", "new", "rekey"]
+    
+    # Reconciling again is a no-op
+    summary = manager.reconcile({"keep": {}, "dead": {}, "rekey": {"api_key": "new-key"},
+                                 "new": {"rate_limit": {"rate": 10}}})
+    assert summary["results"] == {}
+    assert len(summary["unchanged"]) == 4
+
+
+def test_reconcile_disconnects_outside_the_registry_lock():
+    """Test that reconcile does not hold the registry lock while disconnecting."""
+    manager = MCPConnectionManager()
+    manager.connect_to_servers(["drop", "rekey", "recompress"], show_progress=False)
+    locked = {}
+    
+    def registry_locked():
+        # The lock is reentrant, so probe it from another thread
+        result = []
+        
+        def probe_lock():
+            acquired = manager._registry_lock.acquire(blocking=False)
+            if acquired:
+                manager._registry_lock.release()
+            result.append(acquired)
+        probe = threading.Thread(target=probe_lock)
+        probe.start()
+        probe.join()
+        return not result[0]
+    
+    for server_name in ["drop", "rekey", "recompress"]:
+        client = manager.get_client(server_name)
+        
+        def disconnect(client=client, original=client.disconnect):
+            locked[client.server_name] = registry_locked()
+            return original()
+        client.disconnect = disconnect
+    
+    summary = manager.reconcile({"rekey": {"api_key": "new-key"},
+                                 "recompress": {"compression": {"codecs": ["gzip"]}}})
+    assert summary["removed"] == ["drop"]
+    assert summary["reconnected"] == ["recompress", "rekey"]
+    assert locked == {"drop": False, "rekey": False, "recompress": False}
+    assert sorted(manager.get_connected_servers()) == ["recompress", "rekey"]
+
+
+def test_disconnect_from_all_drains_in_flight():
+    """Test that a graceful disconnect waits for in-flight messages."""
+    manager = MCPConnectionManager()
+    manager.connect_to_servers(["slow-server", "fast-server"], show_progress=False)
+    
+    slow_client = manager.get_client("slow-server")
+    started = threading.Event()
+    original_transmit = slow_client._transmit
+    
+    def slow_transmit(message):
+        started.set()
+        time.sleep(0.2)
+        return original_transmit(message)
+    
+    slow_client._transmit = slow_transmit
+    responses = []
+    sender = threading.Thread(target=lambda: responses.append(slow_client.send_message({})))
+    sender.start()
+    started.wait()
+    
+    results = manager.disconnect_from_all(drain_timeout=5.0)
+    sender.join()
+    
+    assert results == {"slow-server": True, "fast-server": True}
+    assert responses[0]["status"] == "delivered"
+    assert slow_client.in_flight == 0
+    
+    # New messages are rejected once shutdown has started
+    slow_client.connected = True
+    assert slow_client.send_message({})["status"] == "rejected"
+
+
+def test_concurrent_add_remove_broadcast():
+    """Stress test registry mutations racing with broadcasts and status polls."""
+    manager = MCPConnectionManager()
+    manager.connect_to_servers([f"stable-{i}" for i in range(5)], show_progress=False)
+    errors = []
+    stop = threading.Event()
+    
+    def churn(worker_id):
+        for i in range(200):
+            name = f"churn-{worker_id}-{i % 10}"
+            manager.add_server(name)
+            client = manager.get_client(name)
+            if client is not None:
+                client.connect()
+            manager.remove_server(name)
+    
+    def broadcast():
+        while not stop.is_set():
+            responses = manager.broadcast_message({"test": "message"})
+            for name in (f"stable-{i}" for i in range(5)):
+                assert responses[name]["status"] == "delivered"
+            manager.update_all_statuses()
+            manager.get_connected_servers()
+    
+    def run(target, *args):
+        try:
+            target(*args)
+        except Exception as e:
+            errors.append(e)
+    
+    readers = [threading.Thread(target=run, args=(broadcast,)) for _ in range(4)]
+    writers = [threading.Thread(target=run, args=(churn, i)) for i in range(8)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+    
+    assert errors == []
+    assert sorted(manager.clients) == [f"stable-{i}" for i in range(5)]
+    assert sorted(manager.update_all_statuses()) == sorted(manager.clients)
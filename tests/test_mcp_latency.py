@@ -0,0 +1,93 @@
+"""Tests for high-resolution latency tracking."""
+
+import math
+
+import pytest
+from mcp_agent_network.mcp import MCPClient, MCPConnectionManager
+from mcp_agent_network.mcp.events import SERVER_DEGRADED
+from mcp_agent_network.mcp.latency import LatencyStats
+
+TOOLS = [{"name": "web_search", "description": "Search the web for pages"}]
+
+
+def test_latency_stats_ewma_and_variance():
+    """Test the moving average and variance of samples."""
+    stats = LatencyStats(alpha=0.5)
+    assert stats.score() == math.inf
+    assert stats.to_dict()["ewma_ns"] is None
+
+    stats.observe(1000)
+    assert stats.to_dict() == {"samples": 1, "last_ns": 1000, "min_ns": 1000,
+                               "ewma_ns": 1000, "stddev_ns": 0}
+    stats.observe(3000)
+    status = stats.to_dict()
+    assert status["ewma_ns"] == 2000
+    assert status["min_ns"] == 1000
+    assert status["last_ns"] == 3000
+    # (1 - 0.5) * (0 + 2000 * 1000)
+    assert stats.ewmv_ns2 == pytest.approx(1_000_000)
+    assert stats.score(deviations=2.0) == pytest.approx(4000)
+
+
+def test_latency_stats_outliers():
+    """Test detecting latency spikes once enough samples exist."""
+    stats = LatencyStats()
+    assert not stats.is_outlier(10**9)
+    for elapsed in (1000, 1100, 900, 1000, 1050):
+        stats.observe(elapsed)
+    assert not stats.is_outlier(1200)
+    assert stats.is_outlier(50_000)
+
+
+def test_client_records_nanosecond_latency():
+    """Test that connect and ping feed the latency statistics."""
+    client = MCPClient("test-server")
+    client.connect()
+    latency = client.ping()
+
+    assert isinstance(latency, int)
+    assert client.connection_latency == round(client.connection_latency_ns / 1_000_000)
+    assert client.latency.samples == 2
+    assert client.latency.last_ns == client.connection_latency_ns
+
+    client.send_message({"type": "test"})
+    status = client.get_status()
+    assert status["latency"]["samples"] == 2
+    assert status["message_latency"]["samples"] == 1
+    assert status["latency_spike"] is False
+
+
+def test_find_tools_prefers_faster_servers():
+    """Test that equally relevant tools are ordered by server latency."""
+    manager = MCPConnectionManager()
+    manager.connect_to_servers(["glama", "smithery"], show_progress=False)
+    manager.tool_index.update_server("glama", TOOLS)
+    manager.tool_index.update_server("smithery", TOOLS)
+
+    for elapsed in (5_000_000, 6_000_000):
+        manager.clients["glama"].latency.observe(elapsed)
+    for elapsed in (100_000, 120_000):
+        manager.clients["smithery"].latency.observe(elapsed)
+    assert [m["server"] for m in manager.find_tools("web search", limit=1)] == ["smithery"]
+
+    for _ in range(20):
+        manager.clients["smithery"].latency.observe(50_000_000)
+    assert [m["server"] for m in manager.find_tools("web search", limit=1)] == ["glama"]
+
+
+def test_latency_spike_publishes_degraded_event():
+    """Test that a ping latency spike is reported as degradation."""
+    manager = MCPConnectionManager()
+    manager.connect_to_servers(["glama"], show_progress=False)
+    subscription = manager.events.subscribe([SERVER_DEGRADED])
+    manager.update_all_statuses()
+
+    manager.clients["glama"].latency_spike = True
+    manager.update_all_statuses()
+    event = subscription.get(timeout=1)
+    assert event.source == "glama"
+    assert event.data["error"] == "Latency spike"
+
+    # Reported once per spike, not on every poll
+    manager.update_all_statuses()
+    assert subscription.drain() == []
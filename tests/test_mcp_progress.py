@@ -0,0 +1,92 @@
+"""Tests for the MCP progress indicators."""
+
+import io
+import time
+
+import pytest
+from mcp_agent_network.mcp import ProgressBar, ProgressRenderer, SpinnerIndicator
+from mcp_agent_network.mcp.progress import _Indicator
+
+
+def test_renderer_disabled_on_non_tty():
+    """Test that nothing is written when the stream is not a terminal."""
+    stream = io.StringIO()
+    renderer = ProgressRenderer(stream=stream)
+    assert renderer.enabled is False
+    
+    bar = ProgressBar(10, "Connecting", renderer=renderer)
+    bar.update(5, "Halfway")
+    bar.finish()
+    
+    assert stream.getvalue() == ""
+
+
+def test_progress_bar_updates_are_rate_limited():
+    """Test that many updates do not cause a redraw each."""
+    stream = io.StringIO()
+    renderer = ProgressRenderer(stream=stream, max_fps=20, enabled=True)
+    bar = ProgressBar(10000, "Connecting", renderer=renderer)
+    
+    for _ in range(10000):
+        bar.advance(status="Connected")
+    bar.finish()
+    
+    output = stream.getvalue()
+    assert bar.current == 10000
+    assert output.count("Connecting:") < 10
+    assert "100.0% | Complete" in output
+    assert output.endswith("\n\x1b[J")
+
+
+def test_multiple_concurrent_bars():
+    """Test rendering one bar per server group."""
+    stream = io.StringIO()
+    renderer = ProgressRenderer(stream=stream, max_fps=100, enabled=True)
+    glama = ProgressBar(2, "glama group", renderer=renderer)
+    smithery = ProgressBar(2, "smithery group", renderer=renderer)
+    
+    glama.update(1, "Connected")
+    smithery.update(2, "Connected")
+    time.sleep(0.05)
+    glama.finish()
+    smithery.finish()
+    
+    output = stream.getvalue()
+    assert "glama group" in output
+    assert "smithery group" in output
+
+
+def test_progress_bar_render_line_fits_width():
+    """Test that rendered lines are truncated to the terminal width."""
+    renderer = ProgressRenderer(stream=io.StringIO())
+    bar = ProgressBar(4, "Connecting to MCP servers", renderer=renderer)
+    bar.update(2, "Connected to a server with a very long name")
+    
+    line = bar.render_line(100)
+    assert len(line) < 100
+    assert line.endswith("...")
+    assert "50.0%" in line
+
+
+def test_spinner_animates_without_updates():
+    """Test that the spinner frame advances with time alone."""
+    renderer = ProgressRenderer(stream=io.StringIO())
+    spinner = SpinnerIndicator("Processing", renderer=renderer)
+    spinner.start("Working")
+    
+    first = spinner.render_line(80)
+    time.sleep(0.15)
+    second = spinner.render_line(80)
+    spinner.stop()
+    
+    assert first[0] != second[0]
+    assert "Working" in second
+
+
+def test_indicators_must_render_lines():
+    """Test that indicators without render_line cannot be created."""
+    class Incomplete(_Indicator):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,193 @@
+"""Tests for MCP admission control and rate limiting."""
+
+import threading
+import time
+
+import pytest
+from mcp_agent_network import AgentNetwork
+from mcp_agent_network.mcp import MCPClient, MCPConnectionManager, RateLimiter, TokenBucket
+from mcp_agent_network.mcp.rate_limit import parse_retry_after
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refill():
+    """Test that the token bucket refills at the configured rate."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+    
+    assert bucket.consume() is True
+    assert bucket.consume() is True
+    assert bucket.consume() is False
+    assert bucket.wait_time() == pytest.approx(0.5)
+    
+    clock.now += 0.5
+    assert bucket.consume() is True
+
+
+def test_rate_limiter_fast_rejection():
+    """Test that requests over the rate are rejected without waiting."""
+    clock = FakeClock()
+    limiter = RateLimiter("test-server", rate=1, burst=1, clock=clock)
+    
+    assert limiter.acquire() is True
+    limiter.release()
+    assert limiter.acquire() is False
+    assert limiter.get_status()["rejected"] == 1
+
+
+def test_rate_limiter_max_in_flight():
+    """Test the in-flight cap."""
+    limiter = RateLimiter("test-server", max_in_flight=2)
+    
+    assert limiter.acquire() is True
+    assert limiter.acquire() is True
+    assert limiter.acquire(max_wait=0.01) is False
+    
+    limiter.release()
+    assert limiter.acquire() is True
+
+
+def test_rate_limiter_bounded_wait():
+    """Test that a request queues for a token within its wait budget."""
+    limiter = RateLimiter("test-server", rate=50, burst=1, max_wait=0.5)
+    
+    assert limiter.acquire() is True
+    limiter.release()
+    assert limiter.acquire() is True
+    limiter.release()
+
+
+def test_global_limiter_applies_to_all_servers():
+    """Test that a parent limiter caps requests across servers."""
+    clock = FakeClock()
+    global_limiter = RateLimiter("global", rate=1, burst=1, clock=clock)
+    first = RateLimiter("server-1", parent=global_limiter, clock=clock)
+    second = RateLimiter("server-2", parent=global_limiter, clock=clock)
+    
+    assert first.acquire() is True
+    assert second.acquire() is False
+    assert global_limiter.in_flight == 1
+    
+    first.release()
+    assert global_limiter.in_flight == 0
+
+
+def test_sibling_release_wakes_waiter_blocked_on_parent():
+    """Test that children keep their own conditions but wake on parent capacity."""
+    global_limiter = RateLimiter("global", max_in_flight=1)
+    first = RateLimiter("server-1", parent=global_limiter)
+    second = RateLimiter("server-2", parent=global_limiter, max_wait=5)
+    assert first._cond is not second._cond
+
+    assert first.acquire() is True
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(second.acquire()))
+    waiter.start()
+    deadline = time.monotonic() + 5
+    while second._cond not in global_limiter._waiters and time.monotonic() < deadline:
+        time.sleep(0.001)
+    first.release()
+    waiter.join(timeout=5)
+    assert result == [True]
+    assert global_limiter.in_flight == 1
+
+
+def test_global_limit_updates_keep_in_flight_accounting():
+    """Test that changing the global limit keeps requests already admitted."""
+    manager = MCPConnectionManager()
+    manager.add_server("glama", rate_limit={"max_in_flight": 5})
+    manager.add_server("smithery")
+    glama = manager.get_client("glama").rate_limiter
+    assert glama.acquire() is True
+
+    # Adding a global limit chains the existing limiter and counts its request
+    manager.set_global_rate_limit({"max_in_flight": 2})
+    global_limiter = manager.global_rate_limiter
+    assert manager.get_client("glama").rate_limiter is glama
+    assert glama.parent is global_limiter
+    assert global_limiter.in_flight == 1
+    assert manager.get_client("smithery").rate_limiter.parent is global_limiter
+
+    manager.set_global_rate_limit({"max_in_flight": 1})
+    assert manager.global_rate_limiter is global_limiter
+    assert global_limiter.max_in_flight == 1
+    assert manager.get_client("smithery").rate_limiter.acquire() is False
+    glama.release()
+    assert global_limiter.in_flight == 0
+
+    manager.set_global_rate_limit(None)
+    assert glama.parent is None
+    assert manager.get_client("smithery").rate_limiter is None
+
+
+def test_retry_after_header_is_case_insensitive():
+    """Test reading Retry-After from headers in any case."""
+    assert parse_retry_after({"status_code": 429, "headers": {"retry-after": "3"}}) == 3.0
+    assert parse_retry_after({"headers": {"RETRY-AFTER": 1}}) == 1.0
+    assert parse_retry_after({"headers": {"Content-Type": "text/plain"}}) is None
+
+
+def test_rate_limiter_adapts_to_retry_after():
+    """Test adaptive throttling from server 429 responses."""
+    clock = FakeClock()
+    limiter = RateLimiter("test-server", rate=10, clock=clock)
+    
+    limiter.observe({"status_code": 429, "retry_after": 2})
+    assert limiter.get_status()["rate"] == pytest.approx(5)
+    assert limiter.acquire() is False
+    
+    clock.now += 2.2
+    assert limiter.acquire() is True
+    limiter.release()
+    
+    limiter.observe({"status": "delivered"})
+    assert limiter.get_status()["rate"] == pytest.approx(5.5)
+
+
+def test_client_rejects_when_rate_limited():
+    """Test that MCPClient rejects messages over the limit."""
+    client = MCPClient("test-server", rate_limiter=RateLimiter("test-server", rate=1, burst=1))
+    client.connect()
+    
+    assert client.send_message({"test": "message"})["status"] == "delivered"
+    response = client.send_message({"test": "message"})
+    assert response["status"] == "rejected"
+    assert "rate_limit" in client.get_status()
+
+
+def test_agent_network_rate_limit_config():
+    """Test configuring rate limits through AgentNetwork."""
+    config = {
+        "rate_limit": {"rate": 100, "max_in_flight": 10},
+        "mcp_servers": {
+            "glama": {"rate_limit": {"rate": 5, "burst": 5}},
+            "smithery": {},
+        },
+    }
+    network = AgentNetwork(config)
+    manager = network.mcp_connection_manager
+    
+    glama = manager.get_client("glama").rate_limiter
+    smithery = manager.get_client("smithery").rate_limiter
+    assert glama.base_rate == 5
+    assert glama.parent is manager.global_rate_limiter
+    assert smithery.base_rate is None
+    assert smithery.parent is manager.global_rate_limiter
+
+
+def test_manager_send_message():
+    """Test sending a message to a single server."""
+    manager = MCPConnectionManager()
+    assert manager.send_message("missing", {})["status"] == "failed"
+    
+    manager.connect_to_servers(["test-server"], show_progress=False)
+    assert manager.send_message("test-server", {"test": "message"})["status"] == "delivered"
@@ -0,0 +1,77 @@
+"""Tests for traffic recording and replay."""
+
+import time
+
+import pytest
+from mcp_agent_network.core.agent_network import AgentNetwork
+from mcp_agent_network.mcp import MCPConnectionManager
+from mcp_agent_network.mcp.traffic import TrafficReplayer, load_trace
+
+
+def record_workload(path):
+    """Record a small workload with one custom server response."""
+    network = AgentNetwork({"record_traffic": str(path)})
+    manager = network.mcp_connection_manager
+    network.connect_to_servers(["server1", "server2"], show_progress=False)
+    manager.clients["server1"]._transmit = lambda message: {
+        "status": "delivered", "content": f"echo {message.get('n')}"
+    }
+    for n in range(3):
+        manager.send_message("server1", {"type": "test", "n": n})
+    manager.broadcast_message({"type": "announce"})
+    network.shutdown()
+
+
+@pytest.mark.parametrize("name", ["trace.jsonl", "trace.jsonl.gz"])
+def test_recorder_captures_operations(tmp_path, name):
+    """Test that connects, sends and broadcasts are recorded in order."""
+    path = tmp_path / name
+    record_workload(path)
+    records = list(load_trace(str(path)))
+
+    assert [record["op"] for record in records] == (
+        ["connect", "connect"] + ["send_message"] * 3 + ["broadcast_message"]
+    )
+    assert records[2]["message"] == {"type": "test", "n": 0}
+    assert records[2]["response"]["content"] == "echo 0"
+    assert set(records[-1]["response"]) == {"server1", "server2"}
+    assert set(records[-1]["durations"]) == {"server1", "server2"}
+    assert all(record["duration"] >= 0 for record in records)
+    offsets = [record["t"] for record in records[2:]]
+    assert offsets == sorted(offsets)
+
+
+def test_replay_serves_recorded_responses(tmp_path):
+    """Test that the replay answers from the trace and reports metrics."""
+    path = tmp_path / "trace.jsonl"
+    record_workload(path)
+
+    manager = MCPConnectionManager()
+    responses = []
+    send_message = manager.send_message
+    manager.send_message = lambda server, message: responses.append(
+        send_message(server, message)
+    ) or responses[-1]
+    metrics = TrafficReplayer(manager, speed=0).replay(str(path))
+
+    assert metrics["operations"] == 6
+    assert metrics["errors"] == 0
+    assert metrics["throughput"] > 0
+    assert set(metrics["latency_ms"]) == {"connect", "send_message", "broadcast_message"}
+    assert sorted(response["content"] for response in responses) == ["echo 0", "echo 1", "echo 2"]
+
+
+def test_recorded_duration_excludes_queueing(tmp_path):
+    """Test that time spent waiting for admission is not recorded."""
+    path = tmp_path / "trace.jsonl"
+    network = AgentNetwork({"record_traffic": str(path)})
+    network.connect_to_servers(["server1"], show_progress=False)
+    limit = network.mcp_connection_manager.clients["server1"].concurrency_limit
+    acquire = limit.acquire
+    limit.acquire = lambda *args: time.sleep(0.1) or acquire(*args)
+
+    network.mcp_connection_manager.send_message("server1", {"type": "test"})
+    network.shutdown()
+    record = list(load_trace(str(path)))[-1]
+    assert record["op"] == "send_message"
+    assert record["duration"] < 0.05
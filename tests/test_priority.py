@@ -0,0 +1,113 @@
+"""Tests for priority lanes and deadline propagation."""
+
+import threading
+import time
+
+import pytest
+from mcp_agent_network import AgentNetwork
+from mcp_agent_network.mcp import AdaptiveConcurrencyLimit, MCPClient, MCPConnectionManager
+
+
+def test_bulk_leaves_reserved_slots_free():
+    """Test that bulk requests cannot take the interactive reserve."""
+    limit = AdaptiveConcurrencyLimit("test", initial_limit=2, interactive_reserve=1)
+    assert limit.acquire(priority="bulk")
+    assert not limit.acquire(max_wait=0, priority="bulk")
+    assert limit.acquire(max_wait=0, priority="interactive")
+
+    with pytest.raises(ValueError):
+        limit.acquire(priority="urgent")
+
+
+def test_interactive_waiters_are_served_first():
+    """Test that a freed slot goes to an interactive waiter before bulk ones."""
+    limit = AdaptiveConcurrencyLimit("test", initial_limit=1, interactive_reserve=0)
+    assert limit.acquire()
+    order = []
+
+    def wait(priority):
+        assert limit.acquire(max_wait=5, priority=priority)
+        order.append(priority)
+        limit.release()
+
+    bulk = threading.Thread(target=wait, args=("bulk",))
+    bulk.start()
+    while limit.waiting[2] == 0:
+        time.sleep(0.001)
+    interactive = threading.Thread(target=wait, args=("interactive",))
+    interactive.start()
+    while limit.waiting[0] == 0:
+        time.sleep(0.001)
+    assert limit.get_status()["waiting"] == {"interactive": 1, "normal": 0, "bulk": 1}
+
+    limit.release()
+    bulk.join()
+    interactive.join()
+    assert order == ["interactive", "bulk"]
+
+
+def test_client_drops_expired_messages():
+    """Test that messages past their deadline are not sent."""
+    client = MCPClient("test-server")
+    client.connect()
+    sent = []
+    transmit = client._transmit
+    client._transmit = lambda message: sent.append(message) or transmit(message)
+
+    response = client.send_message({"type": "test", "deadline": time.time() - 1})
+    assert response == {"error": "Deadline exceeded", "status": "rejected",
+                        "server": "test-server"}
+    assert sent == []
+    assert client.get_status()["expired"] == 1
+
+    response = client.send_message({"type": "test", "deadline": time.time() + 60})
+    assert response["status"] == "delivered"
+    assert len(sent) == 1
+
+
+def test_deadline_bounds_queueing():
+    """Test that a full concurrency limit is waited on only until the deadline."""
+    client = MCPClient("test-server", concurrency_limit=AdaptiveConcurrencyLimit(
+        "test-server", initial_limit=1, max_wait=30.0))
+    client.connect()
+    assert client.concurrency_limit.acquire()
+
+    start = time.monotonic()
+    response = client.send_message({"type": "test", "deadline": time.time() + 0.05})
+    assert time.monotonic() - start < 5
+    assert response["error"] == "Deadline exceeded"
+
+
+def test_manager_stamps_priority_and_deadline():
+    """Test that the manager carries priority and deadline on messages."""
+    manager = MCPConnectionManager()
+    manager.connect_to_servers(["glama"], show_progress=False)
+    sent = []
+    client = manager.clients["glama"]
+    transmit = client._transmit
+    client._transmit = lambda message: sent.append(message) or transmit(message)
+
+    manager.send_message("glama", {"type": "test"}, priority="interactive", timeout=30)
+    assert sent[0]["priority"] == "interactive"
+    assert sent[0]["deadline"] > time.time()
+
+    response = manager.call_tool("glama", "knowledge_sharing", {}, priority="bulk", timeout=0)
+    assert response["error"] == "Deadline exceeded"
+    assert len(sent) == 1
+
+
+def test_agent_network_lanes():
+    """Test that chat is interactive and tasks are bulk."""
+    network = AgentNetwork({"request_timeouts": {"interactive": 10}})
+    network.connect_to_servers(["glama"], show_progress=False)
+    sent = []
+    client = network.mcp_connection_manager.clients["glama"]
+    transmit = client._transmit
+    client._transmit = lambda message: sent.append(message) or transmit(message)
+
+    network.chat_with_agent("agent-1", "hello")
+    network.execute_task("summarize the news")
+    assert sent[0]["priority"] == "interactive"
+    assert "deadline" in sent[0]
+    assert sent[1]["priority"] == "bulk"
+    assert "deadline" not in sent[1]
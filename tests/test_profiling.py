@@ -0,0 +1,105 @@
+"""Tests for the profiling mode."""
+
+import json
+import time
+
+import pytest
+from mcp_agent_network.cli.main import main
+from mcp_agent_network.core.agent_network import AgentNetwork
+from mcp_agent_network.mcp import MCPClient, MCPConnectionManager
+from mcp_agent_network.mcp.events import SERVER_CONNECTED
+from mcp_agent_network.mcp.profiling import Profiler
+
+
+def test_profiler_aggregates_phases_by_operation_and_server():
+    """Test that phase timings are aggregated both ways."""
+    profiler = Profiler()
+    profiler.record("send_message", "network", 0.010, "glama")
+    profiler.record("send_message", "network", 0.030, "glama")
+    with profiler.phase("execute_task"):
+        pass
+
+    report = profiler.report()
+    network = report["operations"]["send_message"]["network"]
+    assert network["count"] == 2
+    assert network["mean_ms"] == pytest.approx(20.0)
+    assert network["max_ms"] == pytest.approx(30.0)
+    assert report["servers"]["glama"]["network"]["total_ms"] == pytest.approx(40.0)
+    assert "total" in report["operations"]["execute_task"]
+
+
+def test_client_splits_network_and_server_time():
+    """Test that server-reported processing time is split from the network phase."""
+    client = MCPClient("test-server")
+    client.profiler = Profiler()
+    client.connect()
+
+    def transmit(message):
+        time.sleep(0.02)
+        return {"status": "delivered", "processing_time_ms": 15}
+
+    client._transmit = transmit
+    client.send_message({"type": "test"})
+
+    phases = client.profiler.report()["servers"]["test-server"]
+    assert phases["server"]["total_ms"] == pytest.approx(15.0)
+    assert 0 < phases["network"]["total_ms"] < 20
+    assert phases["send_message"]["count"] == 1
+    assert phases["connect"]["count"] == 1
+
+
+def test_queue_phase_is_one_sample_per_message():
+    """Test that concurrency and rate limiter waits are recorded as one queue sample."""
+    manager = MCPConnectionManager()
+    manager.add_server("test-server", rate_limit={"rate": 100},
+                       concurrency={"initial_limit": 4})
+    manager.connect_to_servers(["test-server"], show_progress=False)
+    client = manager.get_client("test-server")
+    client.profiler = Profiler()
+
+    client.send_message({"type": "test"})
+    client.send_message({"type": "test"})
+
+    assert client.profiler.report()["servers"]["test-server"]["queue"]["count"] == 2
+
+
+def test_sampling_profiler_writes_flamegraph(tmp_path):
+    """Test that sampled stacks are written in collapsed-stack format."""
+    network = AgentNetwork({"profile": {"output_dir": str(tmp_path),
+                                        "sampling_interval": 0.001}})
+    network.connect_to_servers(["test-server"], show_progress=False)
+    deadline = time.time() + 0.05
+    while time.time() < deadline:
+        network.execute_task("Test task")
+
+    paths = network.write_profile()
+    report = json.loads(open(paths["report"]).read())
+    assert {"connect_to_servers", "execute_task", "send_message"} <= set(report["operations"])
+    assert "test-server" in report["servers"]
+    assert report["samples"] > 0
+
+    lines = open(paths["flamegraph"]).read().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert ";" in stack and int(count) >= 1
+
+
+def test_cli_profile_flag(tmp_path, capsys):
+    """Test that --profile writes the profile to --profile-output after the command."""
+    assert main(["--profile", "--profile-output", str(tmp_path),
+                 "connect", "--servers", "test-server", "--no-progress"]) == 0
+    assert "Profile written to" in capsys.readouterr().out
+    assert (tmp_path / "profile.json").exists()
+    assert (tmp_path / "stacks.folded").exists()
+
+
+def test_shutdown_stops_the_sampler_and_session_events(tmp_path):
+    """Test that shutdown stops the sampling thread but keeps the report."""
+    network = AgentNetwork({"profile": {"output_dir": str(tmp_path), "sampling_interval": 0.001}})
+    assert network.profiler._sampler is not None
+
+    network.shutdown()
+    assert network.profiler._sampler is None
+    assert network._session_events.closed
+    assert not network.events.has_subscribers(SERVER_CONNECTED)
+    assert "report" in network.write_profile()
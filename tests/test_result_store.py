@@ -0,0 +1,140 @@
+"""Tests for the shared-memory result store."""
+
+import multiprocessing
+import random
+
+import pytest
+from mcp_agent_network import AgentNetwork
+from mcp_agent_network.core.result_store import SharedResultStore
+
+
+def _read_in_child(store, handle, queue):
+    """Read a result in another process and report it back."""
+    queue.put((store.get(handle), store.get_status()["entries"]))
+    store.release(handle)
+    store.close()
+
+
+def test_put_and_get():
+    """Test storing raw bytes and JSON results."""
+    store = SharedResultStore(size=4096, slots=8)
+    try:
+        raw = store.put(b"screenshot-bytes")
+        result = store.put({"status": "success", "items": [1, 2, 3]})
+        assert store.get(raw) == b"screenshot-bytes"
+        assert store.get(result) == {"status": "success", "items": [1, 2, 3]}
+
+        view = store.view(raw)
+        assert bytes(view) == b"screenshot-bytes"
+        assert view.readonly
+        view.release()
+
+        status = store.get_status()
+        assert status["entries"] == 2
+        assert status["referenced"] == 2
+    finally:
+        store.close()
+
+
+def test_referenced_entries_survive_eviction():
+    """Test that the ring only overwrites unreferenced entries."""
+    store = SharedResultStore(size=100, slots=8)
+    try:
+        kept = store.put(b"k" * 40)
+        dropped = store.put(b"d" * 40)
+        store.release(dropped)
+
+        # Wraps around: skips the referenced entry and evicts the released one
+        replacement = store.put(b"r" * 50)
+        assert store.get(kept) == b"k" * 40
+        assert store.get(replacement) == b"r" * 50
+        with pytest.raises(ValueError, match="evicted"):
+            store.get(dropped)
+        assert store.get_status()["evictions"] == 1
+
+        with pytest.raises(MemoryError):
+            store.put(b"x" * 60)
+        with pytest.raises(ValueError):
+            store.put(b"x" * 101)
+    finally:
+        store.close()
+
+
+def test_refcounts():
+    """Test that acquired entries need every reference released."""
+    store = SharedResultStore(size=64, slots=2)
+    try:
+        handle = store.put(b"a" * 32)
+        store.acquire(handle)
+        store.release(handle)
+        with pytest.raises(MemoryError):
+            store.put(b"b" * 64)
+        store.release(handle)
+        other = store.put(b"b" * 64)
+        assert store.get(other) == b"b" * 64
+    finally:
+        store.close()
+
+
+def test_ring_keeps_referenced_entries_under_churn():
+    """Test that the free list and entry queue stay consistent as the ring wraps."""
+    store = SharedResultStore(size=64 * 1024, slots=64)
+    rng = random.Random(7)
+    held = []
+    try:
+        for i in range(3000):
+            data = bytes([i % 256]) * rng.randint(1, 4000)
+            try:
+                held.append((store.put(data), data))
+            except MemoryError:
+                pass
+            if len(held) > 20 or rng.random() < 0.5:
+                handle, data = held.pop(rng.randrange(len(held)))
+                assert store.get(handle) == data
+                store.release(handle)
+        for handle, data in held:
+            assert store.get(handle) == data
+        status = store.get_status()
+        assert status["referenced"] == len(held)
+        assert status["entries"] <= 64
+        assert status["bytes_used"] <= 64 * 1024
+    finally:
+        store.close()
+
+
+def test_from_config_rejects_segment_names():
+    """Test that stores cannot be shared by configured name."""
+    with pytest.raises(ValueError, match="name"):
+        SharedResultStore.from_config({"name": "results"})
+
+
+def test_handoff_to_another_process():
+    """Test that a child process reads a result through its handle."""
+    context = multiprocessing.get_context("spawn")
+    store = SharedResultStore(size=1 << 20, slots=4, lock=context.Lock())
+    try:
+        payload = {"html": "x" * 100_000}
+        handle = store.put(payload)
+        store.acquire(handle)
+
+        queue = context.Queue()
+        process = context.Process(target=_read_in_child, args=(store, handle, queue))
+        process.start()
+        received, entries = queue.get(timeout=30)
+        process.join(timeout=30)
+        assert process.exitcode == 0
+        assert received == payload
+        assert entries == 1
+        # The child released its reference; the writer still holds one
+        assert store.get_status()["referenced"] == 1
+    finally:
+        store.close()
+
+
+def test_agent_network_result_store():
+    """Test creating and releasing the store from configuration."""
+    network = AgentNetwork({"result_store": {"size": 4096, "slots": 4}})
+    handle = network.result_store.put({"ok": True})
+    assert network.result_store.get(handle) == {"ok": True}
+    network.shutdown()
+    assert network.result_store is None
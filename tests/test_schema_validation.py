@@ -0,0 +1,153 @@
+"""Tests for compiled tool schema validation."""
+
+from collections import OrderedDict
+
+import pytest
+from mcp_agent_network.mcp import MCPClient, MCPConnectionManager
+from mcp_agent_network.mcp import schema_validation
+from mcp_agent_network.mcp.schema_validation import SchemaValidator, get_validator
+
+
+SEARCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "query": {"type": "string", "minLength": 1},
+        "limit": {"type": "integer", "minimum": 1, "maximum": 50},
+        "mode": {"enum": ["fast", "exact"]},
+        "tags": {"type": "array", "items": {"type": "string"}, "maxItems": 3},
+    },
+    "required": ["query"],
+    "additionalProperties": False,
+}
+
+
+def test_valid_instance_has_no_errors():
+    """Test that a matching instance validates cleanly."""
+    validator = SchemaValidator(SEARCH_SCHEMA)
+    assert validator.validate({"query": "docs", "limit": 5, "mode": "fast", "tags": ["a"]}) == []
+
+
+def test_errors_report_paths():
+    """Test that violations are reported with their location."""
+    validator = SchemaValidator(SEARCH_SCHEMA)
+    errors = validator.validate({"limit": True, "mode": "slow", "tags": ["a", 2], "extra": 1})
+
+    assert "$: missing required property 'query'" in errors
+    assert any(error.startswith("$.limit: expected integer") for error in errors)
+    assert any(error.startswith("$.mode:") for error in errors)
+    assert any(error.startswith("$.tags[1]: expected string") for error in errors)
+    assert "$: unexpected property 'extra'" in errors
+
+
+def test_combinators():
+    """Test anyOf, oneOf and not."""
+    validator = SchemaValidator({
+        "anyOf": [{"type": "string"}, {"type": "number", "exclusiveMinimum": 0}],
+        "not": {"const": "forbidden"},
+    })
+    assert validator.is_valid("text")
+    assert validator.is_valid(3)
+    assert not validator.is_valid(0)
+    assert not validator.is_valid("forbidden")
+
+    one_of = SchemaValidator({"oneOf": [{"type": "integer"}, {"type": "number"}]})
+    assert one_of.is_valid(1.5)
+    assert not one_of.is_valid(1)
+
+
+def test_validators_are_cached_by_schema_hash():
+    """Test that equal schemas share one compiled validator."""
+    copy = {key: SEARCH_SCHEMA[key] for key in reversed(list(SEARCH_SCHEMA))}
+    assert get_validator(SEARCH_SCHEMA) is get_validator(copy)
+    assert get_validator(None) is None
+
+
+def test_exclusive_bounds_in_both_drafts():
+    """Test numeric and draft-04 boolean exclusive bounds."""
+    draft4 = SchemaValidator({"type": "integer", "minimum": 0, "exclusiveMinimum": True,
+                              "maximum": 10, "exclusiveMaximum": True})
+    assert draft4.is_valid(5)
+    assert draft4.validate(10) == ["$: 10 is at least 10"]
+    assert draft4.validate(0) == ["$: 0 is at most 0"]
+
+    inclusive = SchemaValidator({"maximum": 10, "exclusiveMaximum": False})
+    assert inclusive.is_valid(10)
+    assert SchemaValidator({"exclusiveMaximum": True}).is_valid(5)
+    assert not SchemaValidator({"exclusiveMaximum": 10}).is_valid(10)
+
+
+def test_validator_cache_is_bounded(monkeypatch):
+    """Test that least recently used validators are dropped."""
+    monkeypatch.setattr(schema_validation, "MAX_VALIDATORS", 2)
+    monkeypatch.setattr(schema_validation, "_validators", OrderedDict())
+    first = get_validator({"type": "string"})
+    get_validator({"type": "integer"})
+    assert get_validator({"type": "string"}) is first
+    get_validator({"type": "boolean"})
+    assert len(schema_validation._validators) == 2
+    assert get_validator({"type": "string"}) is first
+    assert get_validator({"type": "integer"}) is not None
+    assert schema_validation.schema_key({"type": "boolean"}) not in schema_validation._validators
+
+
+def _client_with_tool(validate_schemas=True):
+    client = MCPClient("test-server", validate_schemas=validate_schemas)
+    client.connect()
+    client.capabilities = {"tools": [{
+        "name": "search",
+        "inputSchema": SEARCH_SCHEMA,
+        "outputSchema": {"type": "object", "required": ["hits"]},
+    }]}
+    return client
+
+
+def test_call_tool_rejects_invalid_arguments_locally():
+    """Test that invalid arguments never reach the server."""
+    client = _client_with_tool()
+    sent = []
+    client._transmit = lambda message: sent.append(message) or {"status": "delivered"}
+
+    response = client.call_tool("search", {"limit": 5})
+    assert response["status"] == "failed"
+    assert response["validation_errors"] == ["$: missing required property 'query'"]
+    assert sent == []
+
+    response = client.call_tool("search", {"query": "docs"})
+    assert response["status"] == "delivered"
+    assert sent == [{"type": "tool_call", "tool": "search", "arguments": {"query": "docs"}}]
+
+
+def test_call_tool_validates_structured_results():
+    """Test that results are checked against the output schema."""
+    client = _client_with_tool()
+    client._transmit = lambda message: {"status": "delivered", "structuredContent": {}}
+
+    response = client.call_tool("search", {"query": "docs"})
+    assert response["status"] == "failed"
+    assert response["validation_errors"] == ["$: missing required property 'hits'"]
+
+
+def test_trusted_server_skips_validation():
+    """Test that validation can be disabled per server."""
+    manager = MCPConnectionManager()
+    manager.add_server("trusted-server", trusted=True)
+    assert manager.clients["trusted-server"].validate_schemas is False
+
+    client = _client_with_tool(validate_schemas=False)
+    assert client.call_tool("search", {"limit": 0})["status"] == "delivered"
+
+
+def test_validators_are_compiled_with_capabilities(monkeypatch):
+    """Test that tool calls look validators up instead of hashing schemas."""
+    client = _client_with_tool()
+    client.capabilities["tools"].append({"name": "broken", "inputSchema": {"pattern": "("}})
+    client.capabilities = client.capabilities
+    client._transmit = lambda message: {"status": "delivered"}
+
+    def fail(schema):
+        raise AssertionError("schema compiled on the call path")
+
+    monkeypatch.setattr("mcp_agent_network.mcp.client.get_validator", fail)
+    assert client.call_tool("search", {"limit": 5})["status"] == "failed"
+    # A schema that does not compile is not enforced
+    assert client.call_tool("broken", {"query": 1})["status"] == "delivered"
@@ -0,0 +1,108 @@
+"""Tests for network state snapshots."""
+
+import time
+
+import pytest
+from mcp_agent_network import AgentNetwork
+from mcp_agent_network.mcp import MCPConnectionManager
+from mcp_agent_network.mcp.snapshot import (
+    SnapshotWriter,
+    decode_snapshot,
+    encode_snapshot,
+    load_snapshot,
+    save_snapshot,
+)
+
+
+def test_encode_decode_roundtrip():
+    """Test that snapshots survive encoding."""
+    state = {"version": 1, "servers": {"glama": {"latency": {"ewma_ns": 1.5}}}}
+    assert decode_snapshot(encode_snapshot(state)) == state
+
+
+def test_snapshot_restores_learned_state(tmp_path):
+    """Test that latency, limits and capabilities carry over to a new manager."""
+    path = str(tmp_path / "state.snap")
+    manager = MCPConnectionManager()
+    manager.add_server("glama", trusted=True, concurrency={"initial_limit": 8})
+    manager.connect_to_servers(["glama"], show_progress=False)
+    manager.clients["glama"].latency.observe(2_000_000)
+    assert save_snapshot(manager, path) > 0
+
+    restored = MCPConnectionManager()
+    result = load_snapshot(restored, path)
+    assert result["servers"] == ["glama"]
+    client = restored.clients["glama"]
+    assert not client.connected
+    assert client.validate_schemas is False
+    assert client.latency.export_state() == manager.clients["glama"].latency.export_state()
+    assert client.concurrency_limit.current_limit == 8
+
+    # Capabilities come from the snapshot instead of rediscovery
+    restored.connect_to_servers(["glama"], show_progress=False)
+    assert restored.catalog.get_status()["hits"] == 1
+    assert restored.catalog.get_status()["misses"] == 0
+    assert client.capabilities == manager.clients["glama"].capabilities
+
+
+def test_load_snapshot_ignores_missing_and_corrupt_files(tmp_path):
+    """Test that unusable snapshots are skipped."""
+    manager = MCPConnectionManager()
+    assert load_snapshot(manager, str(tmp_path / "missing.snap")) is None
+
+    path = tmp_path / "corrupt.snap"
+    path.write_bytes(b"{not json")
+    assert load_snapshot(manager, str(path)) is None
+
+    path.write_bytes(encode_snapshot({"version": 999, "servers": {"glama": {}}}))
+    assert load_snapshot(manager, str(path)) is None
+    assert manager.clients == {}
+
+
+def test_snapshot_writer_saves_periodically_and_on_stop(tmp_path):
+    """Test periodic and final snapshots."""
+    manager = MCPConnectionManager()
+    manager.add_server("glama")
+    writer = SnapshotWriter(manager, str(tmp_path / "state.snap"), interval=0.01)
+    writer.start()
+    for _ in range(200):
+        if writer.snapshots:
+            break
+        time.sleep(0.01)
+    assert writer.snapshots >= 1
+
+    writer.stop()
+    final = writer.snapshots
+    assert writer.get_status()["last_size"] > 0
+    assert (tmp_path / "state.snap").exists()
+    assert final >= 2
+
+
+def test_agent_network_restores_snapshot_at_startup(tmp_path):
+    """Test snapshotting on shutdown and restoring in a new network."""
+    path = str(tmp_path / "state.snap")
+    network = AgentNetwork({"snapshot": {"path": path, "interval": 0}})
+    assert network.restored_snapshot is None
+    network.connect_to_servers(["glama"], show_progress=False)
+    network.mcp_connection_manager.clients["glama"].ping()
+    assert network.shutdown() is True
+
+    restarted = AgentNetwork({"snapshot": path})
+    assert restarted.restored_snapshot["servers"] == ["glama"]
+    assert restarted.mcp_connection_manager.clients["glama"].latency.samples == 2
+    restarted.snapshot_writer.stop()
+
+
+def test_snapshot_skips_servers_removed_from_config(tmp_path):
+    """Test that only configured servers are restored from the snapshot."""
+    path = str(tmp_path / "state.snap")
+    network = AgentNetwork({"snapshot": {"path": path, "interval": 0},
+                            "mcp_servers": {"a": {}, "b": {}}})
+    network.connect_to_servers(["a", "b"], show_progress=False)
+    assert network.shutdown() is True
+
+    restarted = AgentNetwork({"snapshot": path, "mcp_servers": {"a": {}}})
+    assert restarted.restored_snapshot["servers"] == ["a"]
+    assert list(restarted.mcp_connection_manager.clients) == ["a"]
+    assert "b" not in restarted.mcp_connection_manager.catalog.export_entries()
+    restarted.snapshot_writer.stop()
@@ -0,0 +1,181 @@
+"""Tests for the MCP tool catalog cache."""
+
+import threading
+
+import pytest
+from mcp_agent_network.mcp import MCPClient, MCPConnectionManager, ToolCatalog
+from mcp_agent_network.mcp.events import TOOLS_LIST_CHANGED
+
+
+class CountingClient(MCPClient):
+    """Client that counts capability listing requests."""
+
+    def __init__(self, server_name, version="1.0.0"):
+        super().__init__(server_name)
+        self.version = version
+        self.list_calls = []
+
+    def connect(self):
+        success, info = super().connect()
+        info["server_version"] = self.version
+        return success, info
+
+    def list_capabilities(self, kind):
+        self.list_calls.append(kind)
+        return super().list_capabilities(kind)
+
+
+def test_sync_discovers_then_hits_memory():
+    """Test that a second sync uses the in-memory listing."""
+    catalog = ToolCatalog()
+    client = CountingClient("test-server")
+    client.connect()
+    
+    entry = catalog.sync(client)
+    assert client.list_calls == ["tools", "resources", "prompts"]
+    assert [tool["name"] for tool in entry["tools"]] == client.connection_info["features"]
+    assert client.capabilities["tools"] == entry["tools"]
+    
+    catalog.sync(client)
+    assert len(client.list_calls) == 3
+    assert catalog.get_status() == {"servers": 1, "hits": 1, "misses": 1}
+
+
+def test_warm_start_from_disk_skips_discovery(tmp_path):
+    """Test that a new process reuses the on-disk listing."""
+    first = CountingClient("test-server")
+    first.connect()
+    ToolCatalog(str(tmp_path)).sync(first)
+    
+    second = CountingClient("test-server")
+    second.connect()
+    catalog = ToolCatalog(str(tmp_path))
+    catalog.sync(second)
+    assert second.list_calls == []
+    assert catalog.get("test-server") == ToolCatalog(str(tmp_path)).sync(first)["tools"]
+    
+    # A new server version invalidates the cache
+    upgraded = CountingClient("test-server", version="2.0.0")
+    upgraded.connect()
+    ToolCatalog(str(tmp_path)).sync(upgraded)
+    assert len(upgraded.list_calls) == 3
+
+
+def test_disk_io_runs_outside_the_catalog_lock(tmp_path, monkeypatch):
+    """Test that cache reads and writes do not block other catalog users."""
+    catalog = ToolCatalog(str(tmp_path))
+    lock_free = []
+
+    def check_lock():
+        # Another thread must be able to take the lock during disk IO
+        def try_lock():
+            acquired = catalog._lock.acquire(timeout=1)
+            lock_free.append(acquired)
+            if acquired:
+                catalog._lock.release()
+
+        thread = threading.Thread(target=try_lock)
+        thread.start()
+        thread.join()
+
+    load, save = catalog._load, catalog._save
+    monkeypatch.setattr(catalog, "_load", lambda name: check_lock() or load(name))
+    monkeypatch.setattr(catalog, "_save", lambda entry, gen: check_lock() or save(entry, gen))
+
+    client = CountingClient("test-server")
+    client.connect()
+    catalog.sync(client)
+    assert lock_free == [True, True]
+
+
+def test_stale_saves_are_skipped(tmp_path):
+    """Test that an older entry never overwrites a newer one on disk."""
+    catalog = ToolCatalog(str(tmp_path))
+    client = CountingClient("test-server")
+    client.connect()
+    entry = catalog.sync(client)
+
+    newer = {**entry, "tools": []}
+    with catalog._lock:
+        generation = catalog._install(newer)
+    catalog._save(newer, generation)
+    catalog._save(entry, generation - 1)
+
+    client.list_calls.clear()
+    assert ToolCatalog(str(tmp_path)).sync(client)["tools"] == []
+    assert client.list_calls == []
+
+
+def test_list_changed_refetches_only_that_kind(tmp_path):
+    """Test incremental updates from list_changed notifications."""
+    catalog = ToolCatalog(str(tmp_path))
+    changes = []
+    catalog.add_listener(lambda server, kind, entries: changes.append((server, kind)))
+    
+    client = CountingClient("test-server")
+    client.add_notification_handler(catalog.handle_notification)
+    client.connect()
+    catalog.sync(client)
+    client.list_calls.clear()
+    changes.clear()
+    
+    client.connection_info["features"].append("new_tool")
+    client.handle_notification({"method": "notifications/tools/list_changed"})
+    
+    assert client.list_calls == ["tools"]
+    assert changes == [("test-server", "tools")]
+    assert "new_tool" in [tool["name"] for tool in catalog.get("test-server")]
+    
+    # The change is persisted for the next warm start
+    restarted = CountingClient("test-server")
+    restarted.connect()
+    entry = ToolCatalog(str(tmp_path)).sync(restarted)
+    assert "new_tool" in [tool["name"] for tool in entry["tools"]]
+    assert restarted.list_calls == []
+    
+    # Ignored notifications do not trigger discovery
+    client.handle_notification({"method": "notifications/message"})
+    assert client.list_calls == ["tools"]
+
+
+def test_unchanged_listings_are_announced_once():
+    """Test that re-syncing an unchanged server does not notify listeners."""
+    catalog = ToolCatalog()
+    seen = []
+    catalog.add_listener(lambda server, kind, entries: seen.append(kind))
+    client = CountingClient("test-server")
+    client.connect()
+    
+    catalog.sync(client)
+    catalog.sync(client)
+    assert seen == ["tools", "resources", "prompts"]
+    
+    catalog.register("test-server", {"tools": [{"name": "extra"}]})
+    assert seen[3:] == ["tools"]
+    catalog.remove("test-server")
+    assert seen[4:] == ["tools", "resources", "prompts"]
+
+
+def test_reconnect_of_unchanged_server_publishes_nothing():
+    """Test that reconnecting a server with the same tools publishes no change."""
+    manager = MCPConnectionManager()
+    subscription = manager.events.subscribe([TOOLS_LIST_CHANGED])
+    manager.connect_to_servers(["glama"], show_progress=False)
+    assert len(subscription.drain()) == 1
+    
+    manager.get_client("glama").disconnect()
+    manager.connect_to_servers(["glama"], show_progress=False)
+    assert manager.get_client("glama").capabilities["tools"]
+    assert subscription.drain() == []
+
+
+def test_manager_catalogs_on_connect():
+    """Test that the connection manager populates the catalog."""
+    manager = MCPConnectionManager()
+    manager.connect_to_servers(["glama"], show_progress=False)
+    
+    assert manager.catalog.get("glama")
+    assert manager.get_client("glama").capabilities["tools"]
+    
+    manager.remove_server("glama")
+    assert manager.catalog.get("glama") == []
@@ -0,0 +1,95 @@
+"""Tests for the tool search index."""
+
+import pytest
+from mcp_agent_network import AgentNetwork
+from mcp_agent_network.mcp import MCPConnectionManager, ToolIndex
+from mcp_agent_network.mcp.tool_index import tokenize
+
+WEATHER_TOOLS = [
+    {"name": "getWeatherForecast", "description": "Forecast for a city",
+     "inputSchema": {"type": "object", "properties": {"city": {"type": "string"}}}},
+    {"name": "current_conditions", "description": "Current weather conditions"},
+]
+SEARCH_TOOLS = [
+    {"name": "web_search", "description": "Search the web for pages",
+     "inputSchema": {"properties": {"query": {"description": "Search terms"}}}},
+]
+
+
+def test_tokenize():
+    """Test tokenizing identifiers and text."""
+    assert tokenize("getWeatherForecast") == ["get", "weather", "forecast"]
+    assert tokenize("web_search for the-best results") == ["web", "search", "best", "results"]
+
+
+def test_keyword_search_ranks_relevant_tools():
+    """Test BM25 ranking over names, descriptions and schemas."""
+    index = ToolIndex()
+    index.update_server("weather", WEATHER_TOOLS)
+    index.update_server("search", SEARCH_TOOLS)
+    
+    results = index.search("what is the weather forecast in Paris")
+    assert results[0]["tool"] == "getWeatherForecast"
+    assert results[0]["server"] == "weather"
+    
+    results = index.search("search terms")
+    assert [r["tool"] for r in results] == ["web_search"]
+    assert index.search("city", servers={"search"}) == []
+
+
+def test_incremental_updates():
+    """Test replacing and removing a server's tools."""
+    index = ToolIndex()
+    index.update_server("weather", WEATHER_TOOLS)
+    index.update_server("search", SEARCH_TOOLS)
+    assert len(index) == 3
+    
+    index.update_server("weather", WEATHER_TOOLS[:1])
+    assert len(index) == 2
+    assert index.search("conditions") == []
+    
+    index.remove_server("weather")
+    assert len(index) == 1
+    assert index.search("forecast") == []
+
+
+def test_vector_search():
+    """Test cosine search with a toy embedder."""
+    pytest.importorskip("numpy")
+    vocabulary = ["weather", "forecast", "search", "web", "rain"]
+    
+    def embedder(texts):
+        return [[float(word in text.lower()) for word in vocabulary] for text in texts]
+    
+    index = ToolIndex(embedder=embedder)
+    index.update_server("weather", WEATHER_TOOLS)
+    index.update_server("search", SEARCH_TOOLS)
+    
+    results = index.search("rain forecast", mode="vector", limit=1)
+    assert results[0]["tool"] == "getWeatherForecast"
+    
+    index.remove_server("weather")
+    results = index.search("web", mode="hybrid")
+    assert [r["tool"] for r in results] == ["web_search"]
+
+
+def test_manager_indexes_connected_servers():
+    """Test that the manager keeps the index in sync with connections."""
+    manager = MCPConnectionManager()
+    manager.connect_to_servers(["glama"], show_progress=False)
+    assert manager.find_tools("knowledge sharing")[0]["tool"] == "knowledge_sharing"
+    
+    manager.disconnect_from_all()
+    assert manager.find_tools("knowledge sharing") == []
+
+
+def test_execute_task_routes_to_candidates():
+    """Test routing a task to servers with matching tools only."""
+    network = AgentNetwork()
+    network.connect_to_servers(["glama", "smithery"], show_progress=False)
+    manager = network.mcp_connection_manager
+    manager.tool_index.update_server("smithery", SEARCH_TOOLS)
+    manager.tool_index.update_server("glama", WEATHER_TOOLS)
+    
+    result = network.execute_task("search the web")
+    assert result["servers_responded"] == ["smithery"]
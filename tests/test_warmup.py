@@ -0,0 +1,152 @@
+"""Tests for the startup warm-up."""
+
+import threading
+
+import pytest
+from mcp_agent_network import AgentNetwork
+from mcp_agent_network.mcp import MCPConnectionManager
+from mcp_agent_network.mcp.events import PROGRESS
+from mcp_agent_network.mcp.warmup import WarmUp
+
+
+def test_warm_up_connects_hot_servers_first():
+    """Test that hot servers are connected before the rest."""
+    manager = MCPConnectionManager()
+    subscription = manager.events.subscribe([PROGRESS], sources=["warm_up"])
+    warmup = WarmUp(manager, ["glama", "smithery", "pulse"], hot=["pulse"])
+    assert warmup.get_status()["state"] == "pending"
+
+    warmup.start()
+    assert warmup.wait(timeout=5)
+    assert warmup.is_ready()
+    assert warmup.wait_hot(timeout=0)
+
+    status = warmup.get_status()
+    assert status["state"] == "ready"
+    assert status["hot"] == ["pulse"]
+    assert status["servers"] == {"glama": "ready", "smithery": "ready", "pulse": "ready"}
+    assert sorted(manager.get_connected_servers()) == ["glama", "pulse", "smithery"]
+
+    events = subscription.drain()
+    assert events[0].data["server"] == "pulse"
+    assert events[-1].data["completed"] == 3
+    # Connect plus the priming ping
+    assert manager.clients["glama"].latency.samples == 2
+
+
+def test_agent_network_warms_up_from_config():
+    """Test that warm-up starts at construction when configured."""
+    config = {
+        "warm_up": True,
+        "mcp_servers": {
+            "glama": {"hot": True},
+            "smithery": {},
+        },
+    }
+    network = AgentNetwork(config)
+    assert network.wait_until_ready(timeout=5, hot_only=True)
+    assert network.wait_until_ready(timeout=5)
+    assert network.is_ready()
+    assert network.warmup.hot == ["glama"]
+    assert sorted(network.mcp_connection_manager.get_connected_servers()) == ["glama", "smithery"]
+
+
+def test_agent_network_without_warm_up():
+    """Test that servers stay disconnected without warm-up."""
+    network = AgentNetwork({"mcp_servers": {"glama": {}}})
+    assert network.warmup is None
+    assert network.is_ready()
+    assert network.wait_until_ready(timeout=0)
+    assert network.mcp_connection_manager.get_connected_servers() == []
+
+    network = AgentNetwork({"warm_up": {"enabled": False}, "mcp_servers": {"glama": {}}})
+    assert network.warmup is None
+
+
+def test_warm_up_reports_failed_servers():
+    """Test that a warm-up with failed servers ends degraded."""
+    manager = MCPConnectionManager()
+    manager.add_server("glama")
+    manager.add_server("broken")
+    manager.clients["broken"].connect = lambda: (False, {})
+    warmup = WarmUp(manager, ["glama", "broken"])
+    warmup.start()
+    assert warmup.wait(timeout=5)
+
+    status = warmup.get_status()
+    assert status["state"] == "degraded"
+    assert status["ready"] is True
+    assert status["failed"] == ["broken"]
+    assert warmup.failed_servers() == ["broken"]
+
+
+def test_concurrent_connects_do_not_repeat_handshakes():
+    """Test that servers already connecting are waited for, not connected again."""
+    manager = MCPConnectionManager()
+    manager.add_server("glama")
+    client = manager.clients["glama"]
+    original = client.connect
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_connect():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return original()
+
+    client.connect = slow_connect
+    first = threading.Thread(target=manager.connect_to_servers, args=(["glama"], False))
+    first.start()
+    assert started.wait(5)
+
+    warmup = WarmUp(manager, ["glama"])
+    warmup.start()
+    assert not warmup.wait(timeout=0.05)
+    release.set()
+    first.join(timeout=5)
+    assert warmup.wait(timeout=5)
+    assert calls == [1]
+    assert warmup.get_status()["servers"] == {"glama": "ready"}
+    # The handshake sample only; the warm-up did not prime a server it did not connect
+    assert client.latency.samples == 1
+
+
+def test_stop_cancels_remaining_waves():
+    """Test that a stopped warm-up connects nothing more."""
+    manager = MCPConnectionManager()
+    for name in ("hot", "a", "b"):
+        manager.add_server(name)
+    client = manager.clients["hot"]
+    original = client.connect
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_connect():
+        started.set()
+        release.wait(5)
+        return original()
+
+    client.connect = slow_connect
+    warmup = WarmUp(manager, ["hot", "a", "b"], hot=["hot"])
+    warmup.start()
+    assert started.wait(5)
+    assert warmup.stop(timeout=0.01) is False
+    release.set()
+    assert warmup.stop(timeout=5) is True
+
+    status = warmup.get_status()
+    assert status["state"] == "stopped"
+    assert status["servers"] == {"hot": "ready", "a": "cancelled", "b": "cancelled"}
+    assert status["failed"] == []
+    assert manager.get_connected_servers() == ["hot"]
+
+
+def test_shutdown_stops_warm_up():
+    """Test that shutdown does not leave a warm-up reconnecting servers."""
+    servers = {f"server-{i}": {"hot": i < 2} for i in range(40)}
+    network = AgentNetwork({"warm_up": True, "mcp_servers": servers})
+    network.shutdown()
+    assert not network.warmup._thread.is_alive()
+    assert network.mcp_connection_manager.get_connected_servers() == []
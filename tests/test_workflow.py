@@ -0,0 +1,201 @@
+"""Tests for the DAG workflow engine."""
+
+import threading
+import time
+
+import pytest
+from mcp_agent_network import AgentNetwork
+from mcp_agent_network.orchestration import Workflow, ref
+
+
+def test_workflow_validation():
+    """Test detection of unknown dependencies and cycles."""
+    workflow = Workflow()
+    workflow.add_step("a", "function", func=lambda: 1, depends_on=["b"])
+    workflow.add_step("b", "function", func=lambda: 2, depends_on=["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        workflow.validate()
+    
+    workflow = Workflow()
+    workflow.add_step("a", "function", func=lambda: 1, depends_on=["missing"])
+    with pytest.raises(ValueError, match="unknown step"):
+        workflow.validate()
+    
+    with pytest.raises(ValueError):
+        workflow.add_step("a", "function", func=lambda: 1)
+
+
+def test_critical_path_ranks():
+    """Test that steps on longer chains get higher ranks."""
+    workflow = Workflow()
+    workflow.add_step("long-1", "function", func=lambda: 1, cost=5)
+    workflow.add_step("long-2", "function", func=lambda: 1, depends_on=["long-1"], cost=5)
+    workflow.add_step("short", "function", func=lambda: 1)
+    
+    ranks = workflow.critical_path_ranks()
+    assert ranks["long-1"] == 10
+    assert ranks["short"] == 1
+
+
+def test_run_passes_outputs_by_reference():
+    """Test that outputs flow along edges as the same objects."""
+    network = AgentNetwork()
+    payload = {"items": [1, 2, 3]}
+    seen = []
+    
+    def consume(data, first):
+        seen.append(data)
+        return first * 10
+    
+    workflow = Workflow()
+    workflow.add_step("produce", "function", func=lambda: payload)
+    workflow.add_step("consume", "function", func=consume,
+                      params={"data": ref("produce"), "first": ref("produce", "items", 0)})
+    
+    result = network.run_workflow(workflow)
+    assert result["status"] == "completed"
+    assert result["results"]["consume"] == 10
+    assert seen[0] is payload
+
+
+def test_run_independent_branches_concurrently():
+    """Test that independent steps run in parallel."""
+    network = AgentNetwork()
+    barrier = threading.Barrier(3, timeout=2)
+    
+    workflow = Workflow()
+    for name in ("a", "b", "c"):
+        workflow.add_step(name, "function", func=barrier.wait)
+    workflow.add_step("join", "function", func=lambda: "done", depends_on=["a", "b", "c"])
+    
+    result = network.run_workflow(workflow)
+    assert result["status"] == "completed"
+    assert result["results"]["join"] == "done"
+
+
+def test_run_memoizes_completed_steps():
+    """Test that re-runs skip steps whose inputs did not change."""
+    network = AgentNetwork()
+    calls = []
+    
+    def work(value):
+        calls.append(value)
+        return value + 1
+    
+    def build(value):
+        workflow = Workflow()
+        workflow.add_step("first", "function", func=work, params={"value": value})
+        workflow.add_step("second", "function", func=work, params={"value": ref("first")})
+        return workflow
+    
+    network.run_workflow(build(1))
+    result = network.run_workflow(build(1))
+    assert calls == [1, 2]
+    assert result["cached"] == ["first", "second"]
+    
+    result = network.run_workflow(build(5))
+    assert calls == [1, 2, 5, 6]
+    assert result["results"]["second"] == 7
+
+
+def test_memo_keys_on_function_identity():
+    """Test that distinct lambdas and closures never share memoized results."""
+    network = AgentNetwork()
+    for func, value in ((lambda: "first", "first"), (lambda: "second", "second")):
+        workflow = Workflow()
+        workflow.add_step("step", "function", func=func)
+        assert network.run_workflow(workflow)["results"]["step"] == value
+    
+    def make(n):
+        return lambda: n
+    
+    for n in (1, 2):
+        workflow = Workflow()
+        workflow.add_step("step", "function", func=make(n))
+        result = network.run_workflow(workflow)
+        assert result["results"]["step"] == n
+        assert result["cached"] == []
+
+
+def test_memo_is_bounded_and_skips_mcp_steps():
+    """Test LRU eviction and the default cacheable flag of MCP steps."""
+    network = AgentNetwork()
+    network.orchestrator.cache_size = 2
+    funcs = [lambda: 1, lambda: 2, lambda: 3]
+    for func in funcs:
+        workflow = Workflow()
+        workflow.add_step("step", "function", func=func)
+        network.run_workflow(workflow)
+    assert len(network.orchestrator.cache) == 2
+    
+    workflow = Workflow()
+    workflow.add_step("search", "tool", server="glama", params={"tool": "knowledge_sharing"})
+    workflow.add_step("ask", "chat", server="glama", params={"message": "hi"})
+    assert not workflow.steps["search"].cacheable
+    assert not workflow.steps["ask"].cacheable
+
+
+def test_memo_follows_changed_uncached_outputs():
+    """Test that steps downstream of uncached steps see their new outputs."""
+    network = AgentNetwork()
+    fetched = iter(["first", "second", "second"])
+    calls = []
+    
+    def fetch():
+        return next(fetched)
+    
+    def summarize(text):
+        calls.append(text)
+        return text.upper()
+    
+    def build():
+        workflow = Workflow()
+        workflow.add_step("fetch", "function", func=fetch, cacheable=False)
+        workflow.add_step("summarize", "function", func=summarize,
+                          params={"text": ref("fetch")})
+        return workflow
+    
+    assert network.run_workflow(build())["results"]["summarize"] == "FIRST"
+    assert network.run_workflow(build())["results"]["summarize"] == "SECOND"
+    # An unchanged upstream output still hits the memo
+    result = network.run_workflow(build())
+    assert result["results"]["summarize"] == "SECOND"
+    assert result["cached"] == ["summarize"]
+    assert calls == ["first", "second"]
+
+
+def test_run_failure_skips_descendants():
+    """Test that a failed step skips everything downstream of it."""
+    network = AgentNetwork()
+    
+    def fail():
+        raise RuntimeError("boom")
+    
+    workflow = Workflow()
+    workflow.add_step("fail", "function", func=fail)
+    workflow.add_step("after", "function", func=lambda: 1, depends_on=["fail"])
+    workflow.add_step("independent", "function", func=lambda: 2)
+    
+    result = network.run_workflow(workflow)
+    assert result["status"] == "failed"
+    assert result["errors"] == {"fail": "boom"}
+    assert result["skipped"] == ["after"]
+    assert result["results"]["independent"] == 2
+
+
+def test_run_mcp_steps():
+    """Test tool and chat steps sent through the connection manager."""
+    network = AgentNetwork()
+    network.connect_to_servers(["glama", "smithery"], show_progress=False)
+    
+    workflow = Workflow()
+    workflow.add_step("search", "tool", server="glama",
+                      params={"tool": "search", "arguments": {"query": "mcp"}})
+    workflow.add_step("summarize", "chat", server="smithery", cacheable=False,
+                      params={"agent_id": "writer", "content": ref("search", "status")})
+    workflow.add_step("offline", "tool", server="missing", params={"tool": "noop"})
+    
+    result = network.run_workflow(workflow)
+    assert result["results"]["search"]["server"] == "glama"
+    assert result["results"]["summarize"]["status"] == "delivered"
+    assert "offline" in result["errors"]